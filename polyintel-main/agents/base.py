@@ -1,7 +1,20 @@
 from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Optional
+from core.context import DataContext
+from core.http import UpstreamClients
 from core.models import AlphaSignal
 
 class Agent(ABC):
+    def __init__(self, clients: Optional[UpstreamClients] = None, context: Optional[DataContext] = None) -> None:
+        self.clients = clients
+        self.context = context
+
+    async def fetch(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Upstream call through the request's data context (deduplicated across agents), if any"""
+        if self.context is None:
+            return await fn(*args, **kwargs)
+        return await self.context.fetch(fn, *args, **kwargs)
+
     @abstractmethod
     async def generate(self, market_id: str, identity: dict) -> AlphaSignal:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
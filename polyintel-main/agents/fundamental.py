@@ -7,17 +7,17 @@ from agents.base import Agent
 
 class FundamentalAgent(Agent):
     async def generate(self, market_id: str, identity: dict) -> AlphaSignal:
-        oracle = AproOracleClient()
-        data = await oracle.fetch_market_baseline(market_id)
-        gata = GataClient()
-        sim = await gata.run_monte_carlo({"market_id": market_id, "baseline": data})
+        oracle = AproOracleClient(self.clients)
+        data = await self.fetch(oracle.fetch_market_baseline, market_id)
+        gata = GataClient(self.clients)
+        sim = await self.fetch(gata.run_monte_carlo, {"market_id": market_id, "baseline": data})
         prob = float(sim.get("prob", 0.5))
         base_direction = "YES" if prob >= 0.5 else "NO"
         base_conf = abs(prob - 0.5) * 2.0
-        manus = ManusClient()
-        adjust = await manus.codeact("FUNDAMENTAL", {"direction": base_direction, "confidence": base_conf, "market_id": market_id})
-        aioz = AiozClient()
-        reasoning = await aioz.generate_reasoning("FUNDAMENTAL", {"baseline": data, "sim": sim, "adjust": adjust})
+        manus = ManusClient(self.clients)
+        adjust = await self.fetch(manus.codeact, "FUNDAMENTAL", {"direction": base_direction, "confidence": base_conf, "market_id": market_id})
+        aioz = AiozClient(self.clients)
+        reasoning = await self.fetch(aioz.generate_reasoning, "FUNDAMENTAL", {"baseline": data, "sim": sim, "adjust": adjust})
         return AlphaSignal(
             market_id=market_id,
             strategy="FUNDAMENTAL",
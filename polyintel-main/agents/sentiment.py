@@ -6,15 +6,15 @@ from agents.base import Agent
 
 class SentimentAgent(Agent):
     async def generate(self, market_id: str, identity: dict) -> AlphaSignal:
-        desearch = DeSearchClient()
-        sentiment = await desearch.query_sentiment(market_id)
-        aioz = AiozClient()
+        desearch = DeSearchClient(self.clients)
+        sentiment = await self.fetch(desearch.query_sentiment, market_id)
+        aioz = AiozClient(self.clients)
         score = float(sentiment.get("score", 0.0))
         direction = "YES" if score >= 0 else "NO"
         confidence = min(abs(score), 1.0)
-        manus = ManusClient()
-        adjust = await manus.codeact("SENTIMENT", {"direction": direction, "confidence": confidence, "market_id": market_id, "score": score})
-        reasoning = await aioz.generate_reasoning("SENTIMENT", {"sentiment": sentiment, "adjust": adjust})
+        manus = ManusClient(self.clients)
+        adjust = await self.fetch(manus.codeact, "SENTIMENT", {"direction": direction, "confidence": confidence, "market_id": market_id, "score": score})
+        reasoning = await self.fetch(aioz.generate_reasoning, "SENTIMENT", {"sentiment": sentiment, "adjust": adjust})
         return AlphaSignal(
             market_id=market_id,
             strategy="SENTIMENT",
@@ -1,4 +1,5 @@
 import os
+from contextlib import aclosing
 from core.models import AlphaSignal
 from integrations.de_search import DeSearchClient
 from integrations.polywhaler import PolywhalerClient
@@ -19,50 +20,57 @@ from agents.base import Agent
 
 class WhaleAgent(Agent):
     async def generate(self, market_id: str, identity: dict) -> AlphaSignal:
-        desearch = DeSearchClient()
+        desearch = DeSearchClient(self.clients)
         # Prefer Polywhaler if available for real-time whale bias
-        poly = PolywhalerClient()
-        bias = await poly.whale_bias()
-        data_api = PolymarketDataAPI()
-        info = await data_api.event_info(market_id)
-        whale_addresses = [a.strip().lower() for a in (os.getenv("POLYMARKET_WHALE_WALLETS", "").split(",")) if a.strip()]
-        whale_addresses.extend(get_learned_whales())
+        poly = PolywhalerClient(self.clients)
+        bias = await self.fetch(poly.whale_bias)
+        data_api = PolymarketDataAPI(self.clients)
+        info = await self.fetch(data_api.event_info, market_id)
+        whale_addresses = {a.strip().lower() for a in (os.getenv("POLYMARKET_WHALE_WALLETS", "").split(",")) if a.strip()}
+        whale_addresses.update(get_learned_whales())
         cross_direction = ""
         cross_conf = 0.0
-        if info.get("event_id"):
-            trades = await data_api.trades_by_event(info["event_id"], limit=500)
+        # Nothing to match without known whale wallets, so skip the history scan entirely
+        if info.get("event_id") and whale_addresses:
+            # Stream trade history page by page (the first page through the run's data context, so it is shared);
+            # stop once enough whale trades are seen. Depth is POLYMARKET_TRADES_DEPTH (one page by default)
+            sample = int(os.getenv("POLYINTEL_WHALE_SAMPLE", "200"))
             buys = 0
             sells = 0
-            for t in trades:
-                addr = str(t.get("proxyWallet", "")).lower()
-                if addr and addr in whale_addresses:
-                    side = str(t.get("side", "")).upper()
-                    if side == "BUY":
-                        buys += 1
-                    elif side == "SELL":
-                        sells += 1
+            async with aclosing(data_api.iter_trades(info["event_id"], fetch=self.fetch)) as trades:
+                async for t in trades:
+                    addr = str(t.get("proxyWallet", "")).lower()
+                    if addr and addr in whale_addresses:
+                        side = str(t.get("side", "")).upper()
+                        if side == "BUY":
+                            buys += 1
+                        elif side == "SELL":
+                            sells += 1
+                        if buys + sells >= sample:
+                            break
             total = buys + sells
             if total > 0:
                 cross_direction = "YES" if buys > sells else "NO"
                 cross_conf = min(0.9, max(0.6, abs(buys - sells) / float(total)))
-        if not cross_direction and info.get("condition_ids"):
-            holders = await data_api.holders_by_conditions(info["condition_ids"])
-            present = 0
-            for h in holders:
-                for holder in h.get("holders", []) or []:
-                    addr = str(holder.get("proxyWallet", "")).lower()
-                    if addr and addr in whale_addresses:
-                        present += 1
-            if present > 0:
+        if not cross_direction and whale_addresses and info.get("condition_ids"):
+            present = False
+            async with aclosing(data_api.iter_holders(info["condition_ids"], fetch=self.fetch)) as holders:
+                async for h in holders:
+                    if any(str(holder.get("proxyWallet", "")).lower() in whale_addresses
+                           for holder in h.get("holders", []) or []):
+                        # One whale holding is enough; the prefetched next chunk is cancelled
+                        present = True
+                        break
+            if present:
                 cross_direction = bias.get("direction") or "YES"
                 cross_conf = max(float(bias.get("confidence") or 0.6), 0.7)
-        whale = await desearch.query_whale_activity(market_id)
-        aioz = AiozClient()
+        whale = await self.fetch(desearch.query_whale_activity, market_id)
+        aioz = AiozClient(self.clients)
         direction = str(cross_direction or bias.get("direction") or whale.get("direction", "YES"))
         confidence = float((cross_conf or bias.get("confidence") or whale.get("confidence", 0.6)))
-        manus = ManusClient()
-        adjust = await manus.codeact("WHALE", {"direction": direction, "confidence": confidence, "market_id": market_id})
-        reasoning = await aioz.generate_reasoning("WHALE", {"whale": whale, "adjust": adjust})
+        manus = ManusClient(self.clients)
+        adjust = await self.fetch(manus.codeact, "WHALE", {"direction": direction, "confidence": confidence, "market_id": market_id})
+        reasoning = await self.fetch(aioz.generate_reasoning, "WHALE", {"whale": whale, "adjust": adjust})
         return AlphaSignal(
             market_id=market_id,
             strategy="WHALE",
@@ -1,16 +1,28 @@
 import os
 import json
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Union
 from dotenv import load_dotenv
 from pathlib import Path
-import httpx
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import random
+import time
 import asyncio
+from contextlib import asynccontextmanager
 from elevenlabs.client import ElevenLabs
+from core.http import UpstreamClients, set_default_clients, upstream_client
+from core.market_scoring import TradeColumns, anomaly_report, health_score, score_markets
+from core.trade_store import TradeStore, normalize_trade
+from core.wash_graph import RISK_ORDER, WashTradingDetector
+from integrations.order_book import OrderBookCache, book_metrics, market_token_ids
+from integrations.polymarket_catalog import MarketCatalog
+from spoon.audio_cache import default_audio_cache
+from spoon.briefing_scheduler import BriefingScheduler
+from spoon.mcp_tools import cache_stats as mcp_cache_stats
+from spoon.podcast_briefing import PodcastBriefingGenerator
+from spoon.tts_jobs import TTSJobQueue
 
 # Load environment
 env_path = Path(os.getcwd()) / ".env"
@@ -28,7 +40,28 @@ if elevenlabs_api_key:
 else:
     print("⚠ ELEVENLABS_API_KEY not found in environment")
 
-app = FastAPI(title="PolyIntel API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One keep-alive pool per upstream host, shared by every request, integration and agent
+    clients = UpstreamClients()
+    app.state.upstream = clients
+    set_default_clients(clients)
+    await market_catalog.start(clients)
+    order_books.clients = clients
+    await tts_jobs.start()
+    await briefings.start()
+    try:
+        yield
+    finally:
+        await briefings.stop()
+        await tts_jobs.stop()
+        await market_catalog.stop()
+        set_default_clients(None)
+        await clients.aclose()
+
+
+app = FastAPI(title="PolyIntel API", version="1.0.0", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -61,65 +94,22 @@ class VoiceInputRequest(BaseModel):
     audio_data: str  # Base64 encoded audio
     context: Optional[Dict] = None
 
+class TTSJobRequest(BaseModel):
+    text: str
+    voice_id: Optional[str] = None
 
-# ============= HELPER FUNCTIONS =============
-
-async def get_polymarket_markets(limit: int = 50) -> List[Dict]:
-    """Fetch live markets from Polymarket Gamma API"""
-    try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            # Fetch active, non-closed markets, get more to filter by volume
-            response = await client.get(
-                "https://gamma-api.polymarket.com/markets",
-                params={
-                    "active": "true",
-                    "closed": "false",
-                    "limit": min(limit * 5, 500),  # Get more to filter
-                },
-                headers={"Accept": "application/json"}
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                markets = data if isinstance(data, list) else []
+class PodcastRequest(BaseModel):
+    query: Optional[str] = None
+    market_slug: Optional[str] = None  # Briefs the market's question when no query is given
+    category: Optional[str] = "crypto"
+    duration: Optional[str] = "PAST_24_HOURS"
 
-                if markets:
-                    # Filter markets with actual volume using CLOB volume fields
-                    markets_with_volume = []
-                    for m in markets:
-                        try:
-                            # Calculate total volume from CLOB and AMM
-                            vol_clob = float(m.get("volumeClob", 0) or 0)
-                            vol_amm = float(m.get("volumeAmm", 0) or 0)
-                            vol_24h_clob = float(m.get("volume24hrClob", 0) or 0)
-                            vol_24h_amm = float(m.get("volume24hrAmm", 0) or 0)
-
-                            total_vol = vol_clob + vol_amm
-                            vol_24h = vol_24h_clob + vol_24h_amm
-
-                            # Include markets with either total or 24h volume
-                            if total_vol > 0 or vol_24h > 0:
-                                m['_calculated_volume'] = total_vol if total_vol > 0 else vol_24h
-                                markets_with_volume.append(m)
-                        except (ValueError, TypeError):
-                            pass
-
-                    # Sort by calculated volume (descending)
-                    markets_with_volume.sort(
-                        key=lambda m: m.get('_calculated_volume', 0),
-                        reverse=True
-                    )
 
-                    result = markets_with_volume[:limit]
-                    print(f"✓ Fetched {len(markets)} total markets, filtered to {len(result)} with volume")
-                    return result
-            else:
-                print(f"Gamma API returned status {response.status_code}")
+# ============= HELPER FUNCTIONS =============
 
-            return []
-    except Exception as e:
-        print(f"Market fetch error: {e}")
-        return []
+async def get_polymarket_markets(limit: int = 50) -> List[Dict]:
+    """Top live markets by volume from the shared Gamma catalog snapshot"""
+    return await market_catalog.markets(limit)
 
 
 def generate_audio_briefing(text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> Optional[str]:
@@ -136,12 +126,10 @@ def generate_audio_briefing(text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -
         print(f"🎵 Generating audio for text (length: {len(text)} chars)...")
 
         # Use the unified audio module (supports Hathora, ElevenLabs, and gTTS)
-        from spoon.audio import generate_briefing
-        
-        # Generate audio with unique ID
-        audio_id = random.randint(1000000, 9999999)
-        audio_filename = f"briefing_{audio_id}.mp3"
-        audio_path = audio_dir / audio_filename
+        from spoon.audio import generate_briefing, briefing_cache_key
+
+        # Content-addressed filename: identical text and voice reuse the same file
+        audio_path = default_audio_cache().path(briefing_cache_key(text, voice_id=voice_id))
 
         # Generate audio using the unified module (tries Hathora first, then ElevenLabs, then gTTS)
         result_path = generate_briefing(
@@ -152,6 +140,8 @@ def generate_audio_briefing(text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -
         )
 
         if result_path and Path(result_path).exists():
+            # Fallback-provider audio is stored under a different, uncached name
+            audio_filename = Path(result_path).name
             file_size = Path(result_path).stat().st_size
             if file_size > 500:  # At least 500 bytes of audio
                 audio_url = f"http://localhost:8000/audio/{audio_filename}"
@@ -174,6 +164,21 @@ def generate_audio_briefing(text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -
         return None
 
 
+# Blocking TTS runs on the job queue's worker threads, never on the event loop
+tts_jobs = TTSJobQueue(generate_audio_briefing)
+
+# How long a request handler waits for its audio before returning the job id instead
+TTS_INLINE_WAIT = float(os.getenv("POLYINTEL_TTS_INLINE_WAIT", "20"))
+
+
+async def queue_audio_briefing(text: str, voice_id: Optional[str] = None) -> Dict:
+    """Queue a TTS job and wait briefly for it; returns audio_url (or None) and audio_job_id"""
+    job = await tts_jobs.run(text, voice_id, timeout=TTS_INLINE_WAIT)
+    if job is None:
+        return {"audio_url": None, "audio_job_id": None}
+    return {"audio_url": job.audio_url, "audio_job_id": job.id}
+
+
 def generate_analysis_reasoning(market_slug: str, odds: float, sentiment_score: float, direction: str, divergence: float) -> str:
     """Generate detailed analysis reasoning"""
     sentiment_text = "positive" if sentiment_score > 0 else "negative"
@@ -298,12 +303,35 @@ def format_market(market: Dict) -> Dict:
         return None
 
 
+# Filtered, volume-sorted and pre-formatted Gamma markets shared by all endpoints
+market_catalog = MarketCatalog(formatter=format_market)
+
+podcast_generator = PodcastBriefingGenerator()
+
+
+async def generate_podcast(query: str, category: str, duration: str) -> Dict:
+    return await podcast_generator.generate_podcast_briefing(query, category, duration)
+
+
+async def briefing_candidates() -> List[Dict]:
+    """Trending markets the briefing scheduler may pre-generate, with their volume"""
+    markets = await market_catalog.markets(int(os.getenv("POLYINTEL_BRIEFING_CANDIDATES", "20")))
+    return [
+        {"query": m["question"], "volume": m.get("_calculated_volume", 0)}
+        for m in markets if m.get("question")
+    ]
+
+
+# Podcast briefings pre-generated for trending and frequently requested markets
+briefings = BriefingScheduler(generate_podcast, briefing_candidates)
+
+
 # ============= REAL MARKET ANALYSIS FUNCTIONS =============
 
 async def fetch_market_from_clob(market_id: str) -> Optional[Dict]:
     """Fetch detailed market info from Polymarket CLOB API"""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with upstream_client("https://clob.polymarket.com", timeout=10.0) as client:
             url = f"https://clob.polymarket.com/markets/{market_id}"
             response = await client.get(url)
             if response.status_code == 200:
@@ -314,154 +342,96 @@ async def fetch_market_from_clob(market_id: str) -> Optional[Dict]:
         return None
 
 
-async def fetch_market_trades(market_id: str, limit: int = 500) -> List[Dict]:
-    """Fetch trade history for a market"""
+# CLOB pagination marker for "no more pages"
+END_CURSOR = "LTE="
+
+
+async def fetch_market_trades(market_id: str, limit: int = 500, after: Optional[int] = None,
+                              next_cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of a market's trades, newest first (only trades after the `after` unix timestamp if given),
+    and the cursor of the next, older page (None when there is none)
+    """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with upstream_client("https://clob.polymarket.com", timeout=10.0) as client:
             url = "https://clob.polymarket.com/trades"
             params = {"market": market_id, "limit": limit}
+            if after is not None:
+                params["after"] = after
+            if next_cursor:
+                params["next_cursor"] = next_cursor
             response = await client.get(url, params=params)
             if response.status_code == 200:
                 data = response.json()
-                return data if isinstance(data, list) else []
-            return []
+                nxt = None
+                if isinstance(data, dict):
+                    nxt = data.get("next_cursor")
+                    data = data.get("data", [])
+                if not isinstance(data, list):
+                    return [], None
+                return data, (nxt if nxt and nxt != END_CURSOR else None)
+            return [], None
     except Exception as e:
         print(f"Trade fetch error: {e}")
-        return []
+        return [], None
 
 
-async def fetch_order_book(market_id: str) -> Dict:
-    """Fetch order book for market liquidity analysis"""
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            url = "https://clob.polymarket.com/book"
-            params = {"market": market_id}
-            response = await client.get(url, params=params)
-            if response.status_code == 200:
-                return response.json()
-            return {"bids": [], "asks": []}
-    except Exception as e:
-        print(f"Order book fetch error: {e}")
-        return {"bids": [], "asks": []}
+# Local trade history per market, extended past a stored cursor on each sync
+trade_store = TradeStore()
+# Stored trades loaded as columns for scoring (recent-window metrics use the tail)
+SCORING_WINDOW = int(os.getenv("POLYINTEL_SCORING_WINDOW", "20000"))
+# Markets whose trades are synced at once by the multi-market risk scan
+RISK_SCAN_CONCURRENCY = int(os.getenv("POLYINTEL_RISK_SCAN_CONCURRENCY", "5"))
+# Trader interaction graphs over the stored history, updated incrementally per market
+wash_detector = WashTradingDetector(trade_store)
 
 
-def calculate_health_score(market_data: Dict, trades: List[Dict]) -> Dict:
-    """Calculate real market health score from actual data"""
+async def sync_market_trades(market_id: str, page_size: int = 500, max_pages: int = 10) -> int:
+    """
+    Pull trades newer than the stored cursor into the trade store; returns the new trade count.
+    Pages walk backwards from the newest trade until the cursor (or the start of history) is
+    reached, and only then does the cursor advance. A walk cut short by `max_pages` is resumed
+    from where it stopped on the next sync, so no stretch of history is ever skipped.
+    """
+    cursor, next_cursor, newest = await asyncio.to_thread(trade_store.sync_state, market_id)
+    # Overlap by a second so trades sharing the cursor timestamp aren't skipped (duplicates are ignored)
+    after = cursor - 1 if cursor else None
+    added = 0
+    for _ in range(max_pages):
+        page, next_cursor = await fetch_market_trades(market_id, limit=page_size, after=after,
+                                                      next_cursor=next_cursor)
+        added += await asyncio.to_thread(trade_store.ingest, market_id, page)
+        stamps = [normalize_trade(t)[1] for t in page if isinstance(t, dict)]
+        if stamps:
+            newest = max(newest or 0, max(stamps))
+        reached = cursor is not None and stamps and min(stamps) <= cursor
+        if not page or not next_cursor or reached:
+            done = max(cursor or 0, newest or 0) or None
+            await asyncio.to_thread(trade_store.save_sync_state, market_id, done)
+            return added
+    await asyncio.to_thread(trade_store.save_sync_state, market_id, cursor, next_cursor, newest)
+    return added
+
+
+# Short-TTL order book snapshots shared by every request
+order_books = OrderBookCache()
+
+
+async def fetch_order_books(token_ids: List[str]) -> Dict[str, Dict]:
+    """Order book depth analytics per CLOB outcome token, fetched in one batch (unavailable books omitted)"""
+    books = await order_books.get_many(token_ids)
+    return {t: book_metrics(book) for t, book in books.items() if not book.empty}
+
+
+def calculate_health_score(market_data: Dict, trades: Union[List[Dict], TradeColumns],
+                           summary: Optional[Dict] = None) -> Dict:
+    """
+    Calculate real market health score from actual data.
+    With a trade store `summary`, diversity, consistency and concentration cover full history.
+    """
     try:
-        # Liquidity score (0-100)
-        total_liquidity = float(market_data.get("liquidity", 0))
-        liquidity_score = min(100, (total_liquidity / 100000) * 100)
-
-        # Trader diversity (unique addresses)
-        unique_traders = set()
-        for trade in trades:
-            if trade.get("maker_address"):
-                unique_traders.add(trade["maker_address"])
-            if trade.get("taker_address"):
-                unique_traders.add(trade["taker_address"])
-
-        trader_count = len(unique_traders)
-        diversity_score = min(100, (trader_count / 50) * 100)
-
-        # Volume consistency
-        if len(trades) > 10:
-            volumes = []
-            for trade in trades[-100:]:  # Last 100 trades
-                try:
-                    size = float(trade.get("size", 0))
-                    price = float(trade.get("price", 0))
-                    volumes.append(size * price)
-                except (ValueError, TypeError):
-                    continue
-
-            if len(volumes) > 5:
-                avg_volume = sum(volumes) / len(volumes)
-                variance = sum((v - avg_volume) ** 2 for v in volumes) / len(volumes)
-                std_dev = variance ** 0.5
-                consistency_score = max(0, 100 - (std_dev / (avg_volume + 1) * 50))
-            else:
-                consistency_score = 50
-        else:
-            consistency_score = 50
-
-        # Price stability
-        last_price = float(market_data.get("last_price", 0.5))
-        volume_24h = float(market_data.get("volume24hr", 0))
-
-        if volume_24h > 100000:
-            stability_score = 85
-        elif volume_24h > 10000:
-            stability_score = 70
-        elif volume_24h > 1000:
-            stability_score = 50
-        else:
-            stability_score = 30
-
-        # Manipulation score (inverse of concentration)
-        if trades:
-            trader_volumes = {}
-            for trade in trades:
-                maker = trade.get("maker_address", "")
-                taker = trade.get("taker_address", "")
-                size = float(trade.get("size", 0))
-                price = float(trade.get("price", 0))
-                vol = size * price
-
-                if maker:
-                    trader_volumes[maker] = trader_volumes.get(maker, 0) + vol
-                if taker:
-                    trader_volumes[taker] = trader_volumes.get(taker, 0) + vol
-
-            if trader_volumes:
-                total_vol = sum(trader_volumes.values())
-                top_trader_pct = (max(trader_volumes.values()) / total_vol * 100) if total_vol > 0 else 0
-
-                if top_trader_pct < 20:
-                    manip_score = 90
-                elif top_trader_pct < 40:
-                    manip_score = 70
-                elif top_trader_pct < 60:
-                    manip_score = 40
-                else:
-                    manip_score = 10
-            else:
-                manip_score = 50
-        else:
-            manip_score = 50
-
-        # Calculate overall score
-        overall_score = (
-            liquidity_score * 0.25 +
-            diversity_score * 0.20 +
-            consistency_score * 0.20 +
-            stability_score * 0.15 +
-            manip_score * 0.20
-        )
-
-        if overall_score >= 75:
-            risk_level = "LOW"
-            risk_color = "green"
-        elif overall_score >= 50:
-            risk_level = "MODERATE"
-            risk_color = "yellow"
-        else:
-            risk_level = "HIGH"
-            risk_color = "red"
-
-        return {
-            "overall_score": int(overall_score),
-            "risk_level": risk_level,
-            "risk_color": risk_color,
-            "liquidity_score": int(liquidity_score),
-            "diversity_score": int(diversity_score),
-            "volume_score": int(consistency_score),
-            "stability_score": int(stability_score),
-            "manipulation_score": int(manip_score),
-            "total_liquidity": total_liquidity,
-            "unique_traders": trader_count,
-            "volatility": round(min(100, (1 - (overall_score / 100)) * 100), 1),
-            "spread": round(abs(float(market_data.get("last_price", 0.5)) - 0.5) * 100, 2)
-        }
+        cols = trades if isinstance(trades, TradeColumns) else TradeColumns.from_trades(trades)
+        return health_score(market_data, cols, summary)
     except Exception as e:
         print(f"Health score calculation error: {e}")
         return {
@@ -480,77 +450,16 @@ def calculate_health_score(market_data: Dict, trades: List[Dict]) -> Dict:
         }
 
 
-def detect_anomalies(market_data: Dict, trades: List[Dict]) -> Dict:
-    """Detect volume anomalies and suspicious patterns"""
+def detect_anomalies(market_data: Dict, trades: Union[List[Dict], TradeColumns],
+                     summary: Optional[Dict] = None) -> Dict:
+    """
+    Detect volume anomalies and suspicious patterns.
+    With a trade store `summary`, recent trades are compared to the full-history average and
+    pair/self-trade counts come from full history (normalized per 100 trades).
+    """
     try:
-        if len(trades) < 10:
-            return {
-                "volume_anomaly": False,
-                "suspicious_patterns": 0,
-                "wash_trading_risk": "LOW",
-                "confidence": "LOW"
-            }
-
-        # Calculate average trade size
-        trade_sizes = []
-        for trade in trades[-50:]:  # Last 50 trades
-            try:
-                size = float(trade.get("size", 0))
-                price = float(trade.get("price", 0))
-                trade_sizes.append(size * price)
-            except (ValueError, TypeError):
-                continue
-
-        if not trade_sizes:
-            return {
-                "volume_anomaly": False,
-                "suspicious_patterns": 0,
-                "wash_trading_risk": "LOW",
-                "confidence": "LOW"
-            }
-
-        avg_size = sum(trade_sizes) / len(trade_sizes)
-        max_size = max(trade_sizes)
-
-        # Detect if any trade is 5x larger than average
-        anomaly_detected = max_size > (avg_size * 5)
-
-        # Check for repeated trader pairs (potential wash trading)
-        from collections import defaultdict
-        trader_pairs = defaultdict(int)
-        self_trades = 0
-
-        for trade in trades[-100:]:  # Last 100 trades
-            maker = trade.get("maker_address", "")
-            taker = trade.get("taker_address", "")
-
-            if not maker or not taker:
-                continue
-
-            if maker.lower() == taker.lower():
-                self_trades += 1
-            else:
-                pair = tuple(sorted([maker, taker]))
-                trader_pairs[pair] += 1
-
-        suspicious_pairs = len([p for p, count in trader_pairs.items() if count > 3])
-
-        if suspicious_pairs > 5 or self_trades > 5:
-            wash_risk = "HIGH"
-        elif suspicious_pairs > 2 or self_trades > 2:
-            wash_risk = "MEDIUM"
-        else:
-            wash_risk = "LOW"
-
-        return {
-            "volume_anomaly": anomaly_detected,
-            "max_trade_size": max_size,
-            "avg_trade_size": avg_size,
-            "suspicious_patterns": suspicious_pairs,
-            "self_trades": self_trades,
-            "wash_trading_risk": wash_risk,
-            "confidence": "HIGH" if len(trades) > 50 else "MEDIUM"
-        }
+        cols = trades if isinstance(trades, TradeColumns) else TradeColumns.from_trades(trades)
+        return anomaly_report(market_data, cols, summary)
     except Exception as e:
         print(f"Anomaly detection error: {e}")
         return {
@@ -571,25 +480,26 @@ async def root():
         "version": "1.0.0",
         "endpoints": [
             "GET /polymarket/trending - Get trending markets",
-            "POST /polycaster/signal - Analyze market"
+            "POST /polycaster/signal - Analyze market",
+            "POST /polycaster/podcast - Podcast briefing (pre-generated for trending markets)",
+            "GET /mcp/cache - Agent tool cache hit/miss stats"
         ]
     }
 
 
 @app.get("/audio/{filename}")
 async def get_audio(filename: str):
-    """Serve audio files with CORS headers"""
+    """Serve audio files with CORS headers (Range requests return 206 partial content for seeking)"""
     from fastapi.responses import FileResponse
 
     # Security: only allow safe filenames
     if not filename.startswith("briefing_") or not filename.endswith(".mp3"):
         raise HTTPException(status_code=400, detail="Invalid filename")
 
-    audio_path = Path("./audio") / filename
+    audio_path = default_audio_cache().root / filename
 
     if not audio_path.exists():
         print(f"Audio file not found: {audio_path}")
-        print(f"Available files: {list(Path('./audio').glob('*.mp3'))}")
         raise HTTPException(status_code=404, detail="Audio file not found")
 
     file_size = audio_path.stat().st_size
@@ -599,26 +509,80 @@ async def get_audio(filename: str):
 
     print(f"Serving audio file: {filename} ({file_size} bytes)")
 
+    # Files are content-addressed, so a name always maps to the same bytes
     return FileResponse(
         path=str(audio_path),
         media_type="audio/mpeg",
         filename=filename,
+        content_disposition_type="inline",
+        headers={"Cache-Control": "public, max-age=86400, immutable"},
     )
 
 
+async def _stream_tts(text: str, voice_id: Optional[str]):
+    from fastapi.responses import StreamingResponse
+    from spoon.audio import stream_briefing
+
+    if not text or not text.strip():
+        raise HTTPException(status_code=400, detail="Empty text")
+    # The sync chunk generator is iterated on the threadpool, one chunk at a time
+    return StreamingResponse(
+        stream_briefing(text, voice_id=voice_id or "21m00Tcm4TlvDq8ikWAM"),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/tts/stream")
+async def stream_tts_get(text: str, voice_id: Optional[str] = None):
+    """Chunked MP3 of `text` relayed as the TTS provider produces it (usable as an <audio> src)"""
+    return await _stream_tts(text, voice_id)
+
+
+@app.post("/tts/stream")
+async def stream_tts_post(request: TTSJobRequest):
+    """Chunked MP3 for long texts"""
+    return await _stream_tts(request.text, request.voice_id)
+
+
+@app.post("/tts/jobs")
+async def create_tts_job(request: TTSJobRequest):
+    """Queue text-to-speech; poll GET /tts/jobs/{job_id} for the audio URL"""
+    if not request.text or not request.text.strip():
+        raise HTTPException(status_code=400, detail="Empty text")
+    try:
+        job = tts_jobs.submit(request.text, request.voice_id)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="TTS queue is full, retry later")
+    return job.to_dict()
+
+
+@app.get("/tts/jobs/{job_id}")
+async def get_tts_job(job_id: str, wait: float = 0.0):
+    """Get TTS job status; `wait` long-polls up to that many seconds (max 30) for completion"""
+    job = tts_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if wait > 0:
+        await tts_jobs.wait(job, timeout=min(wait, 30.0))
+    return job.to_dict()
+
+
+@app.delete("/tts/jobs/{job_id}")
+async def cancel_tts_job(job_id: str):
+    """Cancel a queued or running TTS job"""
+    job = tts_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
 @app.get("/polymarket/trending")
 async def get_trending_markets(limit: int = 12):
     """Get trending Polymarket predictions"""
     try:
-        # Fetch real data
-        markets = await get_polymarket_markets(limit=limit * 2)
-
-        # Format markets
-        formatted = []
-        for market in markets:
-            formatted_market = format_market(market)
-            if formatted_market:
-                formatted.append(formatted_market)
+        # Pre-formatted markets from the catalog snapshot
+        formatted = await market_catalog.formatted(limit=limit * 2)
 
         # Return top N
         return {
@@ -641,22 +605,14 @@ async def get_market_list(limit: int = 20):
 async def analyze_signal(request: AnalysisRequest):
     """Analyze market using PolyCaster sentiment analysis"""
     try:
-        # Find market
-        markets = await get_polymarket_markets(limit=100)
-
-        target_market = None
-        slug_lower = request.market_slug.lower()
-
-        for m in markets:
-            market_slug = (m.get("market_slug") or m.get("slug") or "").lower()
-            if slug_lower in market_slug or market_slug in slug_lower:
-                target_market = m
-                break
+        # Find market by slug, id or condition id across the whole catalog
+        target_market = await market_catalog.find(request.market_slug)
 
         if not target_market:
             # Return demo response with reasoning
             reasoning = generate_analysis_reasoning(request.market_slug, 0.5, random.random() * 100 - 50, "YES", 0.2)
-            audio_briefing = generate_audio_briefing(reasoning) if request.use_manus else None
+            audio = await queue_audio_briefing(reasoning) if request.use_manus else {}
+            audio_briefing = audio.get("audio_url")
             return {
                 "state": {
                     "market_slug": request.market_slug,
@@ -675,6 +631,7 @@ async def analyze_signal(request: AnalysisRequest):
                     "proof_link": f"https://polymarket.com"
                 },
                 "audio_url": audio_briefing,
+                "audio_job_id": audio.get("audio_job_id"),
                 "audio_file": None
             }
 
@@ -703,10 +660,12 @@ async def analyze_signal(request: AnalysisRequest):
 
         # Generate audio briefing if requested
         audio_briefing = None
+        audio = {}
         print(f"📋 Request use_manus: {request.use_manus}")
         if request.use_manus:
             print(f"🎙️ Generating audio briefing (reasoning length: {len(reasoning)} chars)...")
-            audio_briefing = generate_audio_briefing(reasoning)
+            audio = await queue_audio_briefing(reasoning)
+            audio_briefing = audio["audio_url"]
             if audio_briefing:
                 print(f"✓ Audio generated: {audio_briefing}")
             else:
@@ -732,6 +691,7 @@ async def analyze_signal(request: AnalysisRequest):
                 "proof_link": f"https://polymarket.com/market/{formatted.get('slug', '')}"
             },
             "audio_url": audio_briefing,
+            "audio_job_id": audio.get("audio_job_id"),
             "audio_file": None
         }
 
@@ -748,13 +708,63 @@ async def spoon_trade(request: AnalysisRequest):
     return await analyze_signal(request)
 
 
+@app.post("/polycaster/podcast")
+async def polycaster_podcast(request: PodcastRequest):
+    """Podcast-style briefing (DeSearch + LLM + TTS), served from the pre-generated store when fresh"""
+    query = request.query
+    if not query and request.market_slug:
+        market = await market_catalog.find(request.market_slug)
+        query = (market or {}).get("question")
+    if not query:
+        raise HTTPException(status_code=400, detail="query or a known market_slug is required")
+
+    result, entry = await briefings.get(query, request.category or "crypto", request.duration or "PAST_24_HOURS")
+    if entry is None:
+        raise HTTPException(status_code=502, detail=result.get("error", "Briefing generation failed"))
+
+    script = result.get("script", "")
+    analysis = result.get("analysis", "")
+    audio_file = result.get("audio_file")
+    return {
+        "status": "success",
+        "query": result.get("query", query),
+        "audio_file": audio_file,
+        "audio_url": f"/audio/{audio_file}" if audio_file else None,
+        "script_preview": script[:500] + "..." if len(script) > 500 else script,
+        "sentiment_score": result.get("raw_data", {}).get("sentiment_score", 0),
+        "data_sources": result.get("raw_data", {}).get("metrics", {}),
+        "analysis_summary": analysis[:300] + "..." if len(analysis) > 300 else analysis,
+        "cached": entry.hits > 0,
+        "generated_by": entry.source,
+        "age_seconds": round(entry.age(), 1),
+    }
+
+
+@app.get("/polycaster/podcast/schedule")
+async def podcast_schedule():
+    """Briefing pre-generation status: store hit rate, remaining budget, stored briefings"""
+    return {
+        "stats": briefings.stats(),
+        "briefings": [
+            {"query": e.query, "source": e.source, "age_seconds": round(e.age(), 1), "hits": e.hits}
+            for e in reversed(briefings.entries.values())
+        ],
+    }
+
+
+@app.get("/mcp/cache")
+async def mcp_cache():
+    """Hit/miss, stale-serve and eviction counts of the process-wide agent tool cache"""
+    return {"stats": mcp_cache_stats()}
+
+
 @app.get("/polywhaler/whales")
 async def get_whale_data():
     """Get whale activity and large positions from top markets"""
     try:
         from datetime import datetime
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with upstream_client("https://gamma-api.polymarket.com", timeout=15.0) as client:
             # Fetch top markets by volume
             response = await client.get(
                 "https://gamma-api.polymarket.com/markets",
@@ -835,14 +845,8 @@ async def polycop_risk_analysis(request: AnalysisRequest):
     Returns health score, volatility, liquidity, and anomaly detection
     """
     try:
-        # First, find the market in trending markets to get the ID
-        markets = await get_polymarket_markets(limit=100)
-        target_market = None
-
-        for market in markets:
-            if request.market_slug.lower() in (market.get("slug", "") or "").lower():
-                target_market = market
-                break
+        # First, find the market in the catalog to get the ID
+        target_market = await market_catalog.find(request.market_slug)
 
         if not target_market:
             # Try using slug as market ID directly
@@ -869,14 +873,28 @@ async def polycop_risk_analysis(request: AnalysisRequest):
         else:
             market_id = target_market.get("id") or target_market.get("condition_id") or request.market_slug
 
-        # Fetch trade history for anomaly detection
-        trades = await fetch_market_trades(market_id, limit=500)
+        # Extend the local trade history with trades newer than the stored cursor, while the
+        # outcome tokens' order books are fetched in one batch (or served from the snapshot cache)
+        token_ids = market_token_ids(target_market)
+        _, books = await asyncio.gather(sync_market_trades(market_id), fetch_order_books(token_ids))
+        book = books.get(token_ids[0], {}) if token_ids else {}
+        trades = await asyncio.to_thread(trade_store.trade_columns, market_id, SCORING_WINDOW)
+        summary = await asyncio.to_thread(trade_store.summary, market_id)
 
         # Calculate health score from real data
-        health = calculate_health_score(target_market, trades)
+        health = calculate_health_score(target_market, trades, summary)
 
         # Detect anomalies
-        anomalies = detect_anomalies(target_market, trades)
+        anomalies = detect_anomalies(target_market, trades, summary)
+
+        # Real spread from the order book replaces the last-price estimate
+        if book.get("spread") is not None:
+            health["spread"] = round(book["spread"] * 100, 2)
+
+        # Rings, circular flows and self-trade clusters over the full history
+        wash = await asyncio.to_thread(wash_detector.analyze, market_id)
+        anomalies["wash_trading_risk"] = max(anomalies["wash_trading_risk"], wash["wash_trading_risk"],
+                                             key=RISK_ORDER.index)
 
         # Determine risk factors based on analysis
         risk_factors = []
@@ -888,6 +906,11 @@ async def polycop_risk_analysis(request: AnalysisRequest):
             risk_factors.append("High trader concentration")
         if anomalies["volume_anomaly"]:
             risk_factors.append("Volume anomalies detected")
+        slip = book.get("slippage", {}).get("1000", {})
+        if book and (slip.get("buy_slippage_pct") is None or slip["buy_slippage_pct"] > 5):
+            risk_factors.append("Thin order book (high slippage for $1k orders)")
+        if wash["tight_ring_volume_share"] > 0.1 or wash["reciprocal_volume_share"] > 0.1:
+            risk_factors.append("Circular trading between linked wallets")
 
         if not risk_factors:
             risk_factors = ["Low market cap concentration", "Regulatory clarity", "Stable liquidity pools"]
@@ -900,6 +923,7 @@ async def polycop_risk_analysis(request: AnalysisRequest):
                 "liquidity": f"${int(health['total_liquidity']):,}" if health["total_liquidity"] > 0 else "$0",
                 "volatility": health["volatility"],
                 "spread": health["spread"],
+                "book_liquidity": f"${int(sum(b['bid_depth'] + b['ask_depth'] for b in books.values())):,}" if books else None,
                 "unique_traders": health["unique_traders"],
                 "wash_trading_risk": anomalies["wash_trading_risk"],
                 "volume_anomaly": anomalies["volume_anomaly"],
@@ -917,6 +941,34 @@ async def polycop_risk_analysis(request: AnalysisRequest):
                 "volume_consistency": health["volume_score"],
                 "price_stability": health["stability_score"],
                 "manipulation_resistance": health["manipulation_score"]
+            },
+            "order_book": {
+                "best_bid": book.get("best_bid"),
+                "best_ask": book.get("best_ask"),
+                "spread_pct": book.get("spread_pct"),
+                "bid_depth": book.get("bid_depth"),
+                "ask_depth": book.get("ask_depth"),
+                "depth": book.get("depth", {}),
+                "slippage": book.get("slippage", {}),
+                "outcomes": [{
+                    "token_id": t,
+                    "best_bid": books[t]["best_bid"],
+                    "best_ask": books[t]["best_ask"],
+                    "bid_depth": books[t]["bid_depth"],
+                    "ask_depth": books[t]["ask_depth"]
+                } for t in token_ids if t in books]
+            },
+            "wash_trading": {
+                "rings": wash["rings"],
+                "largest_rings": wash["largest_rings"][:3],
+                "circular_volume_share": wash["circular_volume_share"],
+                "tight_ring_volume_share": wash["tight_ring_volume_share"],
+                "reciprocal_pairs": wash["reciprocal_pairs"],
+                "reciprocal_volume_share": wash["reciprocal_volume_share"],
+                "triangles": wash["triangles"],
+                "self_trades": wash["self_trades"],
+                "self_trade_volume_share": wash["self_trade_volume_share"],
+                "self_trade_clusters": wash["self_trade_clusters"][:3]
             }
         }
 
@@ -925,6 +977,107 @@ async def polycop_risk_analysis(request: AnalysisRequest):
         raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
 
 
+@app.get("/polycop/risk-scan")
+async def polycop_risk_scan(limit: int = 20):
+    """
+    Health and anomaly scores for the top `limit` trending markets in one request, riskiest first.
+    Trades are synced a few markets at a time while every market's YES order book is fetched in one
+    batch; all markets are then scored from their stored columns in one worker-thread pass.
+    """
+    markets = await market_catalog.markets(max(1, min(limit, 100)))
+    if not markets:
+        raise HTTPException(status_code=503, detail="Market catalog not available")
+    ids = [m.get("id") or m.get("condition_id") or m.get("slug") for m in markets]
+
+    sem = asyncio.Semaphore(RISK_SCAN_CONCURRENCY)
+
+    async def sync(market_id: str) -> None:
+        async with sem:
+            try:
+                await sync_market_trades(market_id)
+            except Exception as e:
+                print(f"Risk scan sync error for {market_id}: {e}")
+
+    yes_tokens = [(market_token_ids(m) or [None])[0] for m in markets]
+    books, *_ = await asyncio.gather(fetch_order_books([t for t in yes_tokens if t]),
+                                     *(sync(market_id) for market_id in ids))
+
+    def score() -> List[Tuple[Dict, Dict]]:
+        items = [(m, trade_store.trade_columns(market_id, SCORING_WINDOW), trade_store.summary(market_id))
+                 for m, market_id in zip(markets, ids)]
+        return score_markets(items)
+
+    scored = await asyncio.to_thread(score)
+    results = []
+    for m, market_id, token, (health, anomalies) in zip(markets, ids, yes_tokens, scored):
+        book = books.get(token, {})
+        results.append({
+            "market_id": market_id,
+            "market_slug": m.get("slug"),
+            "question": m.get("question"),
+            "risk_level": health["risk_level"],
+            "overall_score": health["overall_score"],
+            "liquidity": health["total_liquidity"],
+            "book_liquidity": round(book["bid_depth"] + book["ask_depth"], 2) if book else None,
+            "volatility": health["volatility"],
+            # Real spread from the order book replaces the last-price estimate
+            "spread": round(book["spread"] * 100, 2) if book.get("spread") is not None else health["spread"],
+            "unique_traders": health["unique_traders"],
+            "wash_trading_risk": anomalies["wash_trading_risk"],
+            "volume_anomaly": anomalies["volume_anomaly"],
+        })
+    results.sort(key=lambda r: r["overall_score"])
+    return {"status": "success", "count": len(results), "data": results}
+
+
+@app.get("/council/scan")
+async def council_scan(limit: int = 20, concurrency: Optional[int] = None, deadline: Optional[float] = None):
+    """
+    Run the Fundamental, Sentiment and Whale agents plus the Judge over the top `limit` markets.
+    Streams NDJSON: one line per market as it finishes, then a ranking of the completed markets.
+    """
+    from fastapi.responses import StreamingResponse
+    from core.context import DataContext
+    from runner.council import scan_council
+
+    markets = await market_catalog.markets(max(1, min(limit, 100)))
+    by_slug = {m.get("slug"): m for m in markets if m.get("slug")}
+    if not by_slug:
+        raise HTTPException(status_code=503, detail="Market catalog not available")
+
+    async def lines():
+        start = time.monotonic()
+        yield json.dumps({"type": "start", "markets": len(by_slug)}) + "\n"
+        completed = []
+        context = DataContext()
+        scan = scan_council(by_slug, {"source": "scan"}, concurrency=concurrency, deadline=deadline, context=context)
+        try:
+            async for result in scan:
+                m = by_slug[result["market_id"]]
+                result.update(type="market", question=m.get("question"), volume=m.get("_calculated_volume"))
+                if result["status"] == "ok":
+                    completed.append(result)
+                yield json.dumps(result) + "\n"
+        finally:
+            # The context is ours: stop the scan and any fetch still running for a timed-out
+            # market or a client that disconnected
+            await scan.aclose()
+            context.cancel_pending()
+        ranking = sorted(completed, key=lambda r: r["decision"]["confidence"], reverse=True)
+        yield json.dumps({
+            "type": "summary",
+            "elapsed": round(time.monotonic() - start, 3),
+            "completed": len(completed),
+            "failed": len(by_slug) - len(completed),
+            "upstream": context.stats(),
+            "ranking": [{"market_id": r["market_id"], "question": r["question"],
+                         "direction": r["decision"]["direction"], "confidence": r["decision"]["confidence"],
+                         "strategy": r["decision"]["strategy"]} for r in ranking],
+        }) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.post("/chatbot/ask")
 async def chatbot_ask(request: ChatRequest):
     """Intelligent chatbot that answers questions based on dashboard data"""
@@ -1011,6 +1164,7 @@ Your mission: Take the provided market JSON, interpret the question, and return
         # Try to use available LLM providers - Claude first for quality
         response_text = None
         audio_url = None
+        audio_job_id = None
         
         # Try Claude (Anthropic) first for better quality
         try:
@@ -1074,13 +1228,16 @@ Remember: Use ONLY the markets in the JSON above. Keep response to 1-2 sentences
         # Generate voice response if requested - always use Hathora for chatbot
         if request.use_voice and response_text:
             print("🎙️ Generating voice response with Hathora TTS...")
-            audio_url = generate_audio_briefing(response_text)
+            audio = await queue_audio_briefing(response_text)
+            audio_url = audio["audio_url"]
+            audio_job_id = audio["audio_job_id"]
             if audio_url:
                 print(f"✓ Voice response generated: {audio_url}")
         
         return {
             "response": response_text,
             "audio_url": audio_url,
+            "audio_job_id": audio_job_id,
             "context_used": {
                 "markets_count": len(markets),
                 "has_selected_market": bool(request.context and request.context.get('selected_market')),
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+Fetcher = Callable[[], Awaitable[Any]]
+
+
+class SWRCache:
+    """
+    Size-bounded LRU for async fetches with stale-while-revalidate.
+    Fresh entries are returned directly; entries past `ttl` but within `max_stale` are returned
+    immediately while one background refresh replaces them. Concurrent fetches of a key are
+    coalesced. A fetch returning None is treated as a failure: nothing is cached and a stale
+    value, if any, is kept.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 max_stale: Optional[float] = None) -> None:
+        self.max_entries = max_entries or int(os.getenv("POLYINTEL_CACHE_SIZE", "1024"))
+        self.ttl = ttl or float(os.getenv("POLYINTEL_CACHE_TTL", "120"))
+        self.max_stale = max_stale or float(os.getenv("POLYINTEL_CACHE_MAX_STALE", "900"))
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str, fetch: Fetcher, ttl: Optional[float] = None) -> Any:
+        """Cached value for `key`, calling `fetch` on a miss or revalidating it in the background when stale"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age <= (ttl or self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if age <= self.max_stale:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._refresh(key, fetch)
+                return value
+        self.misses += 1
+        return await asyncio.shield(self._refresh(key, fetch))
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+        }
+
+    def _refresh(self, key: str, fetch: Fetcher) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._run(key, fetch))
+        return task
+
+    async def _run(self, key: str, fetch: Fetcher) -> Any:
+        self.refreshes += 1
+        try:
+            value = await fetch()
+        except Exception:
+            self.errors += 1
+            value = None
+        finally:
+            self._inflight.pop(key, None)
+        if value is None:
+            return self._entries[key][0] if key in self._entries else None
+        self._entries[key] = (value, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
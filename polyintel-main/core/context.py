@@ -0,0 +1,48 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+def _key(endpoint: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    return json.dumps([endpoint, args, kwargs], sort_keys=True, default=repr)
+
+
+class DataContext:
+    """
+    Request-scoped memo of upstream fetches keyed by (endpoint, args).
+    Concurrent identical calls await the same task, so each distinct request is made at most
+    once per context. Results are kept until the context is dropped; a failed or cancelled fetch
+    is forgotten once it finishes, so a later caller retries instead of inheriting the error.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def fetch(self, fn: Callable[..., Awaitable[Any]], *args: Any,
+                    endpoint: Optional[str] = None, **kwargs: Any) -> Any:
+        """`await fn(*args, **kwargs)`, memoized; `endpoint` defaults to the function's qualified name"""
+        key = _key(endpoint or getattr(fn, "__qualname__", repr(fn)), args, kwargs)
+        task = self._tasks.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._tasks[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda t, k=key: self._forget_failed(k, t))
+        else:
+            self.hits += 1
+        # One caller being cancelled must not cancel the fetch the others are awaiting
+        return await asyncio.shield(task)
+
+    def cancel_pending(self) -> None:
+        """Cancel fetches nobody is waiting for any more (e.g. after a deadline)"""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+
+    def _forget_failed(self, key: str, task: asyncio.Future) -> None:
+        if (task.cancelled() or task.exception() is not None) and self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.misses, "deduplicated": self.hits}
@@ -0,0 +1,98 @@
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+
+
+@dataclass(frozen=True)
+class HostConfig:
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    timeout: float = 10.0
+
+
+# Upstreams hit on the hot paths get larger pools; everything else uses HostConfig()
+DEFAULT_HOST_CONFIGS: Dict[str, HostConfig] = {
+    "gamma-api.polymarket.com": HostConfig(max_connections=50, max_keepalive_connections=20, timeout=15.0),
+    "clob.polymarket.com": HostConfig(max_connections=50, max_keepalive_connections=20, timeout=10.0),
+    "data-api.polymarket.com": HostConfig(max_connections=30, max_keepalive_connections=10, timeout=10.0),
+    "api.desearch.ai": HostConfig(max_connections=20, max_keepalive_connections=10, timeout=30.0),
+    "api-ai-oracle.apro.com": HostConfig(max_connections=20, max_keepalive_connections=10, timeout=15.0),
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class UpstreamClients:
+    """Registry of long-lived keep-alive pools, one httpx.AsyncClient per upstream host."""
+
+    def __init__(self, host_configs: Optional[Dict[str, HostConfig]] = None, http2: Optional[bool] = None) -> None:
+        self.host_configs = dict(DEFAULT_HOST_CONFIGS)
+        self.host_configs.update(host_configs or {})
+        if http2 is None:
+            http2 = os.getenv("POLYINTEL_HTTP2", "false").lower() == "true"
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+        self.http2 = bool(http2) and _http2_available()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Shared client for the host of `url` (a full URL or a bare host). Do not close it."""
+        host = urlsplit(url).netloc if "//" in url else url
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            cfg = self.host_configs.get(host, HostConfig())
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=cfg.timeout,
+                limits=httpx.Limits(
+                    max_connections=cfg.max_connections,
+                    max_keepalive_connections=cfg.max_keepalive_connections,
+                    keepalive_expiry=cfg.keepalive_expiry,
+                ),
+            )
+            self._clients[host] = client
+        return client
+
+    def hosts(self) -> Dict[str, bool]:
+        return {host: not c.is_closed for host, c in self._clients.items()}
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for c in clients.values():
+            await c.aclose()
+
+
+_default_clients: Optional[UpstreamClients] = None
+
+
+def set_default_clients(clients: Optional[UpstreamClients]) -> None:
+    """Install the process-wide registry (done by the app lifespan)."""
+    global _default_clients
+    _default_clients = clients
+
+
+def get_default_clients() -> Optional[UpstreamClients]:
+    return _default_clients
+
+
+@asynccontextmanager
+async def upstream_client(url: str, clients: Optional[UpstreamClients] = None, **kwargs) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield a pooled client for `url` from the injected or process-wide registry.
+    Outside the app lifespan (scripts, tests) a one-off client is opened and closed instead.
+    """
+    registry = clients or _default_clients
+    if registry is not None:
+        yield registry.client(url)
+        return
+    async with httpx.AsyncClient(**kwargs) as client:
+        yield client
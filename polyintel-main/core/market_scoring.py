@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _float_column(values: Sequence[Any]) -> np.ndarray:
+    try:
+        return np.array(values, dtype=float)
+    except (ValueError, TypeError):
+        # Unparseable entries become NaN and are skipped like the per-trade try/except used to
+        return np.fromiter((_to_float(v) for v in values), dtype=float, count=len(values))
+
+
+def _field(market_data: Dict, key: str, default: float) -> float:
+    value = market_data.get(key)
+    return default if value is None else float(value)
+
+
+@dataclass
+class TradeColumns:
+    """Trades converted once into columns; trader addresses become integer codes (-1 = missing)"""
+    sizes: np.ndarray
+    prices: np.ndarray
+    notional: np.ndarray
+    maker: np.ndarray
+    taker: np.ndarray
+    traders: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.notional)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple[Any, Any, Any, Any]]) -> "TradeColumns":
+        """Build from (maker, taker, size, price) rows, oldest first"""
+        n = len(rows)
+        if n == 0:
+            empty_f = np.empty(0, dtype=float)
+            empty_i = np.empty(0, dtype=np.int64)
+            return cls(empty_f, empty_f, empty_f, empty_i, empty_i, np.empty(0, dtype=object))
+
+        makers, takers, sizes, prices = zip(*rows)
+        sizes_arr = _float_column(sizes)
+        prices_arr = _float_column(prices)
+
+        # Factorize addresses in one pass; "" (missing) maps to -1
+        index: Dict[str, int] = {"": -1}
+        codes = np.fromiter((index.setdefault(str(a or "").lower(), len(index) - 1) for a in makers + takers),
+                            dtype=np.int64, count=2 * n)
+        del index[""]
+        traders = np.array(list(index), dtype=object)
+        return cls(sizes_arr, prices_arr, sizes_arr * prices_arr, codes[:n], codes[n:], traders)
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Dict[str, Any]]) -> "TradeColumns":
+        """Build from CLOB trade dicts (maker_address, taker_address, size, price), oldest first"""
+        return cls.from_rows([
+            (t.get("maker_address"), t.get("taker_address"), t.get("size", 0), t.get("price", 0))
+            for t in trades
+        ])
+
+
+def _concentration_score(top_trader_pct: float) -> int:
+    if top_trader_pct < 20:
+        return 90
+    if top_trader_pct < 40:
+        return 70
+    if top_trader_pct < 60:
+        return 40
+    return 10
+
+
+def health_score(market_data: Dict, cols: TradeColumns, summary: Optional[Dict] = None) -> Dict:
+    """
+    Market health from trade columns in vectorized passes.
+    With a trade store `summary`, diversity, consistency and concentration cover full history.
+    """
+    n = len(cols)
+
+    # Liquidity score (0-100)
+    total_liquidity = _field(market_data, "liquidity", 0)
+    liquidity_score = min(100, (total_liquidity / 100000) * 100)
+
+    # Trader diversity (unique addresses)
+    seen = np.zeros(len(cols.traders), dtype=bool)
+    seen[cols.maker[cols.maker >= 0]] = True
+    seen[cols.taker[cols.taker >= 0]] = True
+    trader_count = int(seen.sum())
+    if summary and summary.get("trade_count"):
+        trader_count = summary["unique_traders"]
+    diversity_score = min(100, (trader_count / 50) * 100)
+
+    # Volume consistency (last 100 trades, or full history from the summary)
+    consistency_score = 50
+    if summary and summary.get("trade_count", 0) > 10:
+        avg_volume = summary["notional_mean"]
+        consistency_score = max(0, 100 - (summary["notional_std"] / (avg_volume + 1) * 50))
+    elif n > 10:
+        volumes = cols.notional[-100:]
+        volumes = volumes[~np.isnan(volumes)]
+        if len(volumes) > 5:
+            avg_volume = float(volumes.mean())
+            consistency_score = max(0, 100 - (float(volumes.std()) / (avg_volume + 1) * 50))
+
+    # Price stability
+    volume_24h = _field(market_data, "volume24hr", 0)
+    if volume_24h > 100000:
+        stability_score = 85
+    elif volume_24h > 10000:
+        stability_score = 70
+    elif volume_24h > 1000:
+        stability_score = 50
+    else:
+        stability_score = 30
+
+    # Manipulation score (inverse of concentration): maker and taker each get the trade's notional
+    manip_score = 50
+    if summary and summary.get("trader_volume_total", 0) > 0:
+        manip_score = _concentration_score(summary["top_trader_volume"] / summary["trader_volume_total"] * 100)
+    elif n:
+        vol = np.nan_to_num(cols.notional)
+        codes = np.concatenate([cols.maker, cols.taker])
+        weights = np.concatenate([vol, vol])
+        mask = codes >= 0
+        if mask.any():
+            trader_volumes = np.bincount(codes[mask], weights=weights[mask], minlength=len(cols.traders))
+            total_vol = float(trader_volumes.sum())
+            top_trader_pct = float(trader_volumes.max()) / total_vol * 100 if total_vol > 0 else 0
+            manip_score = _concentration_score(top_trader_pct)
+
+    overall_score = (
+        liquidity_score * 0.25 +
+        diversity_score * 0.20 +
+        consistency_score * 0.20 +
+        stability_score * 0.15 +
+        manip_score * 0.20
+    )
+
+    if overall_score >= 75:
+        risk_level, risk_color = "LOW", "green"
+    elif overall_score >= 50:
+        risk_level, risk_color = "MODERATE", "yellow"
+    else:
+        risk_level, risk_color = "HIGH", "red"
+
+    return {
+        "overall_score": int(overall_score),
+        "risk_level": risk_level,
+        "risk_color": risk_color,
+        "liquidity_score": int(liquidity_score),
+        "diversity_score": int(diversity_score),
+        "volume_score": int(consistency_score),
+        "stability_score": int(stability_score),
+        "manipulation_score": int(manip_score),
+        "total_liquidity": total_liquidity,
+        "unique_traders": trader_count,
+        "volatility": round(min(100, (1 - (overall_score / 100)) * 100), 1),
+        "spread": round(abs(_field(market_data, "last_price", 0.5) - 0.5) * 100, 2)
+    }
+
+
+def anomaly_report(market_data: Dict, cols: TradeColumns, summary: Optional[Dict] = None) -> Dict:
+    """
+    Volume anomalies and wash-trading indicators from trade columns.
+    With a trade store `summary`, recent trades are compared to the full-history average and
+    pair/self-trade counts come from full history (normalized per 100 trades).
+    """
+    empty = {
+        "volume_anomaly": False,
+        "suspicious_patterns": 0,
+        "wash_trading_risk": "LOW",
+        "confidence": "LOW"
+    }
+    n = len(cols)
+    if n < 10:
+        return empty
+
+    # Trade sizes over the last 50 trades
+    trade_sizes = cols.notional[-50:]
+    trade_sizes = trade_sizes[~np.isnan(trade_sizes)]
+    if not len(trade_sizes):
+        return empty
+
+    avg_size = float(trade_sizes.mean())
+    if summary and summary.get("trade_count", 0) > 50:
+        avg_size = summary["notional_mean"]
+    max_size = float(trade_sizes.max())
+
+    # Detect if any trade is 5x larger than average
+    anomaly_detected = max_size > (avg_size * 5)
+
+    # Repeated trader pairs and self trades over the last 100 trades
+    maker = cols.maker[-100:]
+    taker = cols.taker[-100:]
+    both = (maker >= 0) & (taker >= 0)
+    maker, taker = maker[both], taker[both]
+    self_mask = maker == taker
+    self_trades = int(self_mask.sum())
+    lo = np.minimum(maker[~self_mask], taker[~self_mask])
+    hi = np.maximum(maker[~self_mask], taker[~self_mask])
+    _, pair_counts = np.unique(lo * (len(cols.traders) + 1) + hi, return_counts=True)
+    suspicious_pairs = int((pair_counts > 3).sum())
+
+    if summary and summary.get("trade_count", 0) > 100:
+        # Same thresholds as the 100-trade window, applied to full-history rates
+        scale = 100.0 / summary["trade_count"]
+        suspicious_pairs = round(summary["repeated_pairs"] * scale)
+        self_trades = round(summary["self_trades"] * scale)
+
+    if suspicious_pairs > 5 or self_trades > 5:
+        wash_risk = "HIGH"
+    elif suspicious_pairs > 2 or self_trades > 2:
+        wash_risk = "MEDIUM"
+    else:
+        wash_risk = "LOW"
+
+    return {
+        "volume_anomaly": bool(anomaly_detected),
+        "max_trade_size": max_size,
+        "avg_trade_size": avg_size,
+        "suspicious_patterns": suspicious_pairs,
+        "self_trades": self_trades,
+        "wash_trading_risk": wash_risk,
+        "confidence": "HIGH" if n > 50 else "MEDIUM"
+    }
+
+
+def score_markets(items: Sequence[Tuple[Dict, TradeColumns, Optional[Dict]]]) -> List[Tuple[Dict, Dict]]:
+    """(health, anomalies) for many markets, each scored from its own columns"""
+    return [(health_score(m, cols, summary), anomaly_report(m, cols, summary)) for m, cols, summary in items]
@@ -0,0 +1,123 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Words, contractions and the chart/rocket emoji used in crypto posts
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[\U0001F300-\U0001FAFF]")
+# Clause boundaries stop a negation from reaching further words
+_CLAUSE = re.compile(r"[.!?;:,\n]+")
+# Typographic apostrophes (as in "don’t") are read as ASCII ones so contractions stay one token
+_APOSTROPHES = str.maketrans({"\u2019": "'", "\u2018": "'", "\u02bc": "'"})
+
+POSITIVE = (
+    "bullish", "pump", "buy", "moon", "green", "up", "gain", "profit", "bull", "rally", "surge", "rise",
+    "positive", "growth", "optimistic", "breakout", "rocket", "recover", "stable", "🚀", "📈",
+)
+NEGATIVE = (
+    "bearish", "dump", "sell", "red", "down", "loss", "bear", "crash", "panic", "fear", "drop", "fall",
+    "negative", "decline", "risk", "depeg", "collapse", "bear market", "📉",
+)
+# Inflection endings tried, longest first, when a token is not itself in the lexicon
+_SUFFIXES = (("ies", "y"), ("ied", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", ""))
+NEGATIONS = ("not", "no", "never", "without", "hardly", "isn't", "aren't", "wasn't", "don't", "doesn't",
+             "didn't", "won't", "can't", "cannot", "nor")
+
+
+@dataclass
+class SentimentResult:
+    positive: int = 0
+    negative: int = 0
+    items: List[float] = field(default_factory=list)
+
+    def score(self, neutral: float = 0.0) -> float:
+        """(pos - neg) / (pos + neg) over all items, `neutral` when nothing matched"""
+        total = self.positive + self.negative
+        return (self.positive - self.negative) / total if total else neutral
+
+
+class Lexicon:
+    """
+    Compiled polarity lexicon: single words in a hash map, multi-word phrases keyed by their
+    first word. Text is tokenized once, so matching is linear in its length and whole-word only;
+    common inflections (-s, -es, -ed, -ing, -ies) are reduced to their lexicon form first.
+    """
+
+    def __init__(self, positive: Iterable[str] = POSITIVE, negative: Iterable[str] = NEGATIVE,
+                 negations: Iterable[str] = NEGATIONS, negation_window: int = 3) -> None:
+        self.words: Dict[str, int] = {}
+        self.phrases: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+        for terms, polarity in ((positive, 1), (negative, -1)):
+            for term in terms:
+                tokens = tuple(_TOKEN.findall(term.lower()))
+                if len(tokens) == 1:
+                    self.words[tokens[0]] = polarity
+                elif tokens:
+                    self.phrases.setdefault(tokens[0], []).append((tokens, polarity))
+        for candidates in self.phrases.values():
+            candidates.sort(key=lambda c: len(c[0]), reverse=True)
+        self.negations = frozenset(n.lower().translate(_APOSTROPHES) for n in negations)
+        self.negation_window = negation_window
+
+    def normalize(self, token: str) -> str:
+        """
+        Lexicon form of an inflected token ("surges", "dropped", "crashing", "rallied" ->
+        surge, drop, crash, rally); tokens with no known base form come back unchanged
+        """
+        if token in self.words or token in self.phrases or token in self.negations:
+            return token
+        for suffix, replacement in _SUFFIXES:
+            if not token.endswith(suffix) or len(token) - len(suffix) < 2:
+                continue
+            base = token[:-len(suffix)] + replacement
+            # surg(ing) -> surge, dropp(ed) -> drop, panick(ed) -> panic
+            for form in (base, base + "e", base[:-1] if base[-1] == base[-2] or base.endswith("ck") else None):
+                if form and (form in self.words or form in self.phrases):
+                    return form
+        return token
+
+    def count(self, text: str) -> Tuple[int, int]:
+        """(positive, negative) hits in `text`; a negation shortly before a term flips it"""
+        pos = neg = 0
+        for clause in _CLAUSE.split((text or "").lower().translate(_APOSTROPHES)):
+            tokens = [self.normalize(t) for t in _TOKEN.findall(clause)]
+            last_negation = -self.negation_window - 1
+            i = 0
+            while i < len(tokens):
+                tok = tokens[i]
+                if tok in self.negations:
+                    last_negation = i
+                    i += 1
+                    continue
+                polarity, width = 0, 1
+                for phrase, p in self.phrases.get(tok, ()):
+                    if tuple(tokens[i:i + len(phrase)]) == phrase:
+                        polarity, width = p, len(phrase)
+                        break
+                if not polarity:
+                    polarity = self.words.get(tok, 0)
+                if polarity:
+                    if i - last_negation <= self.negation_window:
+                        polarity = -polarity
+                    if polarity > 0:
+                        pos += 1
+                    else:
+                        neg += 1
+                i += width
+        return pos, neg
+
+    def score_texts(self, texts: Iterable[Optional[str]]) -> SentimentResult:
+        """Per-item scores (0.0 when an item has no hits) plus aggregate hit counts"""
+        result = SentimentResult()
+        for text in texts:
+            pos, neg = self.count(text or "")
+            result.positive += pos
+            result.negative += neg
+            result.items.append((pos - neg) / (pos + neg) if pos + neg else 0.0)
+        return result
+
+
+default_lexicon = Lexicon()
+
+
+def score_texts(texts: Iterable[Optional[str]]) -> SentimentResult:
+    return default_lexicon.score_texts(texts)
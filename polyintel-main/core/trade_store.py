@@ -0,0 +1,275 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from core.market_scoring import TradeColumns
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def normalize_trade(trade: Dict[str, Any]) -> Tuple[str, int, str, str, float, float, str]:
+    """(trade_id, ts, maker, taker, size, price, side) from a CLOB trade"""
+    ts_raw = trade.get("match_time") or trade.get("timestamp") or trade.get("last_update") or 0
+    ts = int(_to_float(ts_raw))
+    if ts > 10_000_000_000:  # milliseconds
+        ts //= 1000
+    maker = str(trade.get("maker_address") or "").lower()
+    taker = str(trade.get("taker_address") or "").lower()
+    size = _to_float(trade.get("size"))
+    price = _to_float(trade.get("price"))
+    side = str(trade.get("side") or "").upper()
+    trade_id = trade.get("id")
+    if not trade_id:
+        # One transaction can carry several fills, so the tx hash alone is not a trade id
+        raw = f"{trade.get('transaction_hash') or ''}|{ts}|{maker}|{taker}|{size}|{price}|{side}"
+        trade_id = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return str(trade_id), ts, maker, taker, size, price, side
+
+
+class TradeStore:
+    """
+    Local SQLite history of CLOB trades per market, filled incrementally past a stored cursor.
+    Per-trader volume, trader-pair counts and running totals are maintained on insert so
+    health/anomaly summaries cost the same no matter how much history is stored.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or os.getenv("POLYINTEL_TRADE_DB", "./data/trades.db")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS trades (
+                    market_id TEXT NOT NULL,
+                    trade_id TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    maker TEXT NOT NULL,
+                    taker TEXT NOT NULL,
+                    size REAL NOT NULL,
+                    price REAL NOT NULL,
+                    side TEXT NOT NULL,
+                    PRIMARY KEY (market_id, trade_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_trades_market_ts ON trades(market_id, ts);
+
+                CREATE TABLE IF NOT EXISTS trader_volume (
+                    market_id TEXT NOT NULL,
+                    trader TEXT NOT NULL,
+                    volume REAL NOT NULL,
+                    trades INTEGER NOT NULL,
+                    PRIMARY KEY (market_id, trader)
+                );
+                CREATE INDEX IF NOT EXISTS idx_trader_volume_rank ON trader_volume(market_id, volume);
+
+                CREATE TABLE IF NOT EXISTS trader_pairs (
+                    market_id TEXT NOT NULL,
+                    trader_a TEXT NOT NULL,
+                    trader_b TEXT NOT NULL,
+                    trades INTEGER NOT NULL,
+                    volume REAL NOT NULL,
+                    PRIMARY KEY (market_id, trader_a, trader_b)
+                );
+
+                CREATE TABLE IF NOT EXISTS market_trade_stats (
+                    market_id TEXT PRIMARY KEY,
+                    last_ts INTEGER NOT NULL,
+                    trade_count INTEGER NOT NULL,
+                    notional REAL NOT NULL,
+                    notional_sq REAL NOT NULL,
+                    self_trades INTEGER NOT NULL,
+                    unique_traders INTEGER NOT NULL,
+                    synced_at REAL NOT NULL
+                );
+
+                -- cursor: every trade up to this timestamp is stored.
+                -- resume/pending_ts: position and newest timestamp of an unfinished backwards walk.
+                CREATE TABLE IF NOT EXISTS trade_sync (
+                    market_id TEXT PRIMARY KEY,
+                    cursor INTEGER,
+                    resume TEXT,
+                    pending_ts INTEGER
+                );
+            """)
+
+    def cursor(self, market_id: str) -> Optional[int]:
+        """Timestamp up to which history is complete, or None before the first finished sync"""
+        return self.sync_state(market_id)[0]
+
+    def sync_state(self, market_id: str) -> Tuple[Optional[int], Optional[str], Optional[int]]:
+        """(cursor, resume page cursor, newest timestamp seen) for the market's sync"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT cursor, resume, pending_ts FROM trade_sync WHERE market_id = ?",
+                               (market_id,)).fetchone()
+        return (row["cursor"], row["resume"], row["pending_ts"]) if row else (None, None, None)
+
+    def save_sync_state(self, market_id: str, cursor: Optional[int], resume: Optional[str] = None,
+                        pending_ts: Optional[int] = None) -> None:
+        with self._write_lock, self._connect() as conn:
+            conn.execute("""
+                INSERT INTO trade_sync (market_id, cursor, resume, pending_ts) VALUES (?, ?, ?, ?)
+                ON CONFLICT(market_id) DO UPDATE SET
+                    cursor = excluded.cursor, resume = excluded.resume, pending_ts = excluded.pending_ts
+            """, (market_id, cursor, resume, pending_ts))
+
+    def ingest(self, market_id: str, trades: List[Dict[str, Any]]) -> int:
+        """Insert unseen trades and fold them into the aggregates; returns the number of new trades"""
+        rows = [normalize_trade(t) for t in trades if isinstance(t, dict)]
+        if not rows:
+            self._touch(market_id)
+            return 0
+
+        with self._write_lock, self._connect() as conn:
+            new_rows = []
+            for row in rows:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO trades (market_id, trade_id, ts, maker, taker, size, price, side) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (market_id,) + row)
+                if cur.rowcount:
+                    new_rows.append(row)
+
+            volumes: Dict[str, List[float]] = {}
+            pairs: Dict[Tuple[str, str], List[float]] = {}
+            notional = notional_sq = 0.0
+            self_trades = 0
+            last_ts = 0
+            for _, ts, maker, taker, size, price, _ in new_rows:
+                vol = size * price
+                notional += vol
+                notional_sq += vol * vol
+                last_ts = max(last_ts, ts)
+                for trader in {maker, taker}:
+                    if trader:
+                        v = volumes.setdefault(trader, [0.0, 0])
+                        v[0] += vol
+                        v[1] += 1
+                if maker and taker:
+                    if maker == taker:
+                        self_trades += 1
+                    else:
+                        p = pairs.setdefault(tuple(sorted((maker, taker))), [0, 0.0])
+                        p[0] += 1
+                        p[1] += vol
+
+            conn.executemany("""
+                INSERT INTO trader_volume (market_id, trader, volume, trades) VALUES (?, ?, ?, ?)
+                ON CONFLICT(market_id, trader) DO UPDATE SET
+                    volume = volume + excluded.volume, trades = trades + excluded.trades
+            """, [(market_id, t, v, n) for t, (v, n) in volumes.items()])
+            conn.executemany("""
+                INSERT INTO trader_pairs (market_id, trader_a, trader_b, trades, volume) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(market_id, trader_a, trader_b) DO UPDATE SET
+                    trades = trades + excluded.trades, volume = volume + excluded.volume
+            """, [(market_id, a, b, n, v) for (a, b), (n, v) in pairs.items()])
+
+            unique_traders = conn.execute("SELECT COUNT(*) FROM trader_volume WHERE market_id = ?",
+                                          (market_id,)).fetchone()[0]
+            conn.execute("""
+                INSERT INTO market_trade_stats
+                    (market_id, last_ts, trade_count, notional, notional_sq, self_trades, unique_traders, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(market_id) DO UPDATE SET
+                    last_ts = MAX(last_ts, excluded.last_ts),
+                    trade_count = trade_count + excluded.trade_count,
+                    notional = notional + excluded.notional,
+                    notional_sq = notional_sq + excluded.notional_sq,
+                    self_trades = self_trades + excluded.self_trades,
+                    unique_traders = excluded.unique_traders,
+                    synced_at = excluded.synced_at
+            """, (market_id, last_ts, len(new_rows), notional, notional_sq, self_trades,
+                  unique_traders, time.time()))
+        return len(new_rows)
+
+    def _touch(self, market_id: str) -> None:
+        with self._write_lock, self._connect() as conn:
+            conn.execute("UPDATE market_trade_stats SET synced_at = ? WHERE market_id = ?",
+                         (time.time(), market_id))
+
+    def summary(self, market_id: str, repeat_threshold: int = 3) -> Dict[str, Any]:
+        """Aggregates over the full stored history of a market"""
+        with self._connect() as conn:
+            stats = conn.execute("SELECT * FROM market_trade_stats WHERE market_id = ?",
+                                 (market_id,)).fetchone()
+            if not stats:
+                return {"trade_count": 0, "unique_traders": 0, "notional": 0.0, "notional_std": 0.0,
+                        "top_trader_volume": 0.0, "trader_volume_total": 0.0, "self_trades": 0,
+                        "repeated_pairs": 0, "last_ts": None, "synced_at": None}
+            top = conn.execute(
+                "SELECT MAX(volume), SUM(volume) FROM trader_volume WHERE market_id = ?",
+                (market_id,)).fetchone()
+            repeated = conn.execute(
+                "SELECT COUNT(*) FROM trader_pairs WHERE market_id = ? AND trades > ?",
+                (market_id, repeat_threshold)).fetchone()[0]
+
+        n = stats["trade_count"]
+        mean = stats["notional"] / n if n else 0.0
+        variance = max(0.0, stats["notional_sq"] / n - mean * mean) if n else 0.0
+        return {
+            "trade_count": n,
+            "unique_traders": stats["unique_traders"],
+            "notional": stats["notional"],
+            "notional_mean": mean,
+            "notional_std": variance ** 0.5,
+            "top_trader_volume": top[0] or 0.0,
+            "trader_volume_total": top[1] or 0.0,
+            "self_trades": stats["self_trades"],
+            "repeated_pairs": repeated,
+            "last_ts": stats["last_ts"],
+            "synced_at": stats["synced_at"],
+        }
+
+    def trade_columns(self, market_id: str, limit: Optional[int] = None) -> TradeColumns:
+        """Most recent stored trades (all when `limit` is None), oldest first, as scoring columns"""
+        query = "SELECT maker, taker, size, price FROM trades WHERE market_id = ? ORDER BY ts DESC"
+        params: Tuple[Any, ...] = (market_id,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._connect() as conn:
+            conn.row_factory = None
+            rows = conn.execute(query, params).fetchall()
+        rows.reverse()
+        return TradeColumns.from_rows(rows)
+
+    def trades_since(self, market_id: str, after_rowid: int = 0,
+                     limit: int = 50000) -> List[Tuple[int, str, str, float]]:
+        """(rowid, maker, taker, notional) for trades stored after `after_rowid`, in insertion order"""
+        with self._connect() as conn:
+            conn.row_factory = None
+            return conn.execute(
+                "SELECT rowid, maker, taker, size * price FROM trades "
+                "WHERE market_id = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+                (market_id, after_rowid, limit)).fetchall()
+
+    def recent_trades(self, market_id: str, limit: int = 500) -> List[Dict[str, Any]]:
+        """Most recent stored trades, oldest first, in the CLOB field names the scorers read"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT trade_id, ts, maker, taker, size, price, side FROM trades "
+                "WHERE market_id = ? ORDER BY ts DESC LIMIT ?", (market_id, limit)).fetchall()
+        return [{
+            "id": r["trade_id"],
+            "match_time": r["ts"],
+            "maker_address": r["maker"],
+            "taker_address": r["taker"],
+            "size": r["size"],
+            "price": r["price"],
+            "side": r["side"],
+        } for r in reversed(rows)]
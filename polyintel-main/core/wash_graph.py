@@ -0,0 +1,274 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from core.trade_store import TradeStore
+
+RISK_ORDER = ("LOW", "MEDIUM", "HIGH")
+
+
+class TraderGraph:
+    """
+    Directed maker -> taker interaction graph for one market. Parallel trades collapse into
+    one weighted edge, so memory follows the number of trader relationships, not trades.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.out: List[Dict[int, List[float]]] = []  # dst -> [trades, volume]
+        self.self_trades: Dict[int, List[float]] = {}  # trader -> [trades, volume]
+        self.trade_count = 0
+        self.volume = 0.0
+        self.last_rowid = 0
+        self.version = 0
+
+    def _node(self, address: str) -> int:
+        node = self.nodes.get(address)
+        if node is None:
+            node = len(self.names)
+            self.nodes[address] = node
+            self.names.append(address)
+            self.out.append({})
+        return node
+
+    def add(self, maker: str, taker: str, volume: float) -> None:
+        if not maker or not taker:
+            return
+        self.trade_count += 1
+        self.volume += volume
+        src = self._node(maker)
+        dst = self._node(taker)
+        edge = self.self_trades if src == dst else self.out[src]
+        key = src if src == dst else dst
+        e = edge.get(key)
+        if e is None:
+            edge[key] = [1, volume]
+        else:
+            e[0] += 1
+            e[1] += volume
+
+
+def strongly_connected_components(out: List[Dict[int, Any]]) -> List[int]:
+    """Iterative Tarjan; returns the component id of every node (O(V + E), no recursion)"""
+    n = len(out)
+    index = [-1] * n
+    low = [0] * n
+    comp = [-1] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    counter = 0
+    n_comp = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work: List[Tuple[int, Any]] = [(root, iter(out[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            v, children = work[-1]
+            advanced = False
+            for w in children:
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(out[w])))
+                    advanced = True
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    comp[w] = n_comp
+                    if w == v:
+                        break
+                n_comp += 1
+    return comp
+
+
+def analyze_graph(graph: TraderGraph, max_cycles: int = 10000, sample_size: int = 10,
+                  tight_ring_size: int = 10) -> Dict[str, Any]:
+    """
+    Rings (strongly connected components), 2- and 3-cycles and self-trade clusters.
+    Active markets naturally form one giant component, so risk is driven by small closed
+    rings, back-and-forth (reciprocal) volume and self trades rather than by cycle counts.
+    """
+    out = graph.out
+    comp = strongly_connected_components(out)
+
+    members: Dict[int, List[int]] = {}
+    for node, c in enumerate(comp):
+        members.setdefault(c, []).append(node)
+    rings = {c: nodes for c, nodes in members.items() if len(nodes) > 1}
+
+    # Volume that circulates inside rings (edges whose endpoints share a component)
+    circular_volume = 0.0
+    ring_volume: Dict[int, float] = {}
+    reciprocal_pairs = 0
+    reciprocal_volume = 0.0
+    for u, edges in enumerate(out):
+        cu = comp[u]
+        if cu not in rings:
+            continue
+        for v, (_, vol) in edges.items():
+            if comp[v] != cu:
+                continue
+            circular_volume += vol
+            ring_volume[cu] = ring_volume.get(cu, 0.0) + vol
+            if u < v and u in out[v]:
+                reciprocal_pairs += 1
+                reciprocal_volume += vol + out[v][u][1]
+
+    # Directed triangles u -> v -> w -> u, counted once with u as the smallest node
+    triangles = 0
+    triangle_samples: List[List[str]] = []
+    truncated = False
+    for nodes in rings.values():
+        if len(nodes) < 3:
+            continue
+        for u in nodes:
+            cu = comp[u]
+            for v in out[u]:
+                if v <= u or comp[v] != cu:
+                    continue
+                for w in out[v]:
+                    if w <= u or w == v or comp[w] != cu or u not in out[w]:
+                        continue
+                    triangles += 1
+                    if len(triangle_samples) < sample_size:
+                        triangle_samples.append([graph.names[u], graph.names[v], graph.names[w]])
+                    if triangles >= max_cycles:
+                        truncated = True
+                        break
+                if truncated:
+                    break
+            if truncated:
+                break
+        if truncated:
+            break
+
+    # Self trades grouped by the ring (or lone trader) they belong to
+    clusters: Dict[int, Dict[str, Any]] = {}
+    self_trade_count = 0
+    self_trade_volume = 0.0
+    for node, (count, vol) in graph.self_trades.items():
+        self_trade_count += count
+        self_trade_volume += vol
+        cluster = clusters.setdefault(comp[node], {"traders": [], "self_trades": 0, "volume": 0.0,
+                                                   "ring_size": len(members[comp[node]])})
+        cluster["traders"].append(graph.names[node])
+        cluster["self_trades"] += count
+        cluster["volume"] += vol
+    self_trade_clusters = sorted(clusters.values(), key=lambda c: c["volume"], reverse=True)
+
+    largest = sorted(rings.items(), key=lambda kv: ring_volume.get(kv[0], 0.0), reverse=True)
+    total = graph.volume or 1.0
+    circular_share = circular_volume / total
+    tight_share = sum(ring_volume.get(c, 0.0) for c, nodes in rings.items()
+                      if len(nodes) <= tight_ring_size) / total
+    reciprocal_share = reciprocal_volume / total
+    self_share = self_trade_volume / total
+
+    if tight_share > 0.3 or reciprocal_share > 0.3 or self_share > 0.1:
+        risk = "HIGH"
+    elif tight_share > 0.1 or reciprocal_share > 0.1 or self_share > 0.02:
+        risk = "MEDIUM"
+    else:
+        risk = "LOW"
+
+    return {
+        "traders": len(graph.names),
+        "edges": sum(len(e) for e in out),
+        "trades": graph.trade_count,
+        "rings": len(rings),
+        "largest_rings": [
+            {"size": len(nodes), "volume": round(ring_volume.get(c, 0.0), 2),
+             "traders": [graph.names[n] for n in nodes[:sample_size]]}
+            for c, nodes in largest[:sample_size]
+        ],
+        "circular_volume_share": round(circular_share, 4),
+        "tight_ring_volume_share": round(tight_share, 4),
+        "reciprocal_pairs": reciprocal_pairs,
+        "reciprocal_volume_share": round(reciprocal_share, 4),
+        "triangles": triangles,
+        "triangles_truncated": truncated,
+        "triangle_samples": triangle_samples,
+        "self_trades": self_trade_count,
+        "self_trade_volume_share": round(self_share, 4),
+        "self_trade_clusters": [
+            dict(c, traders=c["traders"][:sample_size], volume=round(c["volume"], 2))
+            for c in self_trade_clusters[:sample_size]
+        ],
+        "wash_trading_risk": risk,
+    }
+
+
+class WashTradingDetector:
+    """
+    Per-market trader graphs built from the trade store and cached in memory.
+    Each call folds in only trades stored since the last call; the analysis is
+    recomputed only when the graph changed.
+    """
+
+    def __init__(self, store: TradeStore, max_markets: Optional[int] = None, batch_size: int = 50000) -> None:
+        self.store = store
+        self.max_markets = max_markets or int(os.getenv("POLYINTEL_WASH_MARKETS", "256"))
+        self.batch_size = batch_size
+        self._graphs: "OrderedDict[str, TraderGraph]" = OrderedDict()
+        self._reports: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._market_locks: Dict[str, threading.Lock] = {}
+
+    def _market_lock(self, market_id: str) -> threading.Lock:
+        with self._lock:
+            return self._market_locks.setdefault(market_id, threading.Lock())
+
+    def _graph(self, market_id: str) -> TraderGraph:
+        with self._lock:
+            graph = self._graphs.get(market_id)
+            if graph is None:
+                graph = self._graphs[market_id] = TraderGraph()
+                while len(self._graphs) > self.max_markets:
+                    evicted, _ = self._graphs.popitem(last=False)
+                    self._reports.pop(evicted, None)
+            else:
+                self._graphs.move_to_end(market_id)
+            return graph
+
+    def update(self, market_id: str) -> TraderGraph:
+        """Fold trades stored since the last update into the market's graph"""
+        graph = self._graph(market_id)
+        while True:
+            rows = self.store.trades_since(market_id, graph.last_rowid, self.batch_size)
+            for rowid, maker, taker, volume in rows:
+                graph.add(maker, taker, volume)
+            if rows:
+                graph.last_rowid = rows[-1][0]
+                graph.version += 1
+            if len(rows) < self.batch_size:
+                return graph
+
+    def analyze(self, market_id: str) -> Dict[str, Any]:
+        """Wash-trading report over the full stored history (blocking; run in a thread)"""
+        with self._market_lock(market_id):
+            graph = self.update(market_id)
+            cached = self._reports.get(market_id)
+            if cached and cached[0] == graph.version:
+                return cached[1]
+            report = analyze_graph(graph)
+            self._reports[market_id] = (graph.version, report)
+            return report
@@ -1,8 +1,148 @@
+import asyncio
 import os
-import httpx
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from core.http import UpstreamClients, upstream_client
+
+# (symbol, quotation)
+Key = Tuple[str, str]
+BatchFetcher = Callable[[List[Key]], Awaitable[Dict[Key, Optional[dict]]]]
+
+# Map common symbols to APRO format
+SYMBOL_MAPPING = {
+    "BTC": "BTC",
+    "ETH": "ETH",
+    "USD0": "USD0",
+    "AAVE": "AAVE",
+    "LINK": "LINK",
+    "UNI": "UNI",
+    "COMP": "COMP",
+    "MKR": "MKR",
+    "SNX": "SNX",
+    "YFI": "YFI"
+}
+
+
+class PriceBatcher:
+    """
+    Shared quote cache in front of the oracle price endpoint.
+    Symbols requested within `window` seconds of each other are fetched in one batch, and quotes
+    stay fresh for `ttl` seconds. When a refresh takes longer than `max_wait` or fails, the last
+    good quote (at most `max_stale` old) is served marked stale while the batch finishes behind it.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, window: Optional[float] = None,
+                 max_wait: Optional[float] = None, max_stale: Optional[float] = None) -> None:
+        self.ttl = ttl or float(os.getenv("POLYINTEL_ORACLE_TTL", "10"))
+        self.window = window or float(os.getenv("POLYINTEL_ORACLE_WINDOW", "0.02"))
+        self.max_wait = max_wait or float(os.getenv("POLYINTEL_ORACLE_MAX_WAIT", "2"))
+        self.max_stale = max_stale or float(os.getenv("POLYINTEL_ORACLE_MAX_STALE", "3600"))
+        self.quotes: Dict[Key, Tuple[dict, float]] = {}
+        self._pending: Dict[Key, asyncio.Future] = {}
+        self._inflight: Dict[Key, asyncio.Future] = {}
+        self._flush: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.stale_served = 0
+        self.batches = 0
+        self.fetched = 0
+        self.failures = 0
+
+    async def get(self, keys: List[Key], fetch: BatchFetcher) -> Dict[Key, Optional[dict]]:
+        """Quotes for `keys` (None where neither a live nor a last-good quote exists)"""
+        now = time.time()
+        result: Dict[Key, Optional[dict]] = {}
+        waiting: Dict[Key, asyncio.Future] = {}
+        for key in dict.fromkeys(keys):
+            cached = self.quotes.get(key)
+            if cached is not None and now - cached[1] <= self.ttl:
+                self.hits += 1
+                result[key] = cached[0]
+            else:
+                waiting[key] = self._request(key, fetch)
+        if not waiting:
+            return result
+
+        # Futures are never cancelled by waiting on them, so a slow batch still lands in the cache
+        await asyncio.wait(set(waiting.values()), timeout=self.max_wait)
+        slow = [f for k, f in waiting.items() if not f.done() and self._last_good(k) is None]
+        if slow:
+            await asyncio.wait(slow)
+        for key, fut in waiting.items():
+            quote = fut.result() if fut.done() else None
+            if quote is None:
+                quote = self._last_good(key)
+                if quote is not None:
+                    self.stale_served += 1
+            result[key] = quote
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "quotes": len(self.quotes),
+            "hits": self.hits,
+            "stale_served": self.stale_served,
+            "batches": self.batches,
+            "fetched": self.fetched,
+            "failures": self.failures,
+            "inflight": len(self._inflight) + len(self._pending),
+        }
+
+    def _last_good(self, key: Key) -> Optional[dict]:
+        cached = self.quotes.get(key)
+        if cached is None:
+            return None
+        age = time.time() - cached[1]
+        return dict(cached[0], stale=True, age=round(age, 1)) if age <= self.max_stale else None
+
+    def _request(self, key: Key, fetch: BatchFetcher) -> asyncio.Future:
+        fut = self._inflight.get(key) or self._pending.get(key)
+        if fut is not None and not fut.done():
+            return fut
+        fut = self._pending[key] = asyncio.get_running_loop().create_future()
+        if self._flush is None or self._flush.done():
+            self._flush = asyncio.create_task(self._flush_after(fetch))
+        return fut
+
+    async def _flush_after(self, fetch: BatchFetcher) -> None:
+        batch: Dict[Key, asyncio.Future] = {}
+        results: Dict[Key, Optional[dict]] = {}
+        try:
+            await asyncio.sleep(self.window)
+            batch, self._pending = self._pending, {}
+            # Requests arriving from now on start the next batch
+            self._flush = None
+            self._inflight.update(batch)
+            self.batches += 1
+            self.fetched += len(batch)
+            results = await fetch(list(batch))
+        except Exception as e:
+            print(f"❌ [APRO Oracle] Batch fetch failed: {e}")
+        finally:
+            now = time.time()
+            if not batch:
+                batch, self._pending = self._pending, {}
+            for key, fut in batch.items():
+                quote = results.get(key)
+                if quote is not None:
+                    self.quotes[key] = (quote, now)
+                else:
+                    self.failures += 1
+                self._inflight.pop(key, None)
+                if not fut.done():
+                    fut.set_result(quote)
+
+
+# Process-wide, so every client instance (agents create one per run) shares quotes and batches
+_prices = PriceBatcher()
+
+
+def price_stats() -> Dict[str, float]:
+    return _prices.stats()
+
 
 class AproOracleClient:
-    def __init__(self) -> None:
+    def __init__(self, clients: Optional[UpstreamClients] = None) -> None:
+        self.clients = clients
         self.base_url = os.getenv("APRO_BASE_URL", "")
         self.api_key = os.getenv("APRO_API_KEY", "")
         # APRO v1 API base URL (public, no API key required)
@@ -12,7 +152,7 @@ class AproOracleClient:
         if not self.base_url or not self.api_key:
             return {"direction": "YES", "confidence": 0.5, "proof_link": ""}
         try:
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(self.base_url, self.clients) as client:
                 res = await client.get(
                     f"{self.base_url}/baseline",
                     params={"market_id": market_id},
@@ -30,66 +170,65 @@ class AproOracleClient:
         Fetch real price data from APRO v1 API (public, no API key required)
         This provides verified oracle data for prediction markets
         """
+        return (await self.fetch_prices([symbol], quotation))[symbol]
+
+    async def fetch_prices(self, symbols: List[str], quotation: str = "usd") -> Dict[str, dict]:
+        """
+        Verified prices for several symbols at once, keyed by the requested symbol.
+        Served from the shared quote cache; misses from concurrent callers are fetched in one batch,
+        and a symbol with no live or last-good quote gets the fallback price.
+        """
+        keys = [(symbol.upper(), quotation) for symbol in symbols]
+        quotes = await _prices.get(keys, self._fetch_batch)
+        result = {}
+        for symbol, key in zip(symbols, keys):
+            quote = quotes.get(key)
+            result[symbol] = dict(quote, symbol=symbol) if quote else self._create_fallback_price(symbol)
+        return result
+
+    async def _fetch_batch(self, keys: List[Key]) -> Dict[Key, Optional[dict]]:
+        """One round of quote requests over a single pooled client; None marks a failed symbol"""
+        url = f"{self.v1_base_url}/ticker/currency/price"
+        print(f"⚖️ [APRO Oracle v1] Fetching {len(keys)} price(s): {', '.join(f'{s}/{q}' for s, q in keys)}")
+        async with upstream_client(url, self.clients) as client:
+            quotes = await asyncio.gather(*(self._fetch_quote(client, url, s, q) for s, q in keys))
+        return dict(zip(keys, quotes))
+
+    async def _fetch_quote(self, client, url: str, symbol: str, quotation: str) -> Optional[dict]:
+        # Get the standardized symbol
+        apro_symbol = SYMBOL_MAPPING.get(symbol, symbol)
+        params = {
+            "name": apro_symbol,
+            "quotation": quotation,
+            "type": "median"  # Get median price from multiple sources
+        }
         try:
-            print(f"⚖️ [APRO Oracle v1] Fetching real price for: {symbol}/{quotation}")
-            
-            # Map common symbols to APRO format
-            symbol_mapping = {
-                "BTC": "BTC",
-                "ETH": "ETH", 
-                "USD0": "USD0",
-                "AAVE": "AAVE",
-                "LINK": "LINK",
-                "UNI": "UNI",
-                "COMP": "COMP",
-                "MKR": "MKR",
-                "SNX": "SNX",
-                "YFI": "YFI"
+            # No headers needed for v1 API - it's public!
+            res = await client.get(url, params=params, timeout=15.0)
+            if res.status_code != 200:
+                print(f"⚠️ [APRO Oracle v1] HTTP {res.status_code} for {symbol}: {res.text[:200]}")
+                return None
+            data = res.json()
+            if data.get("status", {}).get("code") != 200:
+                print(f"⚠️ [APRO Oracle v1] API returned error for {symbol}: {data.get('status', {})}")
+                return None
+            price_data = data.get("data", {})
+            price = price_data.get("price")
+            if price is None:
+                return None
+            return {
+                "source": "APRO Oracle v1 (Live)",
+                "symbol": symbol,
+                "price": price,
+                "timestamp": price_data.get("timestamp"),
+                "status": "STABLE" if 0.98 <= price <= 1.02 else "VOLATILE" if price > 0 else "ERROR",
+                "providers": price_data.get("providers", []),
+                "proof_link": f"https://api-ai-oracle.apro.com/v1/ticker/currency/price?name={apro_symbol}&quotation={quotation}"
             }
-            
-            # Get the standardized symbol
-            apro_symbol = symbol_mapping.get(symbol.upper(), symbol.upper())
-            
-            url = f"{self.v1_base_url}/ticker/currency/price"
-            params = {
-                "name": apro_symbol,
-                "quotation": quotation,
-                "type": "median"  # Get median price from multiple sources
-            }
-            
-            async with httpx.AsyncClient() as client:
-                # No headers needed for v1 API - it's public!
-                res = await client.get(url, params=params, timeout=15.0)
-                
-                if res.status_code == 200:
-                    data = res.json()
-                    if data.get("status", {}).get("code") == 200:
-                        price_data = data.get("data", {})
-                        price = price_data.get("price")
-                        timestamp = price_data.get("timestamp")
-                        
-                        print(f"✅ [APRO Oracle v1] Got live price: ${price} at {timestamp}")
-                        
-                        return {
-                            "source": "APRO Oracle v1 (Live)",
-                            "symbol": symbol,
-                            "price": price,
-                            "timestamp": timestamp,
-                            "status": "STABLE" if 0.98 <= price <= 1.02 else "VOLATILE" if price > 0 else "ERROR",
-                            "providers": price_data.get("providers", []),
-                            "proof_link": f"https://api-ai-oracle.apro.com/v1/ticker/currency/price?name={apro_symbol}&quotation={quotation}"
-                        }
-                    else:
-                        print(f"⚠️ [APRO Oracle v1] API returned error: {data.get('status', {})}")
-                        return self._create_fallback_price(symbol)
-                else:
-                    print(f"⚠️ [APRO Oracle v1] HTTP {res.status_code}: {res.text}")
-                    return self._create_fallback_price(symbol)
-                    
         except Exception as e:
-            print(f"❌ [APRO Oracle v1] Error fetching price: {e}")
-            return self._create_fallback_price(symbol)
-    
+            print(f"❌ [APRO Oracle v1] Error fetching price for {symbol}: {e}")
+            return None
+
     def _create_fallback_price(self, symbol: str) -> dict:
         """Create fallback price data when APRO v1 fails"""
         print(f"📊 [APRO Oracle] Using fallback for {symbol}")
@@ -125,7 +264,7 @@ class AproOracleClient:
         try:
             url = f"{self.v1_base_url}/ticker/currencies/list"
             
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(url, self.clients) as client:
                 res = await client.get(url, timeout=10.0)
                 
                 if res.status_code == 200:
@@ -1,10 +1,53 @@
+import asyncio
 import os
 import json
-import httpx
-from typing import List, Dict, Any
+import time
+from collections import Counter, deque
+from typing import Awaitable, Callable, Deque, List, Dict, Any, Optional, Tuple
+from core.http import UpstreamClients, upstream_client
+from core.sentiment import score_texts
+
+# Results built from canned data rather than a live source
+MOCK_SOURCES = ("desearch_enhanced", "desearch_demo")
+
+Attempt = Tuple[str, Callable[[], Awaitable[Optional[dict]]]]
+
+
+class SourceStats:
+    """Process-wide latency samples and win/failure counts per search source, for hedge timing"""
+
+    def __init__(self, samples: int = 100) -> None:
+        self.latency: Dict[str, Deque[float]] = {}
+        self.samples = samples
+        self.wins: Counter = Counter()
+        self.failures: Counter = Counter()
+        self.last_winner: Optional[str] = None
+
+    def record(self, source: str, latency: float, ok: bool) -> None:
+        if ok:
+            self.latency.setdefault(source, deque(maxlen=self.samples)).append(latency)
+            self.wins[source] += 1
+            self.last_winner = source
+        else:
+            self.failures[source] += 1
+
+    def p95(self, source: str) -> Optional[float]:
+        samples = sorted(self.latency.get(source, ()))
+        if len(samples) < 5:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"wins": dict(self.wins), "failures": dict(self.failures), "last_winner": self.last_winner,
+                "p95": {s: round(self.p95(s) or 0.0, 3) for s in self.latency}}
+
+
+source_stats = SourceStats()
+
 
 class DeSearchClient:
-    def __init__(self) -> None:
+    def __init__(self, clients: Optional[UpstreamClients] = None) -> None:
+        self.clients = clients
         self.base_url = os.getenv("DESEARCH_BASE_URL", "")
         # Use the full API key directly - the environment variable is being truncated by shell interpretation
         env_key = os.getenv("DESEARCH_API_KEY", "")
@@ -17,7 +60,7 @@ class DeSearchClient:
         if not self.base_url or not self.api_key:
             return {"score": 0.0, "proof_link": ""}
         try:
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(self.base_url, self.clients) as client:
                 res = await client.get(
                     f"{self.base_url}/sentiment",
                     params={"q": market_id},
@@ -34,7 +77,7 @@ class DeSearchClient:
         if not self.base_url or not self.api_key:
             return {"direction": "YES", "confidence": 0.6, "proof_link": ""}
         try:
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(self.base_url, self.clients) as client:
                 res = await client.get(
                     f"{self.base_url}/whales",
                     params={"q": market_id},
@@ -81,14 +124,7 @@ class DeSearchClient:
         if key_sources:
             sources_present.append("web")
         source_diversity = len(sources_present) / 4.0
-        neg_words = ["panic", "bearish", "sell", "risk", "dump", "depeg", "collapse", "fear"]
-        pos_words = ["bullish", "rally", "surge", "optimistic", "buy", "growth", "recover", "stable"]
-        text = f"{search_summary} {reddit_summary}".lower()
-        neg = sum(1 for w in neg_words if w in text)
-        pos = sum(1 for w in pos_words if w in text)
-        raw = 0.0
-        if (neg + pos) > 0:
-            raw = (pos - neg) / float(neg + pos)
+        raw = score_texts([search_summary, reddit_summary]).score()
         scale = min(1.0, 0.3 + 0.7 * source_diversity)
         sentiment_score = max(-1.0, min(1.0, raw * scale))
         return {
@@ -114,156 +150,181 @@ class DeSearchClient:
         }
 
     async def search_multi(self, query: str, category: str, date_filter: str = "PAST_24_HOURS") -> dict:
+        """
+        Social/news search. POLYINTEL_DESEARCH_HEDGE selects the fallback strategy:
+        "delay" (default) starts the next source once the current one runs past the primary's p95
+        latency or fails; "parallel" starts every source at once; "off" tries them one by one.
+        The first live result wins and the remaining requests are cancelled.
+        """
         if not self.api_key:
             return {"status": "error", "error": "missing_api_key", "query": query, "category": category}
-        
-        # Use the working DeSearch API endpoint and authentication
+
+        mode = os.getenv("POLYINTEL_DESEARCH_HEDGE", "delay").lower()
+        if mode == "off":
+            return await self._search_sequential(query, category, date_filter)
+
+        won = await self._hedged(self._attempts(query, category, date_filter), parallel=(mode == "parallel"))
+        if won is None:
+            print("All DeSearch sources failed, using enhanced mock data")
+            return self._get_enhanced_mock_data(query, category)
+        source, result = won
+        result["served_by"] = source
+        return result
+
+    def _hedge_delay(self, primary: str) -> float:
+        default = float(os.getenv("POLYINTEL_DESEARCH_HEDGE_DELAY", "1.5"))
+        p95 = source_stats.p95(primary)
+        return default if p95 is None else max(0.25, min(5.0, p95))
+
+    async def _hedged(self, attempts: List[Attempt], parallel: bool = False) -> Optional[Tuple[str, dict]]:
+        """Run attempts staggered by the hedge delay (or all at once); first non-empty result wins"""
+        if not attempts:
+            return None
+        delay = self._hedge_delay(attempts[0][0])
+        waiting = iter(attempts)
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+
+        def launch() -> bool:
+            nxt = next(waiting, None)
+            if nxt is None:
+                return False
+            name, factory = nxt
+            running[asyncio.ensure_future(factory())] = (name, time.monotonic())
+            return True
+
+        launch()
+        if parallel:
+            while launch():
+                pass
+        more = True
+        try:
+            while running:
+                done, _ = await asyncio.wait(list(running), timeout=delay if more else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slow source: hedge with the next one
+                    more = launch()
+                    continue
+                for task in done:
+                    name, started = running.pop(task)
+                    result = None if task.cancelled() or task.exception() else task.result()
+                    ok = bool(result) and result.get("source") not in MOCK_SOURCES
+                    source_stats.record(name, time.monotonic() - started, ok)
+                    if ok:
+                        return name, result
+                    # Failed source: start the next one straight away, even while a hedge is in flight
+                    if more:
+                        more = launch()
+            return None
+        finally:
+            for task in running:
+                task.cancel()
+
+    def _attempts(self, query: str, category: str, date_filter: str) -> List[Attempt]:
+        base = self.base_url or "https://api.desearch.ai"
+        attempts: List[Attempt] = [("desearch_ai", lambda: self._search_primary(query, category, date_filter))]
+        for config in self._alternative_configs(base):
+            name = f"{config['method']} {config['endpoint'][len(base):]} ({config['auth']})"
+            attempts.append((name, lambda c=config: self._search_alternative(c, query, category, date_filter)))
+        attempts.append(("newsapi", lambda: self._search_news_api(query, category, date_filter)))
+        return attempts
+
+    async def _search_primary(self, query: str, category: str, date_filter: str) -> Optional[dict]:
         base = self.base_url or "https://api.desearch.ai"
-        url = f"{base}/desearch/ai/search"  # This endpoint works with proper auth
-        # Use the API key directly in Authorization header (without Bearer prefix)
+        url = f"{base}/desearch/ai/search"
         headers = {"Authorization": self.api_key, "Content-Type": "application/json"}
         payload = {
             "date_filter": date_filter,
-            "model": "NOVA",  # Working model
-            "prompt": query,  # Use query as the prompt
-            "streaming": False,  # Set to false for JSON response
-            "tools": ["Twitter Search", "reddit", "Web Search"]  # Get Twitter, Reddit, and web data
+            "model": "NOVA",
+            "prompt": query,
+            "streaming": False,
+            "tools": ["Twitter Search", "reddit", "Web Search"]
         }
-        
         try:
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(url, self.clients) as client:
                 res = await client.post(url, json=payload, headers=headers, timeout=30.0)
                 if res.status_code == 200:
-                    data = res.json()
-                    # Parse the response and return real data
-                    return self._parse_desearch_response(data, query, category)
-                else:
-                    # If API returns error, try to get error details
-                    error_data = {}
-                    try:
-                        error_data = res.json()
-                    except:
-                        pass
-                    
-                    # Log the error for debugging
-                    print(f"DeSearch API error: Status {res.status_code}, Response: {error_data}")
-                    
-                    # Only try alternatives if the main endpoint fails
-                    return await self._try_alternative_search(query, category, date_filter)
-                    
+                    return self._parse_desearch_response(res.json(), query, category)
+                print(f"DeSearch API error: Status {res.status_code}")
         except Exception as e:
             print(f"DeSearch API exception: {e}")
-            # Only try alternatives if the main request fails
-            return await self._try_alternative_search(query, category, date_filter)
+        return None
 
-    async def _try_alternative_search(self, query: str, category: str, date_filter: str) -> dict:
-        """Try alternative API endpoints or approaches"""
-        base = self.base_url or "https://api.desearch.ai"
-        
-        # Try different endpoints and authentication methods that might work
-        alternative_configs = [
+    async def _search_alternative(self, config: Dict[str, str], query: str, category: str,
+                                  date_filter: str) -> Optional[dict]:
+        endpoint, method, auth_type = config["endpoint"], config["method"], config["auth"]
+        if auth_type == "Bearer":
+            headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        elif auth_type == "x-api-key":
+            headers = {"X-API-Key": self.api_key, "Content-Type": "application/json"}
+        else:
+            headers = {"Content-Type": "application/json"}
+        payload = {"query": query, "filter": "social", "limit": 20, "date_filter": date_filter}
+        if auth_type == "query":
+            payload["api_key"] = self.api_key
+        try:
+            async with upstream_client(endpoint, self.clients) as client:
+                if method == "POST":
+                    res = await client.post(endpoint, json=payload, headers=headers, timeout=10.0)
+                else:
+                    res = await client.get(endpoint, params=payload, headers=headers, timeout=10.0)
+                if res.status_code == 200:
+                    return self._parse_desearch_response(res.json(), query, category)
+                print(f"DeSearch API {endpoint} ({method}, {auth_type}): Status {res.status_code}")
+        except Exception as e:
+            print(f"DeSearch API {endpoint} ({method}, {auth_type}) failed: {e}")
+        return None
+
+    async def _search_news_api(self, query: str, category: str, date_filter: str) -> Optional[dict]:
+        news_url = "https://newsapi.org/v2/everything"
+        params = {
+            "q": query,
+            "from": self._parse_date_filter(date_filter),
+            "sortBy": "popularity",
+            "language": "en",
+            "pageSize": 10
+        }
+        api_key = os.getenv("NEWS_API_KEY", "")
+        if api_key:
+            params["apiKey"] = api_key
+        try:
+            async with upstream_client(news_url, self.clients) as client:
+                res = await client.get(news_url, params=params, timeout=10.0)
+                if res.status_code == 200:
+                    return self._parse_news_api_response(res.json(), query, category)
+                print(f"NewsAPI failed with status {res.status_code}")
+        except Exception as e:
+            print(f"News API error: {e}")
+        return None
+
+    def _alternative_configs(self, base: str) -> List[Dict[str, str]]:
+        return [
             # Standard API format
             {"endpoint": f"{base}/v1/search", "method": "POST", "auth": "Bearer"},
             {"endpoint": f"{base}/api/v1/search", "method": "POST", "auth": "Bearer"},
             {"endpoint": f"{base}/search", "method": "POST", "auth": "Bearer"},
-            
+
             # Try with API key in query params
             {"endpoint": f"{base}/v1/search", "method": "GET", "auth": "query"},
             {"endpoint": f"{base}/api/search", "method": "GET", "auth": "query"},
-            
+
             # Try with different auth headers
             {"endpoint": f"{base}/v1/search", "method": "POST", "auth": "x-api-key"},
         ]
-        
-        for config in alternative_configs:
-            try:
-                async with httpx.AsyncClient() as client:
-                    endpoint = config["endpoint"]
-                    method = config["method"]
-                    auth_type = config["auth"]
-                    
-                    # Set up headers based on auth type
-                    if auth_type == "Bearer":
-                        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-                    elif auth_type == "x-api-key":
-                        headers = {"X-API-Key": self.api_key, "Content-Type": "application/json"}
-                    else:  # query auth
-                        headers = {"Content-Type": "application/json"}
-                    
-                    # Set up payload/params
-                    payload = {
-                        "query": query,
-                        "filter": "social",
-                        "limit": 20,
-                        "date_filter": date_filter,
-                    }
-                    
-                    if auth_type == "query":
-                        payload["api_key"] = self.api_key
-                    
-                    # Make the request
-                    if method == "POST":
-                        res = await client.post(endpoint, json=payload, headers=headers, timeout=10.0)
-                    else:
-                        res = await client.get(endpoint, params=payload, headers=headers, timeout=10.0)
-                    
-                    if res.status_code == 200:
-                        data = res.json()
-                        return self._parse_desearch_response(data, query, category)
-                    else:
-                        print(f"DeSearch API {endpoint} ({method}, {auth_type}): Status {res.status_code}")
-                        
-            except Exception as e:
-                print(f"DeSearch API {endpoint} ({method}, {auth_type}) failed: {e}")
-                continue
-        
-        # If all DeSearch endpoints fail, try alternative social data sources
-        print("All DeSearch API endpoints failed, trying alternative social data sources")
-        return await self._try_alternative_social_sources(query, category, date_filter)
 
-    async def _try_alternative_social_sources(self, query: str, category: str, date_filter: str) -> dict:
-        """Try to get social data from alternative sources"""
-        
-        # Since DeSearch API appears to be unavailable, let's try to implement
-        # a basic social media data simulation using available services
-        
-        # First, try to use a news API as a fallback for real data
-        try:
-            return await self._get_news_api_data(query, category, date_filter)
-        except Exception as e:
-            print(f"News API fallback failed: {e}")
-        
-        # If news API fails, return enhanced mock data
+    async def _search_sequential(self, query: str, category: str, date_filter: str) -> dict:
+        """One source at a time, in order (worst case is the sum of every timeout)"""
+        for name, factory in self._attempts(query, category, date_filter):
+            started = time.monotonic()
+            result = await factory()
+            ok = bool(result) and result.get("source") not in MOCK_SOURCES
+            source_stats.record(name, time.monotonic() - started, ok)
+            if ok:
+                result["served_by"] = name
+                return result
+        print("All DeSearch sources failed, using enhanced mock data")
         return self._get_enhanced_mock_data(query, category)
 
-    async def _get_news_api_data(self, query: str, category: str, date_filter: str) -> dict:
-        """Get real news data as a fallback for social media content"""
-        try:
-            async with httpx.AsyncClient() as client:
-                news_url = "https://newsapi.org/v2/everything"
-                from_date = self._parse_date_filter(date_filter)
-                params = {
-                    "q": query,
-                    "from": from_date,
-                    "sortBy": "popularity",
-                    "language": "en",
-                    "pageSize": 10
-                }
-                api_key = os.getenv("NEWS_API_KEY", "")
-                if api_key:
-                    params["apiKey"] = api_key
-                res = await client.get(news_url, params=params, timeout=10.0)
-                if res.status_code == 200:
-                    data = res.json()
-                    return self._parse_news_api_response(data, query, category)
-                else:
-                    print(f"NewsAPI failed with status {res.status_code}: {res.text}")
-        except Exception as e:
-            print(f"News API error: {e}")
-        
-        # If NewsAPI fails, try alternative news sources
-        return await self._get_alternative_news_data(query, category, date_filter)
-
     def _parse_date_filter(self, date_filter: str) -> str:
         """Convert date filter to ISO format"""
         from datetime import datetime, timedelta
@@ -281,32 +342,6 @@ class DeSearchClient:
             
         return from_date.strftime("%Y-%m-%d")
 
-    async def _get_alternative_news_data(self, query: str, category: str, date_filter: str) -> dict:
-        """Try alternative news sources"""
-        
-        # Try using a different news API or web scraping approach
-        try:
-            async with httpx.AsyncClient() as client:
-                # Try using a different approach - search for recent articles
-                search_url = f"https://www.google.com/search?q={query}&tbs=qdr:d"  # Last 24 hours
-                
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-                
-                res = await client.get(search_url, headers=headers, timeout=10.0)
-                
-                if res.status_code == 200:
-                    # This would require HTML parsing, but for now we'll use mock data
-                    # In a real implementation, you'd parse the search results
-                    print("Google search successful but HTML parsing not implemented")
-                    
-        except Exception as e:
-            print(f"Alternative news data failed: {e}")
-        
-        # Fall back to enhanced mock data
-        return self._get_enhanced_mock_data(query, category)
-
     def _parse_news_api_response(self, data: Dict[str, Any], query: str, category: str) -> Dict[str, Any]:
         """Parse NewsAPI response and format like social media data"""
         articles = data.get("articles", [])
@@ -344,20 +379,12 @@ class DeSearchClient:
                     "title": title
                 })
         
-        # Calculate sentiment based on article content
-        pos_words = ["bullish", "pump", "buy", "moon", "green", "up", "gain", "profit", "bull", "rally", "surge", "rise", "positive", "growth"]
-        neg_words = ["bearish", "dump", "sell", "red", "down", "loss", "bear", "crash", "panic", "fear", "drop", "fall", "negative", "decline"]
-        
-        all_text = " ".join([t["text"] for t in tweets + posts + news]).lower()
-        pos_count = sum(1 for word in pos_words if word in all_text)
-        neg_count = sum(1 for word in neg_words if word in all_text)
-        
-        if pos_count + neg_count > 0:
-            sentiment_score = (pos_count - neg_count) / (pos_count + neg_count)
-            # Normalize to -1 to 1 range
-            sentiment_score = max(-1.0, min(1.0, sentiment_score))
-        else:
-            sentiment_score = 0.1  # Slightly positive by default
+        # Calculate sentiment based on article content (slightly positive when nothing matches)
+        items = tweets + posts + news
+        sentiment = score_texts(t["text"] for t in items)
+        for item, score in zip(items, sentiment.items):
+            item["sentiment"] = round(score, 3)
+        sentiment_score = sentiment.score(neutral=0.1)
         
         return {
             "status": "success",
@@ -416,18 +443,12 @@ class DeSearchClient:
                     "title": title
                 })
         
-        # Calculate sentiment score
-        pos_words = ["bullish", "pump", "buy", "moon", "green", "up", "gain", "profit", "bull", "rally", "surge", "optimistic"]
-        neg_words = ["bearish", "dump", "sell", "red", "down", "loss", "bear", "crash", "panic", "fear", "drop"]
-        
-        all_text = " ".join([t["text"] for t in tweets + posts + news]).lower()
-        pos_count = sum(1 for word in pos_words if word in all_text)
-        neg_count = sum(1 for word in neg_words if word in all_text)
-        
-        if pos_count + neg_count > 0:
-            sentiment_score = (pos_count - neg_count) / (pos_count + neg_count)
-        else:
-            sentiment_score = 0.1  # Slightly positive by default
+        # Calculate sentiment score (slightly positive when nothing matches)
+        items = tweets + posts + news
+        sentiment = score_texts(t["text"] for t in items)
+        for item, score in zip(items, sentiment.items):
+            item["sentiment"] = round(score, 3)
+        sentiment_score = sentiment.score(neutral=0.1)
         
         return {
             "status": "success",
@@ -725,29 +746,14 @@ class DeSearchClient:
         miner_links = data.get("miner_link_scores", {})
         
         # Calculate sentiment based on all available content
-        all_content = []
-        if tweets:
-            all_content.extend([t["text"] for t in tweets])
-        if posts:
-            all_content.extend([p["text"] for p in posts])
-        if news:
-            all_content.extend([n["text"] for n in news])
-        
+        all_content = tweets + posts + news
+
         if all_content:
-            # Calculate sentiment based on real content from all sources
-            pos_words = ["bullish", "pump", "buy", "moon", "green", "up", "gain", "profit", "bull", "rally", "surge", "optimistic", "breakout", "rocket", "🚀", "📈"]
-            neg_words = ["bearish", "dump", "sell", "red", "down", "loss", "bear", "crash", "panic", "fear", "drop", "decline", "bear market", "📉"]
-            
-            all_text = " ".join(all_content).lower()
-            pos_count = sum(1 for word in pos_words if word in all_text)
-            neg_count = sum(1 for word in neg_words if word in all_text)
-            
-            if pos_count + neg_count > 0:
-                sentiment_score = (pos_count - neg_count) / (pos_count + neg_count)
-                # Normalize to -1 to 1 range
-                sentiment_score = max(-1.0, min(1.0, sentiment_score))
-            else:
-                sentiment_score = 0.1  # Slightly positive by default
+            # One tokenizing pass over the real content from all sources (slightly positive when nothing matches)
+            sentiment = score_texts(item["text"] for item in all_content)
+            for item, score in zip(all_content, sentiment.items):
+                item["sentiment"] = round(score, 3)
+            sentiment_score = sentiment.score(neutral=0.1)
             
             total_items = len(tweets) + len(posts) + len(news)
             
@@ -1,8 +1,10 @@
 import os
-import httpx
+from typing import Optional
+from core.http import UpstreamClients, upstream_client
 
 class GataClient:
-    def __init__(self) -> None:
+    def __init__(self, clients: Optional[UpstreamClients] = None) -> None:
+        self.clients = clients
         self.base_url = os.getenv("GATA_BASE_URL", "")
         self.api_key = os.getenv("GATA_API_KEY", "")
 
@@ -10,7 +12,7 @@ class GataClient:
         if not self.base_url or not self.api_key:
             return {"prob": 0.5}
         try:
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(self.base_url, self.clients) as client:
                 res = await client.post(
                     f"{self.base_url}/montecarlo",
                     json=payload,
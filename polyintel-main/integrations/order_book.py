@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from core.http import UpstreamClients, upstream_client
+
+CLOB_URL = "https://clob.polymarket.com"
+
+
+def market_token_ids(market: Dict[str, Any]) -> List[str]:
+    """CLOB outcome token ids of a Gamma market (YES first); Gamma sends them as a JSON string"""
+    ids = market.get("clobTokenIds") or market.get("clob_token_ids") or []
+    if isinstance(ids, str):
+        try:
+            ids = json.loads(ids)
+        except (ValueError, json.JSONDecodeError):
+            return []
+    if not isinstance(ids, list):
+        return []
+    tokens = []
+    for t in ids:
+        if isinstance(t, dict):
+            t = t.get("token_id")
+        if t:
+            tokens.append(str(t))
+    return tokens
+
+
+def _levels(levels: Any, descending: bool) -> np.ndarray:
+    """(n, 2) array of [price, size] sorted best-first, invalid and empty levels dropped"""
+    rows = []
+    for level in levels or []:
+        try:
+            if isinstance(level, dict):
+                price, size = float(level["price"]), float(level["size"])
+            else:
+                price, size = float(level[0]), float(level[1])
+        except (KeyError, IndexError, ValueError, TypeError):
+            continue
+        if size > 0:
+            rows.append((price, size))
+    arr = np.array(rows, dtype=float).reshape(-1, 2)
+    order = np.argsort(-arr[:, 0] if descending else arr[:, 0], kind="stable")
+    return arr[order]
+
+
+@dataclass
+class BookSnapshot:
+    token_id: str
+    bids: np.ndarray  # [price, size], best (highest) first
+    asks: np.ndarray  # [price, size], best (lowest) first
+    fetched_at: float = field(default_factory=time.time)
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_raw(cls, token_id: str, raw: Dict[str, Any]) -> "BookSnapshot":
+        return cls(token_id, _levels(raw.get("bids"), True), _levels(raw.get("asks"), False), raw=raw)
+
+    @property
+    def empty(self) -> bool:
+        return not len(self.bids) and not len(self.asks)
+
+
+def _fill(levels: np.ndarray, notional: float) -> Optional[float]:
+    """Average price paid to fill `notional` against best-first levels, None if the book is too thin"""
+    if not len(levels) or notional <= 0:
+        return None
+    prices, sizes = levels[:, 0], levels[:, 1]
+    cum_notional = np.cumsum(prices * sizes)
+    i = int(np.searchsorted(cum_notional, notional))
+    if i >= len(levels):
+        return None
+    before = cum_notional[i - 1] if i else 0.0
+    shares = (sizes[:i].sum() if i else 0.0) + (notional - before) / prices[i]
+    return float(notional / shares)
+
+
+def book_metrics(book: BookSnapshot, order_sizes: Sequence[float] = (100, 1000, 10000),
+                 depth_bands: Sequence[float] = (0.01, 0.05)) -> Dict[str, Any]:
+    """Spread, cumulative depth around the mid and slippage for market orders of `order_sizes` (USDC)"""
+    bids, asks = book.bids, book.asks
+    best_bid = float(bids[0, 0]) if len(bids) else None
+    best_ask = float(asks[0, 0]) if len(asks) else None
+    mid = (best_bid + best_ask) / 2 if best_bid is not None and best_ask is not None else None
+
+    bid_notional = bids[:, 0] * bids[:, 1]
+    ask_notional = asks[:, 0] * asks[:, 1]
+    result: Dict[str, Any] = {
+        "token_id": book.token_id,
+        "best_bid": best_bid,
+        "best_ask": best_ask,
+        "mid": mid,
+        "spread": round(best_ask - best_bid, 4) if mid is not None else None,
+        "spread_pct": round((best_ask - best_bid) / mid * 100, 2) if mid else None,
+        "bid_levels": len(bids),
+        "ask_levels": len(asks),
+        "bid_depth": round(float(bid_notional.sum()), 2),
+        "ask_depth": round(float(ask_notional.sum()), 2),
+        "depth": {},
+        "slippage": {},
+        "fetched_at": book.fetched_at,
+    }
+    if mid is None:
+        return result
+
+    # Cumulative depth within +/- band of the mid; levels are sorted, so each band is a prefix
+    cum_bid = np.cumsum(bid_notional)
+    cum_ask = np.cumsum(ask_notional)
+    for band in depth_bands:
+        n_bid = int(np.searchsorted(-bids[:, 0], -mid * (1 - band), side="right"))
+        n_ask = int(np.searchsorted(asks[:, 0], mid * (1 + band), side="right"))
+        result["depth"][f"{band * 100:g}%"] = {
+            "bid": round(float(cum_bid[n_bid - 1]) if n_bid else 0.0, 2),
+            "ask": round(float(cum_ask[n_ask - 1]) if n_ask else 0.0, 2),
+        }
+
+    for size in order_sizes:
+        buy = _fill(asks, size)
+        sell = _fill(bids, size)
+        result["slippage"][f"{size:g}"] = {
+            "buy_avg_price": round(buy, 4) if buy is not None else None,
+            "buy_slippage_pct": round((buy - mid) / mid * 100, 2) if buy is not None else None,
+            "sell_avg_price": round(sell, 4) if sell is not None else None,
+            "sell_slippage_pct": round((mid - sell) / mid * 100, 2) if sell is not None else None,
+        }
+    return result
+
+
+class OrderBookCache:
+    """
+    Short-TTL cache of CLOB order book snapshots keyed by token id.
+    Concurrent requests for the same token share one fetch; batches use POST /books.
+    """
+
+    def __init__(self, clients: Optional[UpstreamClients] = None, ttl: Optional[float] = None,
+                 max_entries: int = 5000) -> None:
+        self.clients = clients
+        self.ttl = ttl or float(os.getenv("POLYINTEL_BOOK_TTL", "5"))
+        self.max_entries = max_entries
+        self._books: Dict[str, BookSnapshot] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _fresh(self, token_id: str) -> Optional[BookSnapshot]:
+        book = self._books.get(token_id)
+        if book is not None and time.time() - book.fetched_at <= self.ttl:
+            return book
+        return None
+
+    async def get(self, token_id: str) -> Optional[BookSnapshot]:
+        books = await self.get_many([token_id])
+        return books.get(token_id)
+
+    async def get_many(self, token_ids: Iterable[str]) -> Dict[str, BookSnapshot]:
+        """Snapshots for many tokens; only missing or expired ones are fetched, in one batch"""
+        wanted = list(dict.fromkeys(t for t in token_ids if t))
+        result: Dict[str, BookSnapshot] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing: List[str] = []
+        for t in wanted:
+            book = self._fresh(t)
+            if book is not None:
+                result[t] = book
+            elif t in self._inflight:
+                waiting[t] = self._inflight[t]
+            else:
+                missing.append(t)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {t: loop.create_future() for t in missing}
+            self._inflight.update(futures)
+            try:
+                fetched = await self._fetch(missing)
+                for t, book in fetched.items():
+                    self._books[t] = book
+                self._evict()
+            finally:
+                for t, fut in futures.items():
+                    self._inflight.pop(t, None)
+                    if not fut.done():
+                        fut.set_result(self._books.get(t))
+            for t in missing:
+                # Fall back to the last good (expired) snapshot if the fetch failed
+                book = self._books.get(t)
+                if book is not None:
+                    result[t] = book
+
+        for t, fut in waiting.items():
+            book = await asyncio.shield(fut)
+            if book is not None:
+                result[t] = book
+        return result
+
+    async def _fetch(self, token_ids: List[str]) -> Dict[str, BookSnapshot]:
+        books: Dict[str, BookSnapshot] = {}
+        try:
+            async with upstream_client(CLOB_URL, self.clients, timeout=10.0) as client:
+                if len(token_ids) > 1:
+                    response = await client.post(f"{CLOB_URL}/books",
+                                                 json=[{"token_id": t} for t in token_ids])
+                    if response.status_code == 200 and isinstance(response.json(), list):
+                        for raw in response.json():
+                            t = str(raw.get("asset_id") or raw.get("token_id") or "")
+                            if t in token_ids:
+                                books[t] = BookSnapshot.from_raw(t, raw)
+
+                # Single token, or whatever the batch call did not return
+                rest = [t for t in token_ids if t not in books]
+                responses = await asyncio.gather(
+                    *(client.get(f"{CLOB_URL}/book", params={"token_id": t}) for t in rest),
+                    return_exceptions=True)
+                for t, response in zip(rest, responses):
+                    if not isinstance(response, Exception) and response.status_code == 200:
+                        books[t] = BookSnapshot.from_raw(t, response.json())
+        except Exception as e:
+            print(f"Order book fetch error: {e}")
+        return books
+
+    def _evict(self) -> None:
+        if len(self._books) <= self.max_entries:
+            return
+        for t in sorted(self._books, key=lambda t: self._books[t].fetched_at)[:len(self._books) - self.max_entries]:
+            del self._books[t]
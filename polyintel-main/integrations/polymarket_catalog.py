@@ -0,0 +1,255 @@
+import asyncio
+import bisect
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from core.http import UpstreamClients, upstream_client
+
+GAMMA_URL = "https://gamma-api.polymarket.com"
+
+
+def calculated_volume(m: Dict[str, Any]) -> float:
+    """Total CLOB + AMM volume, falling back to 24h volume (0.0 when neither is set)"""
+    try:
+        total_vol = float(m.get("volumeClob", 0) or 0) + float(m.get("volumeAmm", 0) or 0)
+        vol_24h = float(m.get("volume24hrClob", 0) or 0) + float(m.get("volume24hrAmm", 0) or 0)
+    except (ValueError, TypeError):
+        return 0.0
+    return total_vol if total_vol > 0 else vol_24h
+
+
+def _tokens(slug: str) -> List[str]:
+    return [t for t in re.split(r"[^a-z0-9]+", slug.lower()) if t]
+
+
+def market_slug(m: Dict[str, Any]) -> str:
+    return (m.get("slug") or m.get("market_slug") or "").lower()
+
+
+class MarketIndex:
+    """
+    Lookup structure over a ranked market list (rank 0 = highest volume).
+    Exact hash maps for slug, id and condition id; a token index with sorted token
+    keys for prefix and token-aligned substring matches on slugs.
+    """
+
+    def __init__(self, markets: List[Dict[str, Any]]) -> None:
+        self.markets = markets
+        self.by_slug: Dict[str, int] = {}
+        self.by_id: Dict[str, int] = {}
+        self.by_condition: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+        for rank, m in enumerate(markets):
+            slug = market_slug(m)
+            if slug:
+                self.by_slug.setdefault(slug, rank)
+                for t in set(_tokens(slug)):
+                    postings.setdefault(t, []).append(rank)
+            if m.get("id") is not None:
+                self.by_id.setdefault(str(m["id"]), rank)
+            cid = m.get("conditionId") or m.get("condition_id")
+            if cid:
+                self.by_condition.setdefault(str(cid).lower(), rank)
+        self.postings = postings
+        self.token_keys = sorted(postings)
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Exact match on slug, id or condition id"""
+        k = (key or "").strip()
+        for table, probe in ((self.by_slug, k.lower()), (self.by_id, k), (self.by_condition, k.lower())):
+            rank = table.get(probe)
+            if rank is not None:
+                return self.markets[rank]
+        return None
+
+    def _prefix_postings(self, prefix: str) -> Iterable[int]:
+        i = bisect.bisect_left(self.token_keys, prefix)
+        while i < len(self.token_keys) and self.token_keys[i].startswith(prefix):
+            yield from self.postings[self.token_keys[i]]
+            i += 1
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Markets whose slug contains the query (token-aligned, last token may be partial),
+        or whose slug is contained in the query; best-ranked first.
+        """
+        q = (query or "").strip().lower()
+        q_tokens = _tokens(q)
+        if not q_tokens:
+            return []
+
+        found: Set[int] = set()
+
+        # Slug contains query: the rarest complete token narrows the candidates
+        full = q_tokens[:-1]
+        if full:
+            candidates: Iterable[int] = min((self.postings.get(t, []) for t in full), key=len)
+        else:
+            candidates = self._prefix_postings(q_tokens[-1])
+        for rank in candidates:
+            if q in market_slug(self.markets[rank]):
+                found.add(rank)
+
+        # Query contains slug: probe every token-aligned span of the query
+        for i in range(len(q_tokens)):
+            for j in range(i + 1, len(q_tokens) + 1):
+                rank = self.by_slug.get("-".join(q_tokens[i:j]))
+                if rank is not None:
+                    found.add(rank)
+
+        return [self.markets[rank] for rank in sorted(found)[:limit]]
+
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """Exact slug/id/condition id match, else the best-ranked fuzzy slug match"""
+        exact = self.get(query)
+        if exact is not None:
+            return exact
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
+
+
+class MarketCatalog:
+    """
+    In-process snapshot of active Gamma markets, filtered to markets with volume and
+    sorted by volume. Refreshed in the background; concurrent refreshes share one fetch.
+    """
+
+    def __init__(self, clients: Optional[UpstreamClients] = None,
+                 formatter: Optional[Callable[[Dict], Optional[Dict]]] = None,
+                 refresh_interval: Optional[float] = None, max_markets: Optional[int] = None,
+                 page_size: int = 500) -> None:
+        self.clients = clients
+        self.formatter = formatter
+        self.refresh_interval = refresh_interval or float(os.getenv("POLYINTEL_CATALOG_REFRESH", "60"))
+        self.max_markets = max_markets or int(os.getenv("POLYINTEL_CATALOG_SIZE", "2000"))
+        self.page_size = page_size
+        self.version = 0
+        self.updated_at = 0.0
+        self._markets: List[Dict] = []
+        self._formatted: List[Dict] = []
+        self.index = MarketIndex([])
+        self._inflight: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def start(self, clients: Optional[UpstreamClients] = None) -> None:
+        """Begin periodic background refresh (the first fetch runs in the background too)"""
+        if clients is not None:
+            self.clients = clients
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        for task in (self._loop_task, self._inflight):
+            if task is not None:
+                task.cancel()
+        self._loop_task = None
+        self._inflight = None
+
+    def is_stale(self) -> bool:
+        return time.time() - self.updated_at > self.refresh_interval
+
+    async def markets(self, limit: int = 50) -> List[Dict]:
+        """Top `limit` raw Gamma markets by volume"""
+        await self._ensure_fresh()
+        return self._markets[:limit]
+
+    async def formatted(self, limit: int = 50) -> List[Dict]:
+        """Top `limit` markets already passed through the formatter"""
+        await self._ensure_fresh()
+        return self._formatted[:limit]
+
+    async def find(self, query: str) -> Optional[Dict]:
+        """Resolve a slug, id or condition id (or a fuzzy slug) across all active markets"""
+        await self._ensure_fresh()
+        return self.index.lookup(query)
+
+    async def refresh(self) -> List[Dict]:
+        """Fetch a new snapshot; callers arriving while a fetch is running await that same fetch"""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._refresh())
+        return await asyncio.shield(self._inflight)
+
+    async def _ensure_fresh(self) -> None:
+        if not self._markets:
+            # Nothing to serve yet: wait for the (shared) fetch
+            await self.refresh()
+        elif self.is_stale() and (self._inflight is None or self._inflight.done()):
+            # Serve the current snapshot and refresh behind it
+            self._inflight = asyncio.create_task(self._refresh())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Market catalog refresh error: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _refresh(self) -> List[Dict]:
+        raw = await self._fetch_all()
+        if not raw:
+            # Keep serving the last good snapshot
+            return self._markets
+
+        markets_with_volume = []
+        without_volume = []
+        for m in raw:
+            vol = calculated_volume(m)
+            if vol > 0:
+                m["_calculated_volume"] = vol
+                markets_with_volume.append(m)
+            else:
+                without_volume.append(m)
+        markets_with_volume.sort(key=lambda m: m["_calculated_volume"], reverse=True)
+
+        formatted = []
+        if self.formatter is not None:
+            for m in markets_with_volume:
+                f = self.formatter(m)
+                if f:
+                    formatted.append(f)
+
+        self._markets = markets_with_volume
+        self._formatted = formatted
+        # Lookups cover the whole active universe, volume-ranked markets first
+        self.index = MarketIndex(markets_with_volume + without_volume)
+        self.updated_at = time.time()
+        self.version += 1
+        print(f"✓ Market catalog refreshed: {len(raw)} active markets, {len(markets_with_volume)} with volume")
+        return self._markets
+
+    async def _fetch_all(self) -> List[Dict]:
+        markets: List[Dict] = []
+        try:
+            async with upstream_client(GAMMA_URL, self.clients, timeout=15.0) as client:
+                offset = 0
+                while offset < self.max_markets:
+                    response = await client.get(
+                        f"{GAMMA_URL}/markets",
+                        params={
+                            "active": "true",
+                            "closed": "false",
+                            "limit": min(self.page_size, self.max_markets - offset),
+                            "offset": offset,
+                        },
+                        headers={"Accept": "application/json"}
+                    )
+                    if response.status_code != 200:
+                        print(f"Gamma API returned status {response.status_code}")
+                        break
+                    page = response.json()
+                    if not isinstance(page, list) or not page:
+                        break
+                    markets.extend(page)
+                    if len(page) < self.page_size:
+                        break
+                    offset += len(page)
+        except Exception as e:
+            print(f"Market fetch error: {e}")
+        return markets
@@ -1,11 +1,49 @@
+import asyncio
 import os
-import httpx
-from typing import Dict, Any, List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from core.http import UpstreamClients, upstream_client
+
+DATA_API_URL = "https://data-api.polymarket.com"
+
+Page = List[Dict[str, Any]]
+# (fn, *args) -> awaited result; lets callers route page requests through a DataContext
+Fetch = Callable[..., Awaitable[Any]]
+
+
+async def _direct(fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    return await fn(*args)
+
+
+async def prefetch_pages(fetch_page: Callable[[int], Awaitable[Page]], page_size: int,
+                         max_pages: int) -> AsyncIterator[Page]:
+    """
+    Pages 0, 1, ... from `fetch_page`, requesting page n+1 while the consumer works on page n.
+    Stops at a short page (with `page_size` 0, only after `max_pages`); closing the generator
+    (e.g. leaving an `aclosing` block early) cancels the request in flight.
+    """
+    nxt: Optional[asyncio.Task] = asyncio.create_task(fetch_page(0)) if max_pages > 0 else None
+    try:
+        n = 0
+        while nxt is not None:
+            page = await nxt
+            nxt = None
+            n += 1
+            if len(page) >= page_size and n < max_pages:
+                nxt = asyncio.create_task(fetch_page(n))
+            if page:
+                yield page
+    finally:
+        if nxt is not None:
+            nxt.cancel()
+
 
 class PolymarketDataAPI:
+    def __init__(self, clients: Optional[UpstreamClients] = None) -> None:
+        self.clients = clients
+
     async def event_info(self, slug: str) -> Dict[str, Any]:
         base = os.getenv("POLYMARKET_GAMMA_URL", "https://gamma-api.polymarket.com")
-        async with httpx.AsyncClient() as client:
+        async with upstream_client(base, self.clients) as client:
             r = await client.get(f"{base}/events?slug={slug}", timeout=10.0)
             if r.status_code != 200:
                 return {}
@@ -19,22 +57,65 @@ class PolymarketDataAPI:
                     condition_ids.append(cid)
             return {"event_id": event_id, "condition_ids": condition_ids}
 
-    async def trades_by_event(self, event_id: int, limit: int = 500) -> List[Dict[str, Any]]:
-        url = "https://data-api.polymarket.com/trades"
+    async def trades_by_event(self, event_id: int, limit: int = 500, offset: int = 0) -> List[Dict[str, Any]]:
         params = {"eventId": str(event_id), "limit": str(limit), "takerOnly": "true"}
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, params=params, timeout=10.0)
-            if r.status_code != 200:
-                return []
-            data = r.json()
-            return data if isinstance(data, list) else []
+        if offset:
+            params["offset"] = str(offset)
+        return await self._get_list(f"{DATA_API_URL}/trades", params)
+
+    async def iter_trades(self, event_id: int, page_size: int = 500, max_trades: Optional[int] = None,
+                          fetch: Fetch = _direct) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Event trades newest first, paged by offset with the next page prefetched. At most
+        `max_trades` are read (default POLYMARKET_TRADES_DEPTH, one page; deeper scans are opt-in);
+        only two pages are held at a time. The first page is requested via `fetch(fn, *args)`;
+        prefetched pages are speculative, so they bypass it and closing early really cancels them
+        (a context-routed fetch is shielded and would run to completion).
+        """
+        max_trades = max_trades or int(os.getenv("POLYMARKET_TRADES_DEPTH", "500"))
+        max_pages = -(-max_trades // page_size)
+        def page(n: int) -> Awaitable[Page]:
+            if n == 0:
+                return fetch(self.trades_by_event, event_id, page_size, 0)
+            return self.trades_by_event(event_id, page_size, n * page_size)
+
+        pages = prefetch_pages(page, page_size, max_pages)
+        seen = 0
+        try:
+            async for page in pages:
+                for trade in page[:max_trades - seen]:
+                    yield trade
+                seen += len(page)
+        finally:
+            await pages.aclose()
 
     async def holders_by_conditions(self, condition_ids: List[str]) -> List[Dict[str, Any]]:
         if not condition_ids:
             return []
-        url = "https://data-api.polymarket.com/holders"
-        params = {"market": ",".join(condition_ids)}
-        async with httpx.AsyncClient() as client:
+        return await self._get_list(f"{DATA_API_URL}/holders", {"market": ",".join(condition_ids)})
+
+    async def iter_holders(self, condition_ids: List[str], chunk_size: int = 10,
+                           fetch: Fetch = _direct) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Per-token holder lists for many markets, `chunk_size` condition ids per request, next chunk
+        prefetched. As with `iter_trades`, only the first chunk goes through `fetch`.
+        """
+        chunks = [condition_ids[i:i + chunk_size] for i in range(0, len(condition_ids), chunk_size)]
+
+        def chunk(n: int) -> Awaitable[Page]:
+            return fetch(self.holders_by_conditions, chunks[0]) if n == 0 else self.holders_by_conditions(chunks[n])
+
+        # A chunk can legitimately return nothing, so page size 0 pages until the chunks run out
+        pages = prefetch_pages(chunk, 0, len(chunks))
+        try:
+            async for page in pages:
+                for group in page:
+                    yield group
+        finally:
+            await pages.aclose()
+
+    async def _get_list(self, url: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        async with upstream_client(url, self.clients) as client:
             r = await client.get(url, params=params, timeout=10.0)
             if r.status_code != 200:
                 return []
@@ -1,11 +1,14 @@
-import httpx
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from core.http import UpstreamClients, upstream_client
 
 class PolywhalerClient:
+    def __init__(self, clients: Optional[UpstreamClients] = None) -> None:
+        self.clients = clients
+
     async def fetch_summary(self) -> Dict[str, Any]:
         try:
-            async with httpx.AsyncClient() as client:
+            async with upstream_client("https://www.polywhaler.com/", self.clients) as client:
                 res = await client.get("https://www.polywhaler.com/", timeout=10.0)
                 html = res.text if res.status_code == 200 else ""
             def extract(label: str) -> float:
@@ -1,10 +1,30 @@
 import os
+import asyncio
+import threading
 import requests
 from dotenv import load_dotenv
 from elevenlabs import ElevenLabs
+from integrations.apro_oracle import AproOracleClient
 
 load_dotenv()
 
+# The oracle client's price batcher is process-wide and bound to the loop it first runs on, so
+# the sync tools drive it from one long-lived loop thread rather than a throwaway asyncio.run loop
+ORACLE_TIMEOUT = float(os.getenv("POLYCASTER_ORACLE_TIMEOUT", "30"))
+_oracle_loop = None
+_oracle_lock = threading.Lock()
+
+
+def _run_oracle(coro):
+    """Schedule an oracle coroutine on the shared background loop; returns a concurrent future"""
+    global _oracle_loop
+    with _oracle_lock:
+        if _oracle_loop is None:
+            _oracle_loop = asyncio.new_event_loop()
+            threading.Thread(target=_oracle_loop.run_forever, name="apro-oracle", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _oracle_loop)
+
+
 class AlphaTools:
     def __init__(self):
         self.eleven = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
@@ -69,52 +89,42 @@ class AlphaTools:
     # --- 3. LIVE GROUND TRUTH (APRO Oracle v1 - Real Verified Data) ---
     def get_real_world_price(self, symbol):
         """Fetches REAL-TIME verified asset price from APRO Oracle v1 API."""
-        print(f"⚖️ [Live] Verifying Ground Truth via APRO Oracle for: {symbol}...")
-        
-        # Map symbols to APRO Oracle format
-        apro_map = {
-            "USD0": "usd0", 
-            "USDC": "usd-coin", 
-            "BTC": "bitcoin", 
-            "ETH": "ethereum", 
-            "SOL": "solana",
-            "BNB": "binancecoin",
-            "ADA": "cardano",
-            "XRP": "ripple",
-            "DOGE": "dogecoin",
-            "MATIC": "polygon"
-        }
-        
+        return self.get_real_world_prices([symbol])[symbol]
+
+    def get_real_world_prices(self, symbols):
+        """
+        Verified prices for several assets in one batched APRO Oracle round-trip (CoinGecko for misses).
+        Blocking: call it from sync code only; async code should await AproOracleClient().fetch_prices().
+        """
         try:
-            # Try APRO Oracle v1 API first (no API key required)
-            apro_symbol = apro_map.get(symbol.upper(), symbol.lower())
-            url = f"https://api-ai-oracle.apro.com/v1/ticker/currency/price"
-            params = {
-                "name": apro_symbol,
-                "quotation": "usd",
-                "type": "median"  # Get median price from multiple sources
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("status", {}).get("code") == 200 and "data" in data:
-                    price_data = data["data"]
-                    price = float(price_data["price"])
-                    timestamp = price_data.get("timestamp", "")
-                    return {
-                        "price": price, 
-                        "source": f"APRO Oracle v1 (Verified) - {timestamp}",
-                        "providers": price_data.get("prices", [])
-                    }
-            
-            # Fallback to CoinGecko if APRO doesn't have the asset
-            print(f"⚖️ APRO Oracle unavailable, falling back to CoinGecko for {symbol}")
-            return self._get_coingecko_price(symbol)
-            
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("get_real_world_prices() blocks; await AproOracleClient().fetch_prices() instead")
+        print(f"⚖️ [Live] Verifying Ground Truth via APRO Oracle for: {', '.join(symbols)}...")
+        try:
+            # Shares the oracle client's quote cache and request batching. On timeout the batch
+            # keeps running on the oracle loop and still fills the cache for the next call.
+            quotes = _run_oracle(AproOracleClient().fetch_prices(list(symbols))).result(ORACLE_TIMEOUT)
         except Exception as e:
             print(f"⚖️ APRO Oracle error: {e}, falling back to CoinGecko")
-            return self._get_coingecko_price(symbol)
+            quotes = {}
+
+        prices = {}
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote and quote.get("status") != "FALLBACK" and quote.get("price") is not None:
+                prices[symbol] = {
+                    "price": float(quote["price"]),
+                    "source": f"APRO Oracle v1 (Verified) - {quote.get('timestamp', '')}",
+                    "providers": quote.get("providers", []),
+                }
+            else:
+                # Fallback to CoinGecko if APRO doesn't have the asset
+                print(f"⚖️ APRO Oracle unavailable, falling back to CoinGecko for {symbol}")
+                prices[symbol] = self._get_coingecko_price(symbol)
+        return prices
     
     def _get_coingecko_price(self, symbol):
         """Fallback method using CoinGecko for price data."""
@@ -1,17 +1,71 @@
 import asyncio
-from typing import List
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from core.context import DataContext
+from core.http import UpstreamClients
 from core.models import AlphaSignal
 from agents.fundamental import FundamentalAgent
 from agents.sentiment import SentimentAgent
 from agents.whale import WhaleAgent
+from judge.judge import Judge
 
-async def run_council(market_id: str, identity: dict) -> List[AlphaSignal]:
-    f = FundamentalAgent()
-    s = SentimentAgent()
-    w = WhaleAgent()
-    results = await asyncio.gather(
-        f.generate(market_id, identity),
-        s.generate(market_id, identity),
-        w.generate(market_id, identity),
-    )
-    return list(results)
\ No newline at end of file
+async def run_council(market_id: str, identity: dict, clients: Optional[UpstreamClients] = None,
+                      context: Optional[DataContext] = None) -> List[AlphaSignal]:
+    # Agents share one data context, so overlapping upstream fetches are made once per run
+    owned = context is None
+    context = context or DataContext()
+    f = FundamentalAgent(clients, context)
+    s = SentimentAgent(clients, context)
+    w = WhaleAgent(clients, context)
+    try:
+        results = await asyncio.gather(
+            f.generate(market_id, identity),
+            s.generate(market_id, identity),
+            w.generate(market_id, identity),
+        )
+    finally:
+        if owned:
+            context.cancel_pending()
+    return list(results)
+
+async def scan_council(market_ids: Iterable[str], identity: dict, clients: Optional[UpstreamClients] = None,
+                       concurrency: Optional[int] = None, deadline: Optional[float] = None,
+                       context: Optional[DataContext] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Council + Judge over many markets, at most `concurrency` at a time, each bounded by `deadline` seconds.
+    Yields one result per market in completion order; closing the iterator cancels the rest.
+    One data context spans the scan, so market-independent fetches (e.g. whale bias) happen once.
+    """
+    owned = context is None
+    context = context or DataContext()
+    concurrency = concurrency or int(os.getenv("POLYINTEL_SCAN_CONCURRENCY", "8"))
+    deadline = deadline or float(os.getenv("POLYINTEL_SCAN_DEADLINE", "20"))
+    sem = asyncio.Semaphore(concurrency)
+    judge = Judge()
+
+    async def one(market_id: str) -> Dict[str, Any]:
+        async with sem:
+            start = time.monotonic()
+            result: Dict[str, Any] = {"market_id": market_id}
+            try:
+                signals = await asyncio.wait_for(run_council(market_id, identity, clients, context), deadline)
+                decision = judge.decide(signals)
+                result.update(status="ok", decision=decision.model_dump(),
+                              signals=[s.model_dump() for s in signals])
+            except asyncio.TimeoutError:
+                result.update(status="timeout", error=f"exceeded {deadline:.0f}s")
+            except Exception as e:
+                result.update(status="error", error=f"{type(e).__name__}: {e}")
+            result["elapsed"] = round(time.monotonic() - start, 3)
+            return result
+
+    tasks = [asyncio.create_task(one(m)) for m in dict.fromkeys(market_ids)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for t in tasks:
+            t.cancel()
+        if owned:
+            context.cancel_pending()
@@ -1,6 +1,12 @@
 import os
-from typing import Optional, Dict
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, Iterator, Tuple
 import httpx
+from spoon.audio_cache import cache_key, default_audio_cache
+
+# Per-request provider timeout; keep it below POLYINTEL_TTS_TIMEOUT so hung calls free their thread
+TTS_HTTP_TIMEOUT = float(os.getenv("POLYINTEL_TTS_HTTP_TIMEOUT", "30"))
 
 def _get_elevenlabs_key() -> str:
     """Get ElevenLabs API key from environment"""
@@ -70,7 +76,7 @@ def _generate_with_hathora(text: str, filename: str, model: Optional[str] = None
         print(f"🎙️ Generating audio with Hathora TTS...")
         
         # Make the API request - try different auth methods
-        with httpx.Client(timeout=30.0) as client:
+        with httpx.Client(timeout=TTS_HTTP_TIMEOUT) as client:
             # Try with Bearer token first
             response = client.post(endpoint, json=payload, headers=headers)
             
@@ -99,7 +105,7 @@ def _generate_with_hathora(text: str, filename: str, model: Optional[str] = None
                         audio_url = data.get("audio_url") or data.get("url") or data.get("audioUrl")
                         if audio_url:
                             # Download the audio file
-                            audio_response = client.get(audio_url, timeout=30.0)
+                            audio_response = client.get(audio_url, timeout=TTS_HTTP_TIMEOUT)
                             if audio_response.status_code == 200:
                                 with open(filename, "wb") as f:
                                     f.write(audio_response.content)
@@ -126,7 +132,7 @@ def _generate_with_hathora(text: str, filename: str, model: Optional[str] = None
                 
                 for alt_endpoint in alternative_endpoints:
                     try:
-                        alt_response = client.post(alt_endpoint, json=payload, headers=headers, timeout=30.0)
+                        alt_response = client.post(alt_endpoint, json=payload, headers=headers, timeout=TTS_HTTP_TIMEOUT)
                         if alt_response.status_code == 200:
                             with open(filename, "wb") as f:
                                 f.write(alt_response.content)
@@ -143,41 +149,47 @@ def _generate_with_hathora(text: str, filename: str, model: Optional[str] = None
         traceback.print_exc()
         return None
 
+def _elevenlabs_convert(text: str, settings: Optional[Dict] = None, output_format: Optional[str] = None, voice_id: Optional[str] = None, model_id: Optional[str] = None) -> Optional[Iterator[bytes]]:
+    """Start an ElevenLabs synthesis and return its chunk iterator (None without an API key)"""
+    from elevenlabs.client import ElevenLabs
+    api_key = _get_elevenlabs_key()
+    if not api_key:
+        return None
+
+    client = ElevenLabs(api_key=api_key, timeout=TTS_HTTP_TIMEOUT)
+    voice_id = voice_id or os.getenv("ELEVENLABS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
+    model_id = model_id or os.getenv("ELEVENLABS_MODEL_ID", "eleven_turbo_v2_5")
+    stability = float(os.getenv("ELEVENLABS_STABILITY", "0.5"))
+    similarity_boost = float(os.getenv("ELEVENLABS_SIMILARITY_BOOST", "0.75"))
+    style = float(os.getenv("ELEVENLABS_STYLE", "0.0"))
+    use_speaker_boost = os.getenv("ELEVENLABS_SPEAKER_BOOST", "true").lower() == "true"
+
+    voice_settings = settings or {
+        "stability": stability,
+        "similarity_boost": similarity_boost,
+        "style": style,
+        "use_speaker_boost": use_speaker_boost
+    }
+    kwargs = {
+        "text": text,
+        "voice_id": voice_id,
+        "model_id": model_id
+    }
+    fmt = output_format or os.getenv("ELEVENLABS_OUTPUT_FORMAT", "mp3_44100_128")
+    if fmt:
+        kwargs["output_format"] = fmt
+    if voice_settings:
+        kwargs["voice_settings"] = voice_settings
+
+    return client.text_to_speech.convert(**kwargs)
+
 def _generate_with_elevenlabs(text: str, filename: str, settings: Optional[Dict] = None, output_format: Optional[str] = None, voice_id: Optional[str] = None, model_id: Optional[str] = None) -> Optional[str]:
     """Generate audio using ElevenLabs"""
     try:
-        from elevenlabs.client import ElevenLabs
-        api_key = _get_elevenlabs_key()
-        if not api_key:
+        audio_stream = _elevenlabs_convert(text, settings, output_format, voice_id, model_id)
+        if audio_stream is None:
             return None
         
-        client = ElevenLabs(api_key=api_key)
-        voice_id = voice_id or os.getenv("ELEVENLABS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
-        model_id = model_id or os.getenv("ELEVENLABS_MODEL_ID", "eleven_turbo_v2_5")
-        stability = float(os.getenv("ELEVENLABS_STABILITY", "0.5"))
-        similarity_boost = float(os.getenv("ELEVENLABS_SIMILARITY_BOOST", "0.75"))
-        style = float(os.getenv("ELEVENLABS_STYLE", "0.0"))
-        use_speaker_boost = os.getenv("ELEVENLABS_SPEAKER_BOOST", "true").lower() == "true"
-        
-        voice_settings = settings or {
-            "stability": stability,
-            "similarity_boost": similarity_boost,
-            "style": style,
-            "use_speaker_boost": use_speaker_boost
-        }
-        kwargs = {
-            "text": text,
-            "voice_id": voice_id,
-            "model_id": model_id
-        }
-        fmt = output_format or os.getenv("ELEVENLABS_OUTPUT_FORMAT", "mp3_44100_128")
-        if fmt:
-            kwargs["output_format"] = fmt
-        if voice_settings:
-            kwargs["voice_settings"] = voice_settings
-        
-        audio_stream = client.text_to_speech.convert(**kwargs)
-        
         with open(filename, "wb") as f:
             for chunk in audio_stream:
                 f.write(chunk)
@@ -196,7 +208,7 @@ def _generate_with_gtts(text: str, filename: str) -> Optional[str]:
         import io
         
         # Use gTTS to generate audio
-        tts = gTTS(text=text, lang='en', slow=False)
+        tts = gTTS(text=text, lang='en', slow=False, timeout=TTS_HTTP_TIMEOUT)
         
         # Save to file
         tts.save(filename)
@@ -208,30 +220,147 @@ def _generate_with_gtts(text: str, filename: str) -> Optional[str]:
         print(f"gTTS error: {e}")
         return None
 
+def briefing_cache_key(text: str, settings: Optional[Dict] = None, output_format: Optional[str] = None, voice_id: Optional[str] = None, model_id: Optional[str] = None) -> str:
+    """Cache key for generate_briefing: identical text and voice settings share one file"""
+    return cache_key(text, settings=settings, output_format=output_format, voice_id=voice_id, model_id=model_id)
+
+def _primary_provider() -> str:
+    """Provider a cache key stands for: the first one configured; audio from any later fallback is never cached"""
+    if _get_hathora_key():
+        return "Hathora"
+    if _get_elevenlabs_key():
+        return "ElevenLabs"
+    return "gTTS"
+
+def _fallback_path(cache, key: str) -> Path:
+    # Servable name (briefing_*.mp3) that the cache never loads as an entry
+    return cache.root / f"{cache.prefix}{key}_fallback.mp3"
+
 def generate_briefing(text: str, filename: Optional[str] = None, settings: Optional[Dict] = None, output_format: Optional[str] = None, voice_id: Optional[str] = None, model_id: Optional[str] = None) -> Optional[str]:
-    """Generate audio briefing with fallback options"""
-    path = filename or "polyflow_briefing.mp3"
-    
+    """Generate audio briefing with fallback options (served from the audio cache when possible)"""
+    cache = default_audio_cache()
+    key = briefing_cache_key(text, settings, output_format, voice_id, model_id)
+    with cache.key_lock(key):
+        cached = cache.materialize(key, filename)
+        if cached:
+            print(f"♻️ Audio cache hit: {cached}")
+            return cached
+        path = filename or str(cache.path(key))
+        primary = _primary_provider()
+        result, provider = _synthesize(text, path, settings, output_format, voice_id, model_id)
+        if not result:
+            return None
+        if provider == primary:
+            cache.put(key, result)
+        elif Path(result).resolve() == cache.path(key).resolve():
+            # Fallback audio must not sit under the key of the voice that failed
+            fallback = _fallback_path(cache, key)
+            os.replace(result, fallback)
+            result = str(fallback)
+        return result
+
+def _synthesize(text: str, path: str, settings: Optional[Dict], output_format: Optional[str], voice_id: Optional[str], model_id: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(file, provider that produced it)"""
     # Try Hathora first (if API key is available) - primary TTS provider
     if _get_hathora_key():
         print("🎙️ Attempting Hathora TTS...")
         result = _generate_with_hathora(text, path, model=model_id, voice=voice_id)
         if result:
-            return result
+            return result, "Hathora"
         print("⚠ Hathora failed, trying fallback...")
     
     # Try ElevenLabs (if API key is available)
     if _get_elevenlabs_key():
         result = _generate_with_elevenlabs(text, path, settings, output_format, voice_id, model_id)
         if result:
-            return result
+            return result, "ElevenLabs"
         print("⚠ ElevenLabs failed, trying fallback...")
     
     # Fallback to gTTS (free, no API key needed)
     print("🆓 Using free TTS fallback (gTTS)...")
     result = _generate_with_gtts(text, path)
     if result:
-        return result
+        return result, "gTTS"
     
     print("❌ All audio generation methods failed")
-    return None
\ No newline at end of file
+    return None, None
+
+def _stream_hathora(text: str, model: Optional[str] = None, voice: Optional[str] = None) -> Iterator[bytes]:
+    """Relay Hathora audio bytes as they arrive (yields nothing unless the response is audio)"""
+    api_key = _get_hathora_key()
+    if not api_key:
+        return
+    base_url = os.getenv("HATHORA_API_URL", "https://api.hathora.dev")
+    payload = {"text": text}
+    hathora_model = model or os.getenv("HATHORA_MODEL_ID") or os.getenv("HATHORA_TTS_MODEL")
+    hathora_voice = voice or os.getenv("HATHORA_VOICE_ID")
+    if hathora_model:
+        payload["model"] = hathora_model
+    if hathora_voice:
+        payload["voice"] = hathora_voice
+    headers = {"Content-Type": "application/json", "Authorization": api_key if api_key.lower().startswith("bearer ") else f"Bearer {api_key}"}
+    with httpx.Client(timeout=TTS_HTTP_TIMEOUT) as client:
+        with client.stream("POST", f"{base_url}/v1/tts", json=payload, headers=headers) as response:
+            if response.status_code != 200 or "audio" not in response.headers.get("content-type", ""):
+                return
+            yield from response.iter_bytes()
+
+def _stream_gtts(text: str) -> Iterator[bytes]:
+    from gtts import gTTS
+    yield from gTTS(text=text, lang='en', slow=False, timeout=TTS_HTTP_TIMEOUT).stream()
+
+def stream_briefing(text: str, settings: Optional[Dict] = None, output_format: Optional[str] = None, voice_id: Optional[str] = None, model_id: Optional[str] = None, chunk_size: int = 32 * 1024) -> Iterator[bytes]:
+    """
+    Yield MP3 bytes as the provider produces them, so playback can start before synthesis ends.
+    A cache hit streams the stored file; a completed stream from the primary provider is stored for next time.
+    """
+    cache = default_audio_cache()
+    key = briefing_cache_key(text, settings, output_format, voice_id, model_id)
+    cached = cache.get(key)
+    if cached:
+        with open(cached, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    providers = []
+    if _get_hathora_key():
+        providers.append(("Hathora", lambda: _stream_hathora(text, model=model_id, voice=voice_id)))
+    if _get_elevenlabs_key():
+        providers.append(("ElevenLabs", lambda: _elevenlabs_convert(text, settings, output_format, voice_id, model_id) or iter(())))
+    providers.append(("gTTS", lambda: _stream_gtts(text)))
+
+    part = cache.root / f"{key}.{uuid.uuid4().hex}.part"
+    for name, start in providers:
+        written = 0
+        try:
+            with open(part, "wb") as f:
+                for chunk in start():
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    written += len(chunk)
+                    yield chunk
+        except GeneratorExit:
+            # Client went away: drop the partial file
+            part.unlink(missing_ok=True)
+            raise
+        except Exception as e:
+            print(f"⚠ {name} streaming error: {e}")
+            if written:
+                # Bytes were already sent, a different voice can't be spliced in
+                part.unlink(missing_ok=True)
+                return
+        if written:
+            if name == providers[0][0]:
+                os.replace(part, cache.path(key))
+                cache.put(key, str(cache.path(key)))
+            else:
+                # A fallback voice is served once but never stored under this key
+                part.unlink(missing_ok=True)
+            return
+        print(f"⚠ {name} produced no audio, trying fallback...")
+    part.unlink(missing_ok=True)
+    print("❌ All audio streaming methods failed")
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+
+def cache_key(text: str, **settings: Any) -> str:
+    """Content address for a synthesis: hash of the text plus every voice/model setting"""
+    payload = json.dumps({"text": text, "settings": settings}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class AudioCache:
+    """
+    Content-addressed MP3 store on disk (`<prefix><key>.mp3`) with LRU-by-size eviction.
+    Recency is the file mtime, refreshed on every hit, so the order survives restarts.
+    """
+
+    def __init__(self, root: str, prefix: str = "briefing_", max_bytes: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes or int(float(os.getenv("POLYINTEL_AUDIO_CACHE_MB", "512")) * 1024 * 1024)
+        self._pattern = re.compile(rf"^{re.escape(prefix)}([0-9a-f]{{32}})\.mp3$")
+        self._lock = threading.Lock()
+        self._key_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        found = []
+        for p in self.root.iterdir():
+            m = self._pattern.match(p.name)
+            if m and p.is_file():
+                st = p.stat()
+                found.append((st.st_mtime, m.group(1), st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{self.prefix}{key}.mp3"
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Lock held while synthesizing `key`, so concurrent identical requests produce one file"""
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._key_locks[key] = lock
+            return lock
+
+    def get(self, key: str) -> Optional[Path]:
+        """Cached file for `key`, marked most recently used, or None"""
+        p = self.path(key)
+        with self._lock:
+            if key in self._entries and p.exists():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    os.utime(p)
+                except OSError:
+                    pass
+                return p
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, src: str) -> Optional[Path]:
+        """Store a finished file under `key` (no copy if it was written in place); evicts LRU entries"""
+        dest = self.path(key)
+        src_path = Path(src)
+        if not src_path.exists():
+            return None
+        if src_path.resolve() != dest.resolve():
+            tmp = dest.with_suffix(".tmp")
+            shutil.copyfile(src_path, tmp)
+            os.replace(tmp, dest)
+        size = dest.stat().st_size
+        with self._lock:
+            self._bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._bytes += size
+            self._evict()
+        return dest
+
+    def materialize(self, key: str, filename: Optional[str]) -> Optional[str]:
+        """On a hit, return the cached file, or a copy/hard link of it at `filename` if one is required"""
+        cached = self.get(key)
+        if cached is None:
+            return None
+        if not filename or Path(filename).resolve() == cached.resolve():
+            return str(cached)
+        try:
+            if Path(filename).exists():
+                os.remove(filename)
+            os.link(cached, filename)
+        except OSError:
+            shutil.copyfile(cached, filename)
+        return filename
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+    def _evict(self) -> None:
+        # Never evict the entry just written, even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            try:
+                self.path(key).unlink()
+            except OSError:
+                pass
+
+
+_default_cache: Optional[AudioCache] = None
+_default_lock = threading.Lock()
+
+
+def default_audio_cache() -> AudioCache:
+    """Process-wide store under POLYINTEL_AUDIO_DIR (default ./audio), served by GET /audio/{filename}"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = AudioCache(os.getenv("POLYINTEL_AUDIO_DIR", "./audio"))
+        return _default_cache
@@ -0,0 +1,227 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# async (query, category, duration) -> briefing dict ({"error": ...} on failure)
+Generator = Callable[[str, str, str], Awaitable[Dict[str, Any]]]
+# async () -> [{"query": ..., "volume": ...}, ...] markets worth having a briefing for
+CandidateSource = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def briefing_key(query: str, category: str = "crypto", duration: str = "PAST_24_HOURS") -> str:
+    """Case- and whitespace-insensitive identity of a briefing request"""
+    return "|".join((" ".join((query or "").lower().split()), category or "", duration or ""))
+
+
+@dataclass
+class BriefingEntry:
+    key: str
+    query: str
+    category: str
+    duration: str
+    result: Dict[str, Any]
+    source: str
+    created_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+class BriefingScheduler:
+    """
+    Pre-generates briefings for the markets most likely to be asked for next.
+    Candidates are ranked by trending volume plus an exponentially decayed count of recent
+    requests; the background loop generates the top ones that are missing or about to expire,
+    spending at most `budget` generations per `budget_window` seconds, `concurrency` at a time.
+    Requests are served from the store while an entry is younger than `ttl`; misses are
+    generated on the request path, with concurrent requests for one briefing sharing the work.
+    Pre-generation spends paid search/LLM/TTS quota, so it is off unless a budget is set
+    (POLYINTEL_BRIEFING_BUDGET > 0).
+    """
+
+    def __init__(self, generate: Generator, candidates: Optional[CandidateSource] = None,
+                 ttl: Optional[float] = None, interval: Optional[float] = None,
+                 budget: Optional[int] = None, budget_window: float = 3600.0,
+                 concurrency: Optional[int] = None, max_entries: Optional[int] = None,
+                 per_cycle: int = 5, refresh_ahead: float = 0.2, half_life: float = 3600.0,
+                 max_tracked: int = 5000) -> None:
+        self.generate = generate
+        self.candidates = candidates
+        self.ttl = ttl or float(os.getenv("POLYINTEL_BRIEFING_TTL", "1800"))
+        self.interval = interval or float(os.getenv("POLYINTEL_BRIEFING_INTERVAL", "300"))
+        self.budget = budget if budget is not None else int(os.getenv("POLYINTEL_BRIEFING_BUDGET", "0"))
+        self.budget_window = budget_window
+        self.concurrency = concurrency or int(os.getenv("POLYINTEL_BRIEFING_CONCURRENCY", "1"))
+        self.max_entries = max_entries or int(os.getenv("POLYINTEL_BRIEFING_CACHE", "128"))
+        self.per_cycle = per_cycle
+        self.refresh_ahead = refresh_ahead
+        self.half_life = half_life
+        self.max_tracked = max_tracked
+        self.entries: "OrderedDict[str, BriefingEntry]" = OrderedDict()
+        # key -> (decayed request count, last update, (query, category, duration))
+        self._demand: Dict[str, Tuple[float, float, Tuple[str, str, str]]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._spent: List[float] = []
+        self._loop_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.prewarmed = 0
+        self.failures = 0
+
+    async def start(self) -> None:
+        if self._loop_task is None and self.budget > 0:
+            self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        tasks = [self._loop_task, *self._inflight.values()]
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+        self._loop_task = None
+        self._inflight.clear()
+
+    def lookup(self, query: str, category: str = "crypto", duration: str = "PAST_24_HOURS") -> Optional[BriefingEntry]:
+        """Fresh stored briefing, or None"""
+        entry = self.entries.get(briefing_key(query, category, duration))
+        if entry is None or entry.age() > self.ttl:
+            return None
+        return entry
+
+    async def get(self, query: str, category: str = "crypto",
+                  duration: str = "PAST_24_HOURS") -> Tuple[Dict[str, Any], Optional[BriefingEntry]]:
+        """
+        Briefing for a user request: (result, entry). The entry is None when generation failed
+        and nothing was stored; an expired entry is returned rather than an error.
+        """
+        key = briefing_key(query, category, duration)
+        self._record(key, (query, category, duration))
+        entry = self.lookup(query, category, duration)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            return entry.result, entry
+        self.misses += 1
+        entry = await asyncio.shield(self._generate(key, query, category, duration, "request"))
+        if entry is None:
+            stale = self.entries.get(key)
+            if stale is not None:
+                return stale.result, stale
+            return {"error": "Briefing generation failed"}, None
+        return entry.result, entry
+
+    def demand(self, key: str, now: Optional[float] = None) -> float:
+        count, updated, _ = self._demand.get(key, (0.0, 0.0, None))
+        return count * 0.5 ** (((now or time.time()) - updated) / self.half_life)
+
+    async def plan(self) -> List[Tuple[str, str, str]]:
+        """Requests worth generating now, best first, limited by what the budget allows"""
+        now = time.time()
+        scored: Dict[str, Tuple[float, Tuple[str, str, str]]] = {}
+        markets = await self.candidates() if self.candidates else []
+        top_volume = max((float(m.get("volume") or 0) for m in markets), default=0.0)
+        for m in markets:
+            params = (m["query"], m.get("category", "crypto"), m.get("duration", "PAST_24_HOURS"))
+            key = briefing_key(*params)
+            share = float(m.get("volume") or 0) / top_volume if top_volume > 0 else 0.0
+            scored[key] = (share + self.demand(key, now), params)
+        for key, (_, _, params) in list(self._demand.items()):
+            d = self.demand(key, now)
+            if d < 0.05:
+                del self._demand[key]
+            elif key not in scored:
+                scored[key] = (d, params)
+
+        refresh_after = self.ttl * (1 - self.refresh_ahead)
+        due = [
+            (score, key, params) for key, (score, params) in scored.items()
+            if key not in self._inflight and (key not in self.entries or self.entries[key].age() > refresh_after)
+        ]
+        due.sort(key=lambda d: -d[0])
+        return [params for _, _, params in due[:min(self.per_cycle, self._budget_left(now))]]
+
+    async def run_once(self) -> int:
+        """One scheduling pass; returns the number of briefings generated"""
+        planned = await self.plan()
+        if not planned:
+            return 0
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def one(params: Tuple[str, str, str]) -> bool:
+            async with sem:
+                key = briefing_key(*params)
+                # Joining a generation a request already started costs nothing extra
+                if key not in self._inflight:
+                    self._spent.append(time.time())
+                entry = await self._generate(key, *params, "prewarm")
+                return entry is not None
+
+        done = await asyncio.gather(*(one(p) for p in planned))
+        self.prewarmed += sum(done)
+        return sum(done)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "fresh": sum(1 for e in self.entries.values() if e.age() <= self.ttl),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "prewarmed": self.prewarmed,
+            "failures": self.failures,
+            "budget_left": self._budget_left(time.time()),
+            "tracked_requests": len(self._demand),
+            "inflight": len(self._inflight),
+        }
+
+    def _record(self, key: str, params: Tuple[str, str, str]) -> None:
+        now = time.time()
+        self._demand[key] = (self.demand(key, now) + 1.0, now, params)
+        if len(self._demand) > self.max_tracked:
+            coldest = min(self._demand, key=lambda k: self.demand(k, now))
+            del self._demand[coldest]
+
+    def _budget_left(self, now: float) -> int:
+        self._spent = [t for t in self._spent if now - t < self.budget_window]
+        return max(0, self.budget - len(self._spent))
+
+    def _generate(self, key: str, query: str, category: str, duration: str, source: str) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._run(key, query, category, duration, source))
+        return task
+
+    async def _run(self, key: str, query: str, category: str, duration: str, source: str) -> Optional[BriefingEntry]:
+        start = time.monotonic()
+        try:
+            result = await self.generate(query, category, duration)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            self._inflight.pop(key, None)
+        if not result or result.get("error"):
+            self.failures += 1
+            print(f"⚠ Briefing generation failed for '{query}': {(result or {}).get('error')}")
+            return None
+        entry = BriefingEntry(key, query, category, duration, result, source)
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        print(f"🗂️ Briefing ready for '{query}' ({source}, {time.monotonic() - start:.1f}s)")
+        return entry
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Briefing scheduler error: {e}")
+            await asyncio.sleep(self.interval)
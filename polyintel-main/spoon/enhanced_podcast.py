@@ -1,10 +1,14 @@
 import os
 import json
-import time
-from typing import Dict, Any, List
+import asyncio
+import zlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 from integrations.de_search import DeSearchClient
 from integrations.sudoapp import SudoClient
 from spoon.audio import generate_briefing
+from spoon.audio_cache import cache_key, default_audio_cache
+from spoon.mp3 import concat_mp3
 
 try:
     from openai import AsyncOpenAI
@@ -39,24 +43,25 @@ class EnhancedPodcastBriefingGenerator:
         # Step 3: Create dynamic podcast segments
         segments = self._create_dynamic_segments(query, analysis_text, raw_data)
         
-        # Step 4: Generate audio for each segment with different settings
+        # Step 4: Generate audio for all segments concurrently, each with its own settings
         print("🎙️ Generating enhanced podcast audio...")
-        audio_files = []
-        
-        for i, segment in enumerate(segments):
-            filename = f"podcast_segment_{i}_{query.replace(' ', '_')}_{int(time.time())}.mp3"
-            audio_path = self._generate_segment_audio(segment, filename)
-            if audio_path:
-                audio_files.append(audio_path)
-        
-        # Step 5: Combine segments (simple concatenation for now)
-        combined_audio = self._combine_audio_segments(audio_files, query)
-        
+        sem = asyncio.Semaphore(int(os.getenv("POLYINTEL_PODCAST_CONCURRENCY", "3")))
+
+        async def synthesize(segment: Dict[str, Any]) -> Optional[str]:
+            async with sem:
+                return await asyncio.to_thread(self._generate_segment_audio, segment)
+
+        results = await asyncio.gather(*(synthesize(segment) for segment in segments))
+        audio_files = [path for path in results if path]
+
+        # Step 5: Join the segment MP3s frame by frame
+        combined_audio = await asyncio.to_thread(self._combine_audio_segments, audio_files, query)
+
         return {
             "status": "success",
             "query": query,
             "audio_file": combined_audio,
-            "audio_url": f"/polyflow/audio/{combined_audio}",
+            "audio_url": f"/audio/{combined_audio}" if combined_audio else None,
             "segments": segments,
             "segment_files": audio_files,
             "analysis": analysis_text,
@@ -201,7 +206,7 @@ I'm your AI analyst, scanning the social sphere on {query}. Let's see if the cro
         
         segments.append({
             "type": "intro",
-            "script": intro_scripts[hash(query) % len(intro_scripts)],
+            "script": intro_scripts[zlib.crc32(query.encode()) % len(intro_scripts)],
             "voice_settings": {
                 "stability": 0.3,  # More energy/variation
                 "similarity_boost": 0.8,
@@ -225,7 +230,7 @@ I'm your AI analyst, scanning the social sphere on {query}. Let's see if the cro
                     reaction = "started picking up steam"
                 viral_script += f"""
 
-One tweet with {likes} likes {reaction}: \"{text}\"""
+One tweet with {likes} likes {reaction}: \"{text}\""""
             
             for post in hot_posts:
                 upvotes = post.get("upvotes", 0)
@@ -233,7 +238,7 @@ One tweet with {likes} likes {reaction}: \"{text}\"""
                 subreddit = post.get("subreddit", "")
                 viral_script += f"""
 
-Reddit post on {subreddit} with {upvotes} upvotes: \"{text}\"""
+Reddit post on {subreddit} with {upvotes} upvotes: \"{text}\""""
             
             segments.append({
                 "type": "viral_content",
@@ -263,7 +268,7 @@ That's {mood} vibes confirmed. Here's my take: {prediction_take}""",
         
         segments.append({
             "type": "data_analysis",
-            "script": data_scripts[hash(query + str(sentiment_score)) % len(data_scripts)],
+            "script": data_scripts[zlib.crc32((query + str(sentiment_score)).encode()) % len(data_scripts)],
             "voice_settings": {
                 "stability": 0.6,  # More stable for data
                 "similarity_boost": 0.8,
@@ -295,7 +300,7 @@ The beauty of sentiment analysis is seeing the crowd's hand before they play it.
         
         segments.append({
             "type": "deep_analysis",
-            "script": analysis_scripts[hash(analysis) % len(analysis_scripts)],
+            "script": analysis_scripts[zlib.crc32(analysis.encode()) % len(analysis_scripts)],
             "voice_settings": {
                 "stability": 0.5,
                 "similarity_boost": 0.75,
@@ -327,7 +332,7 @@ Stay based, trade carefully. Peace out, degens!"""
         
         segments.append({
             "type": "closing",
-            "script": closings[hash(query + str(sentiment_score)) % len(closings)],
+            "script": closings[zlib.crc32((query + str(sentiment_score)).encode()) % len(closings)],
             "voice_settings": {
                 "stability": 0.4,
                 "similarity_boost": 0.8,
@@ -338,30 +343,42 @@ Stay based, trade carefully. Peace out, degens!"""
         
         return segments
     
-    def _generate_segment_audio(self, segment: Dict[str, Any], filename: str) -> str:
-        """Generate audio for a single segment with custom settings"""
+    def _generate_segment_audio(self, segment: Dict[str, Any]) -> str:
+        """Generate audio for a single segment with custom settings (cached by content hash)"""
         try:
-            # Use custom voice settings for each segment
-            api_key = self._get_elevenlabs_key()
-            if not api_key:
-                return None
-            
-            client = ElevenLabs(api_key=api_key)
-            
             # Use different voices for different segment types
             voice_id = self._get_voice_for_segment(segment["type"])
-            
-            audio_stream = client.text_to_speech.convert(
-                text=segment["script"],
-                voice_id=voice_id,
-                model_id="eleven_multilingual_v2",
-                voice_settings=segment["voice_settings"]
-            )
-            
-            with open(filename, "wb") as f:
-                for chunk in audio_stream:
-                    f.write(chunk)
-            
+            model_id = "eleven_multilingual_v2"
+
+            cache = default_audio_cache()
+            key = cache_key(segment["script"], voice_id=voice_id, model_id=model_id,
+                            voice_settings=segment["voice_settings"])
+            with cache.key_lock(key):
+                cached = cache.get(key)
+                if cached:
+                    return str(cached)
+
+                # Use custom voice settings for each segment
+                api_key = self._get_elevenlabs_key()
+                if not api_key:
+                    return None
+
+                from elevenlabs.client import ElevenLabs
+                client = ElevenLabs(api_key=api_key)
+
+                audio_stream = client.text_to_speech.convert(
+                    text=segment["script"],
+                    voice_id=voice_id,
+                    model_id=model_id,
+                    voice_settings=segment["voice_settings"]
+                )
+
+                filename = str(cache.path(key))
+                with open(filename, "wb") as f:
+                    for chunk in audio_stream:
+                        f.write(chunk)
+                cache.put(key, filename)
+
             return filename
         except Exception as e:
             print(f"Error generating segment audio: {e}")
@@ -386,19 +403,20 @@ Stay based, trade carefully. Peace out, degens!"""
                 return v
         return ""
     
-    def _combine_audio_segments(self, segment_files: List[str], query: str) -> str:
-        """Combine audio segments into final podcast"""
+    def _combine_audio_segments(self, segment_files: List[str], query: str) -> Optional[str]:
+        """Concatenate segment MP3s losslessly into the audio cache; returns the cached file name"""
         if not segment_files:
             return None
-        
-        # For now, just return the first segment file
-        # In a real implementation, you'd combine them properly
-        final_filename = f"enhanced_podcast_{query.replace(' ', '_')}_{int(time.time())}.mp3"
-        
-        if segment_files:
-            # Copy first file as final (placeholder for actual combining)
-            import shutil
-            shutil.copy(segment_files[0], final_filename)
-            return final_filename
-        
-        return None
\ No newline at end of file
+
+        # The episode is addressed by its segments, which are themselves content-addressed
+        cache = default_audio_cache()
+        key = cache_key("podcast", segments=[Path(f).name for f in segment_files])
+        with cache.key_lock(key):
+            cached = cache.get(key)
+            if cached:
+                return cached.name
+            combined = concat_mp3(segment_files, str(cache.path(key)))
+            if combined is None:
+                return None
+            cache.put(key, combined)
+        return Path(combined).name
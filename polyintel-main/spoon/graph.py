@@ -1,4 +1,7 @@
-from typing import Callable, Dict, List, TypedDict, Literal, Awaitable
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set, TypedDict, Literal, Awaitable
 
 class AgentState(TypedDict):
     market_slug: str
@@ -9,10 +12,38 @@ class AgentState(TypedDict):
 
 Node = Callable[[AgentState], Awaitable[AgentState]]
 
+def _changes(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Keys a node added or reassigned"""
+    changed = {}
+    for k, v in after.items():
+        if k not in before:
+            changed[k] = v
+            continue
+        old = before[k]
+        try:
+            same = old is v or bool(old == v)
+        except Exception:
+            same = False
+        if not same:
+            changed[k] = v
+    return changed
+
 class Graph:
+    """
+    DAG of async state nodes. `run` starts each node as soon as all of its predecessors have
+    finished, so independent nodes run concurrently and total time follows the critical path.
+    Each node works on its own shallow copy of the state: the initial state plus the updates of
+    its ancestors, applied in topological order. Updates are merged back in that same order
+    (a later node wins on a conflicting key), so the result never depends on completion order.
+    Nodes should assign state keys rather than mutate nested values in place.
+    """
+
     def __init__(self) -> None:
         self.nodes: Dict[str, Node] = {}
         self.edges: Dict[str, List[str]] = {}
+        # Per-node timings of the last run: level, start offset and elapsed seconds
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.elapsed = 0.0
 
     def add_node(self, name: str, node: Node) -> None:
         self.nodes[name] = node
@@ -24,19 +55,28 @@ class Graph:
             self.edges[src] = []
         self.edges[src].append(dst)
 
+    def predecessors(self) -> Dict[str, List[str]]:
+        preds: Dict[str, List[str]] = {n: [] for n in self.edges}
+        for s, ds in self.edges.items():
+            for d in ds:
+                preds.setdefault(d, [])
+                if s not in preds[d]:
+                    preds[d].append(s)
+        return preds
+
     def topo(self) -> List[str]:
         indeg: Dict[str, int] = {n: 0 for n in self.nodes}
         for s, ds in self.edges.items():
             for d in ds:
                 indeg[d] = indeg.get(d, 0) + 1
-        q: List[str] = [n for n, v in indeg.items() if v == 0]
+        q = deque(n for n, v in indeg.items() if v == 0)
         order: List[str] = []
-        seen: Dict[str, bool] = {}
+        seen: Set[str] = set()
         while q:
-            u = q.pop(0)
-            if seen.get(u):
+            u = q.popleft()
+            if u in seen:
                 continue
-            seen[u] = True
+            seen.add(u)
             order.append(u)
             for v in self.edges.get(u, []):
                 indeg[v] -= 1
@@ -48,11 +88,56 @@ class Graph:
         order = self.topo()
         if start not in order:
             order.insert(0, start)
-        executed: Dict[str, bool] = {}
+        rank = {n: i for i, n in enumerate(order)}
+        all_preds = self.predecessors()
+        preds = {n: [p for p in all_preds.get(n, []) if p in rank] for n in order}
+        ancestors: Dict[str, List[str]] = {}
+        depth: Dict[str, int] = {}
         for name in order:
+            anc: Set[str] = set()
+            for p in preds[name]:
+                anc.add(p)
+                anc.update(ancestors[p])
+            ancestors[name] = sorted(anc, key=rank.__getitem__)
+            depth[name] = max((depth[p] + 1 for p in preds[name]), default=0)
+
+        base = dict(state)
+        updates: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        t0 = time.perf_counter()
+
+        async def execute(name: str) -> None:
+            if preds[name]:
+                await asyncio.gather(*(tasks[p] for p in preds[name]))
             node = self.nodes.get(name)
             if not node:
-                continue
-            state = await node(state)
-            executed[name] = True
-        return state
\ No newline at end of file
+                updates[name] = {}
+                return
+            inputs = dict(base)
+            for a in ancestors[name]:
+                inputs.update(updates[a])
+            started = time.perf_counter()
+            working = dict(inputs)
+            result: Optional[Dict[str, Any]] = await node(working)
+            updates[name] = _changes(inputs, working if result is None else result)
+            timings[name] = {
+                "level": depth[name],
+                "started": round(started - t0, 6),
+                "elapsed": round(time.perf_counter() - started, 6),
+            }
+
+        # Every task is created before any runs, so predecessors are always in `tasks`
+        for name in order:
+            tasks[name] = asyncio.create_task(execute(name))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for t in tasks.values():
+                t.cancel()
+            self.timings = timings
+            self.elapsed = round(time.perf_counter() - t0, 6)
+
+        for name in order:
+            state.update(updates[name])
+        return state
@@ -1,65 +1,59 @@
 from typing import Any, Optional, Dict
 import os
-import time
-import httpx
 import json
+from core.cache import SWRCache
+from core.http import UpstreamClients, upstream_client
 from integrations.de_search import DeSearchClient
 from integrations.apro_oracle import AproOracleClient
 from integrations.aioz import AiozClient
 
-class MCPTools:
-    def __init__(self) -> None:
-        self.desearch = DeSearchClient()
-        self.apro = AproOracleClient()
-        self.aioz = AiozClient()
-        self._cache: Dict[str, Any] = {}
-
-    def _cache_get(self, key: str, ttl: float) -> Any:
-        item = self._cache.get(key)
-        if not item:
-            return None
-        value, ts = item
-        if time.time() - ts > ttl:
-            return None
-        return value
+# Shared by every MCPTools instance; fetchers return None for results that must not be cached
+_cache = SWRCache()
+
 
-    def _cache_set(self, key: str, value: Any) -> None:
-        self._cache[key] = (value, time.time())
+def cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
+
+
+class MCPTools:
+    def __init__(self, clients: Optional[UpstreamClients] = None) -> None:
+        self.clients = clients
+        self.desearch = DeSearchClient(clients)
+        self.apro = AproOracleClient(clients)
+        self.aioz = AiozClient(clients)
+        self._cache = _cache
 
     async def market_odds(self, market_slug: str) -> float:
+        odds = await self._cache.get(f"odds:{market_slug}", lambda: self._fetch_market_odds(market_slug))
+        return float(odds) if odds is not None else 0.5
+
+    async def _fetch_market_odds(self, market_slug: str) -> Optional[float]:
         base = os.getenv("POLYMARKET_GAMMA_URL", "https://gamma-api.polymarket.com")
         url = f"{base}/events?slug={market_slug}"
         try:
-            cached = self._cache_get(f"odds:{market_slug}", ttl=120.0)
-            if cached is not None:
-                return float(cached)
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(base, self.clients) as client:
                 res = await client.get(url, timeout=6.0)
                 if res.status_code != 200:
                     ev = await client.get(f"{base}/events?search={market_slug}", timeout=6.0)
                     if ev.status_code != 200:
-                        return 0.5
+                        return None
                     events = ev.json()
                     if not isinstance(events, list) or not events:
-                        return 0.5
+                        return None
                     event = events[0]
                     markets = event.get("markets", [])
                     if not markets:
-                        return 0.5
+                        return None
                     prices = markets[0].get("outcomePrices", [0.5])
-                    yes_price = float(prices[0]) if prices else 0.5
-                    self._cache_set(f"odds:{market_slug}", yes_price)
-                    return yes_price
+                    return float(prices[0]) if prices else 0.5
                 data = res.json()
                 markets = data[0].get("markets", [])
                 if not markets:
-                    return 0.5
+                    return None
                 prices = markets[0].get("outcomePrices", [0.5])
-                yes_price = float(prices[0]) if prices else 0.5
-                self._cache_set(f"odds:{market_slug}", yes_price)
-                return yes_price
+                return float(prices[0]) if prices else 0.5
         except Exception:
-            return 0.5
+            return None
 
     async def narrative(self, market_slug: str) -> float:
         data = await self.desearch.query_sentiment(market_slug)
@@ -73,15 +67,8 @@ class MCPTools:
 
     async def desearch_multi(self, query: str, category: str, date_filter: str = "PAST_24_HOURS") -> dict:
         key = f"desearch:{query}:{category}:{date_filter}"
-        cached = self._cache_get(key, ttl=120.0)
-        if cached is not None:
-            return cached
-        try:
-            res = await self.desearch.search_multi(query, category, date_filter)
-            self._cache_set(key, res)
-            return res
-        except Exception:
-            return {"status": "error", "query": query}
+        res = await self._cache.get(key, lambda: self.desearch.search_multi(query, category, date_filter))
+        return res if res is not None else {"status": "error", "query": query}
 
     async def fundamental(self, market_slug: str) -> str:
         data = await self.apro.fetch_market_baseline(market_slug)
@@ -99,12 +86,13 @@ class MCPTools:
         )
 
     async def kalshi_odds(self, market_slug: str) -> Optional[float]:
+        odds = await self._cache.get(f"kalshi:{market_slug}", lambda: self._fetch_kalshi_odds(market_slug))
+        return float(odds) if odds is not None else None
+
+    async def _fetch_kalshi_odds(self, market_slug: str) -> Optional[float]:
         base = os.getenv("KALSHI_BASE_URL", "https://api.kalshi.com/trade-api/v2")
         try:
-            cached = self._cache_get(f"kalshi:{market_slug}", ttl=120.0)
-            if cached is not None:
-                return float(cached)
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(base, self.clients) as client:
                 url = f"{base}/markets"
                 res = await client.get(url, params={"slug": market_slug}, timeout=5.0)
                 if res.status_code == 200:
@@ -112,7 +100,6 @@ class MCPTools:
                     if isinstance(data, dict):
                         odds = data.get("odds")
                         if odds is not None:
-                            self._cache_set(f"kalshi:{market_slug}", float(odds))
                             return float(odds)
                 res2 = await client.get(url, params={"text": market_slug}, timeout=5.0)
                 if res2.status_code == 200:
@@ -120,26 +107,26 @@ class MCPTools:
                     if isinstance(data2, dict):
                         odds2 = data2.get("odds")
                         if odds2 is not None:
-                            self._cache_set(f"kalshi:{market_slug}", float(odds2))
                             return float(odds2)
                 return None
         except Exception:
             return None
 
     async def polymarket_search(self, query: str) -> dict:
+        result = await self._cache.get(f"pm_search:{query}", lambda: self._fetch_polymarket_search(query))
+        return result if result is not None else {"status": "error", "query": query}
+
+    async def _fetch_polymarket_search(self, query: str) -> Optional[dict]:
         base = os.getenv("POLYMARKET_GAMMA_URL", "https://gamma-api.polymarket.com")
         try:
-            cached = self._cache_get(f"pm_search:{query}", ttl=120.0)
-            if cached is not None:
-                return cached
-            async with httpx.AsyncClient() as client:
+            async with upstream_client(base, self.clients) as client:
                 # First try exact search, then broader search
                 ev_res = await client.get(f"{base}/events", params={"search": query}, timeout=12.0)
                 if ev_res.status_code != 200:
-                    return {"status": "error", "query": query}
+                    return None
                 events = ev_res.json()
         except Exception:
-            return {"status": "error", "query": query}
+            return None
 
         filtered = []
         crypto_keywords = [
@@ -225,5 +212,4 @@ class MCPTools:
             "markets": filtered[:5],
             "filtered_non_crypto": len(events) - len(filtered) if isinstance(events, list) else 0
         }
-        self._cache_set(f"pm_search:{query}", result)
         return result
\ No newline at end of file
@@ -0,0 +1,93 @@
+import os
+from typing import Iterator, Optional, Sequence
+
+# Bitrates (kbps) by [MPEG-1?][layer][index]; index 0 (free) and 15 (bad) are rejected
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates by version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _id3v2_size(data: bytes) -> int:
+    """Length of a leading ID3v2 tag (0 if none)"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def frame_length(header: bytes) -> int:
+    """Byte length of the MPEG audio frame starting with `header` (4 bytes), 0 if it is not a valid header"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return 0
+    version = (header[1] >> 3) & 0x03
+    layer = 4 - ((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return 0
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4
+    if layer == 3 and not mpeg1:
+        return 72 * bitrate // sample_rate + padding
+    return 144 * bitrate // sample_rate + padding
+
+
+def _is_info_frame(frame: bytes) -> bool:
+    """Xing/Info/VBRI header frames describe one file's length; they must not survive concatenation"""
+    head = frame[:64]
+    return b"Xing" in head or b"Info" in head or b"VBRI" in head
+
+
+def iter_frames(data: bytes) -> Iterator[bytes]:
+    """Audio frames of an MP3 file, skipping ID3 tags, encoder header frames and junk between frames"""
+    pos = _id3v2_size(data)
+    end = len(data)
+    if end - pos >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    first = True
+    while pos + 4 <= end:
+        length = frame_length(data[pos:pos + 4])
+        if length and pos + length <= end:
+            # Accept a frame only if another frame (or the end) follows, to avoid false syncs
+            nxt = pos + length
+            if nxt == end or nxt + 4 > end or frame_length(data[nxt:nxt + 4]):
+                frame = data[pos:nxt]
+                if not (first and _is_info_frame(frame)):
+                    yield frame
+                first = False
+                pos = nxt
+                continue
+        pos += 1
+
+
+def concat_mp3(paths: Sequence[str], dest: str) -> Optional[str]:
+    """
+    Losslessly join MP3 files by copying their audio frames in order (no decoding or re-encoding).
+    Returns `dest`, or None if no input contained audio frames.
+    """
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    frames = 0
+    with open(tmp, "wb") as out:
+        for path in paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            for frame in iter_frames(data):
+                out.write(frame)
+                frames += 1
+    if not frames:
+        os.remove(tmp)
+        return None
+    os.replace(tmp, dest)
+    return dest
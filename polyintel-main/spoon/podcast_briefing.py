@@ -1,6 +1,7 @@
 import os
 import json
-import time
+import asyncio
+from pathlib import Path
 from typing import Dict, Any
 from integrations.de_search import DeSearchClient
 from integrations.sudoapp import SudoClient
@@ -44,8 +45,9 @@ class PodcastBriefingGenerator:
         
         # Step 5: Generate audio
         print("🎙️ Generating podcast audio...")
-        audio_filename = f"podcast_briefing_{query.replace(' ', '_')}_{int(time.time())}.mp3"
-        audio_path = generate_briefing(podcast_script, audio_filename)
+        # Blocking TTS runs off the event loop; the file lands in the content-addressed audio cache
+        audio_path = await asyncio.to_thread(generate_briefing, podcast_script)
+        audio_filename = Path(audio_path).name if audio_path else None
         
         return {
             "status": "success",
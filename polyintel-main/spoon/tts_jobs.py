@@ -0,0 +1,205 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+# Synchronous synthesizer: (text[, voice_id]) -> audio URL or None
+Synthesizer = Callable[..., Optional[str]]
+
+PENDING = ("queued", "running")
+
+
+@dataclass
+class TTSJob:
+    id: str
+    text: str
+    voice_id: Optional[str] = None
+    status: str = "queued"
+    audio_url: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "audio_url": self.audio_url,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class TTSJobQueue:
+    """
+    Bounded queue of text-to-speech jobs served by a small worker pool.
+    Blocking TTS providers run on a dedicated thread pool so the event loop never waits on them.
+    A timed-out call cannot be stopped and keeps its thread until the provider returns, so the
+    pool has `spare_threads` of headroom and a worker only takes a job once a thread is free;
+    a job's timeout starts when its thread actually begins.
+    """
+
+    def __init__(self, synthesize: Synthesizer, workers: Optional[int] = None,
+                 max_queue: Optional[int] = None, job_timeout: Optional[float] = None,
+                 max_finished: int = 1000, spare_threads: Optional[int] = None) -> None:
+        self.synthesize = synthesize
+        self.workers = workers or int(os.getenv("POLYINTEL_TTS_WORKERS", "2"))
+        self.max_queue = max_queue or int(os.getenv("POLYINTEL_TTS_QUEUE", "32"))
+        self.job_timeout = job_timeout or float(os.getenv("POLYINTEL_TTS_TIMEOUT", "60"))
+        self.max_finished = max_finished
+        self.spare_threads = spare_threads if spare_threads is not None else int(
+            os.getenv("POLYINTEL_TTS_SPARE_THREADS", str(self.workers)))
+        self.threads = self.workers + self.spare_threads
+        self._free_threads: Optional[asyncio.Semaphore] = None
+        self.abandoned = 0
+        self.jobs: "OrderedDict[str, TTSJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: list = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="tts")
+        self._free_threads = asyncio.Semaphore(self.threads)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for job in self.jobs.values():
+            if job.status in PENDING:
+                self._finish(job, "cancelled", error="shutdown")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, text: str, voice_id: Optional[str] = None) -> TTSJob:
+        """Enqueue a job; raises asyncio.QueueFull when the queue is at capacity"""
+        if self._queue is None:
+            raise RuntimeError("TTS job queue is not started")
+        job = TTSJob(id=uuid.uuid4().hex, text=text, voice_id=voice_id)
+        self._queue.put_nowait(job)
+        self.jobs[job.id] = job
+        self._evict()
+        return job
+
+    def get(self, job_id: str) -> Optional[TTSJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[TTSJob]:
+        """Cancel a queued or running job (a running provider call finishes but its result is dropped)"""
+        job = self.jobs.get(job_id)
+        if job is not None and job.status in PENDING:
+            self._finish(job, "cancelled")
+        return job
+
+    async def wait(self, job: TTSJob, timeout: Optional[float] = None) -> TTSJob:
+        """Wait up to `timeout` seconds for a job to finish; returns the job either way"""
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    async def run(self, text: str, voice_id: Optional[str] = None,
+                  timeout: Optional[float] = None) -> Optional[TTSJob]:
+        """Submit and wait; returns None if the queue is full"""
+        try:
+            job = self.submit(text, voice_id)
+        except asyncio.QueueFull:
+            print("⚠ TTS queue full, skipping audio generation")
+            return None
+        return await self.wait(job, timeout)
+
+    def stats(self) -> Dict:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "threads": self.threads,
+            "abandoned_calls": self.abandoned,
+            "jobs": counts,
+        }
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Hold a thread before taking a job, so a queued job never waits behind a hung call
+            await self._free_threads.acquire()
+            try:
+                job = await self._queue.get()
+            except BaseException:
+                self._free_threads.release()
+                raise
+            try:
+                if job.status != "queued":
+                    self._free_threads.release()
+                    continue
+                await self._run_job(loop, job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, loop: asyncio.AbstractEventLoop, job: TTSJob) -> None:
+        started = loop.create_future()
+
+        def call() -> Optional[str]:
+            loop.call_soon_threadsafe(lambda: started.done() or started.set_result(None))
+            args = (job.text, job.voice_id) if job.voice_id else (job.text,)
+            return self.synthesize(*args)
+
+        future = self._executor.submit(call)
+        # The thread slot comes back when the call really returns, even after a timeout
+        future.add_done_callback(lambda _: self._release_thread(loop))
+        job.status = "running"
+        await started
+        job.started_at = time.time()
+        try:
+            audio_url = await asyncio.wait_for(asyncio.wrap_future(future), self.job_timeout)
+        except asyncio.TimeoutError:
+            # A job cancelled while running keeps its cancelled status
+            if job.status == "running":
+                self.abandoned += 1
+                self._finish(job, "timeout", error=f"exceeded {self.job_timeout:.0f}s")
+            return
+        except Exception as e:
+            if job.status == "running":
+                self._finish(job, "failed", error=f"{type(e).__name__}: {e}")
+            return
+        if job.status != "running":
+            return
+        if audio_url:
+            job.audio_url = audio_url
+            self._finish(job, "done")
+        else:
+            self._finish(job, "failed", error="no audio produced")
+
+    def _release_thread(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._free_threads.release)
+        except RuntimeError:
+            pass  # Loop already closed (shutdown)
+
+    def _finish(self, job: TTSJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        job.done.set()
+
+    def _evict(self) -> None:
+        finished = [jid for jid, j in self.jobs.items() if j.status not in PENDING]
+        for jid in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[jid]
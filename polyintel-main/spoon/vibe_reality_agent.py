@@ -1,5 +1,4 @@
 from typing import Dict
-import asyncio
 from spoon.graph import Graph
 from spoon.mcp_tools import MCPTools
 from integrations.manus import ManusClient
@@ -20,15 +19,22 @@ async def run_vibe_reality(market_slug: str, use_manus: bool = False) -> Dict:
         "analysis": "",
     }
 
-    async def node_fetch_core(s: Dict) -> Dict:
-        pm_task = tools.market_odds(s["market_slug"])
-        ka_task = tools.kalshi_odds(s["market_slug"])
-        nar_task = tools.narrative(s["market_slug"])
-        pm, ka, nar = await asyncio.gather(pm_task, ka_task, nar_task)
-        s["polymarket_odds"] = float(pm)
-        s["kalshi_odds"] = ka if ka is not None else None
+    # The three fetches have no dependencies, so the graph runs them concurrently
+    async def node_polymarket(s: Dict) -> Dict:
+        s["polymarket_odds"] = float(await tools.market_odds(s["market_slug"]))
+        return s
+
+    async def node_kalshi(s: Dict) -> Dict:
+        s["kalshi_odds"] = await tools.kalshi_odds(s["market_slug"])
+        return s
+
+    async def node_narrative(s: Dict) -> Dict:
+        s["narrative_score"] = float(await tools.narrative(s["market_slug"]))
+        return s
+
+    async def node_reality(s: Dict) -> Dict:
+        pm, ka = s["polymarket_odds"], s["kalshi_odds"]
         s["reality_odds"] = float(pm) if ka is None else float((float(pm) + float(ka)) / 2.0)
-        s["narrative_score"] = float(nar)
         return s
 
     async def node_gap(s: Dict) -> Dict:
@@ -61,16 +67,23 @@ async def run_vibe_reality(market_slug: str, use_manus: bool = False) -> Dict:
         return s
 
     g = Graph()
-    g.add_node("core", node_fetch_core)
+    g.add_node("polymarket", node_polymarket)
+    g.add_node("kalshi", node_kalshi)
+    g.add_node("narrative", node_narrative)
+    g.add_node("reality", node_reality)
     g.add_node("gap", node_gap)
     g.add_node("decision", node_decide)
-    g.add_edge("core", "gap")
+    g.add_edge("polymarket", "reality")
+    g.add_edge("kalshi", "reality")
+    g.add_edge("reality", "gap")
+    g.add_edge("narrative", "gap")
     g.add_edge("gap", "decision")
-    final = await g.run("core", state)
+    final = await g.run("polymarket", state)
 
     aioz = AiozClient()
     reasoning = await aioz.generate_reasoning("VIBE_REALITY", {"market_slug": final["market_slug"], "polymarket_odds": final["polymarket_odds"], "kalshi_odds": final["kalshi_odds"], "reality_odds": final["reality_odds"], "narrative_score": final["narrative_score"], "gap": final["gap"], "decision": final["decision"], "direction": final["direction"], "confidence": final["confidence"]})
     if not reasoning:
         reasoning = f"gap={final['gap']} reality_odds={final['reality_odds']} narrative={final['narrative_score']} decision={final['decision']}"
     final["analysis"] = reasoning
+    final["timings"] = g.timings
     return final
\ No newline at end of file
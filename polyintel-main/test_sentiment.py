@@ -0,0 +1,27 @@
+"""Regression checks for the compiled sentiment lexicon (python -m pytest test_sentiment.py)"""
+
+from core.sentiment import Lexicon, score_texts
+
+lexicon = Lexicon()
+
+
+def test_inflected_terms_match():
+    assert lexicon.count("ETH prices dropped, crashing hard") == (0, 2)
+    assert lexicon.count("BTC surges as the ETF rally rallied on") == (3, 0)
+    assert lexicon.count("Fears grow as prices keep falling") == (0, 2)
+    assert lexicon.count("panicked selling and heavy losses") == (0, 3)
+
+
+def test_bearish_news_scores_negative():
+    assert score_texts(["ETH prices dropped, crashing hard"]).score(neutral=0.1) == -1.0
+
+
+def test_negation_flips_inflected_and_curly_contractions():
+    assert lexicon.count("not falling") == (1, 0)
+    assert lexicon.count("Don’t sell") == (1, 0)
+    assert lexicon.count("Don't sell") == (1, 0)
+
+
+def test_unrelated_words_stay_unmatched():
+    assert lexicon.count("news uses used buses") == (0, 0)
+    assert lexicon.count("upward") == (0, 0)
@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 from data_collector import PolymarketCollector
 from market_data import CryptoCollector
 from database import Database
+from calculate_correlations import CorrelationCalculator
+from rolling_correlations import RollingCorrelationTracker
 
 
 class DataCollector:
@@ -21,6 +23,7 @@ class DataCollector:
         self.pm_collector = PolymarketCollector()
         self.crypto_collector = CryptoCollector()
         self.db = Database()
+        self.rolling_tracker = RollingCorrelationTracker(self.db)
     
     async def collect_polymarket_data(self, hours: int = 24):
         """
@@ -77,6 +80,13 @@ class DataCollector:
             print(f"❌ Error collecting crypto data: {e}")
             return 0
     
+    def update_rolling_correlations(self):
+        """Extend materialized rolling correlations with the newly collected ticks"""
+        calculator = CorrelationCalculator(self.db)
+        written = self.rolling_tracker.update_all(calculator.categories, calculator.assets)
+        print(f"✅ Updated {written} rolling correlation points")
+        return written
+    
     async def collect_continuous(self, interval_minutes: int = 5, duration_hours: int = 24):
         """
         Continuously collect data for specified duration
@@ -103,6 +113,7 @@ class DataCollector:
                 # Collect both data types
                 pm_count = await self.collect_polymarket_data(hours=1)
                 crypto_count = await self.collect_crypto_data()
+                self.update_rolling_correlations()
                 
                 # Show stats
                 stats = self.db.get_stats()
@@ -140,6 +151,7 @@ class DataCollector:
         
         await self.collect_polymarket_data()
         await self.collect_crypto_data()
+        self.update_rolling_correlations()
         
         stats = self.db.get_stats()
         print("\n📈 Current database stats:")
@@ -13,11 +13,14 @@ from portfolio import Portfolio, PortfolioManager
 from portfolio_correlations import PortfolioCorrelationTracker
 from edgescore import EdgeScoreCalculator
 from semantic_matcher import SemanticMatcher
+from rolling_correlations import RollingCorrelationTracker
+from relationship_explorer import RelationshipExplorer
 import asyncio
 
 app = Flask(__name__)
 db = Database()
 portfolio_manager = PortfolioManager(db)
+rolling_tracker = RollingCorrelationTracker(db)
 
 # Mock data (will be replaced with real data from database)
 MOCK_DATA = {
@@ -204,6 +207,25 @@ MOCK_DATA = {
 }
 
 
+# Columns the dashboard renders for a signal (signal_data is never decoded for the feed)
+SIGNAL_FEED_FIELDS = ["market_question", "category", "polymarket_change", "signal_strength",
+                      "generated_at", "trade_suggestions"]
+
+
+def format_signal(sig):
+    """Convert a stored signal row to the dashboard signal shape"""
+    return {
+        "id": sig["id"],
+        "market_question": sig["market_question"],
+        "category": sig["category"],
+        "polymarket_change": f"{sig.get('polymarket_change', '0%')}",
+        "signal_strength": sig.get("signal_strength", "WEAK"),
+        "timestamp": sig["generated_at"],
+        "trade_suggestions": sig.get("trade_suggestions", []),
+        "using_real_data": True
+    }
+
+
 def get_real_data():
     """Get real data from database if available, otherwise return mock data"""
     try:
@@ -217,19 +239,8 @@ def get_real_data():
             return MOCK_DATA, False
         
         # Get real signals
-        real_signals = db.get_recent_signals(limit=10)
-        signals = []
-        for sig in real_signals:
-            signals.append({
-                "id": sig["id"],
-                "market_question": sig["market_question"],
-                "category": sig["category"],
-                "polymarket_change": f"{sig.get('polymarket_change', '0%')}",
-                "signal_strength": sig.get("signal_strength", "WEAK"),
-                "timestamp": sig["generated_at"],
-                "trade_suggestions": sig.get("trade_suggestions", []),
-                "using_real_data": True
-            })
+        real_signals = db.get_signals_page(limit=10, fields=SIGNAL_FEED_FIELDS)["items"]
+        signals = [format_signal(sig) for sig in real_signals]
         
         # Get real correlations
         correlations = db.get_all_correlations()
@@ -447,7 +458,22 @@ def api_stats():
 
 @app.route('/api/signals')
 def api_signals():
-    """API endpoint for signals"""
+    """API endpoint for signals (cursor-paginated when limit or cursor is given)"""
+    if 'limit' in request.args or 'cursor' in request.args:
+        try:
+            page = db.get_signals_page(
+                limit=request.args.get('limit', 10, type=int),
+                cursor=request.args.get('cursor'),
+                fields=SIGNAL_FEED_FIELDS
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "signals": [format_signal(sig) for sig in page["items"]],
+            "next_cursor": page["next_cursor"],
+            "is_real_data": True
+        })
+    
     data, is_real = get_real_data()
     return jsonify({
         "signals": data["signals"],
@@ -637,6 +663,63 @@ def api_relationship_explorer(market_category, asset_symbol):
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/relationship/<market_category>/<asset_symbol>/explore')
+def api_relationship_explore(market_category, asset_symbol):
+    """Get full relationship analysis with chart data downsampled to a point budget"""
+    days = request.args.get('days', 30, type=int)
+    max_points = request.args.get('points', 500, type=int)
+    method = request.args.get('method', 'lttb')
+    
+    try:
+        explorer = RelationshipExplorer(db)
+        relationship = explorer.explore_relationship(market_category, asset_symbol, days=days,
+                                                     max_points=max_points,
+                                                     downsample_method=method)
+        if "error" in relationship:
+            return jsonify(relationship), 404
+        return jsonify(relationship)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/relationship/<market_category>/<asset_symbol>/rolling')
+def api_relationship_rolling(market_category, asset_symbol):
+    """Get materialized rolling correlation series, downsampled server-side"""
+    window_size = request.args.get('window', 24, type=int)
+    days = request.args.get('days', 30, type=int)
+    max_points = request.args.get('points', 500, type=int)
+    
+    if window_size not in rolling_tracker.window_sizes:
+        return jsonify({
+            "error": f"Unsupported window size: {window_size}",
+            "window_sizes": list(rolling_tracker.window_sizes)
+        }), 400
+    
+    try:
+        series = rolling_tracker.get_series(market_category, asset_symbol, window_size,
+                                            days=days, max_points=max_points)
+        return jsonify(series)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/portfolio/<portfolio_id>/alerts')
+def api_portfolio_alerts(portfolio_id):
+    """Get cursor-paginated alerts for a portfolio"""
+    fields = request.args.get('fields')
+    try:
+        page = db.get_portfolio_alerts_page(
+            portfolio_id,
+            limit=request.args.get('limit', 20, type=int),
+            cursor=request.args.get('cursor'),
+            unread_only=request.args.get('unread_only', 'false').lower() == 'true',
+            fields=fields.split(',') if fields else None
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"alerts": page["items"], "next_cursor": page["next_cursor"]})
+
+
 @app.route('/api/portfolio/<portfolio_id>/events')
 def api_portfolio_events(portfolio_id):
     """Get event calendar for portfolio"""
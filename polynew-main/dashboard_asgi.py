@@ -0,0 +1,311 @@
+"""
+PolySignal - ASGI API Server
+Serves the dashboard /api/* routes natively async on one shared event loop
+One HTTP client pool and the dashboard's in-process state are shared by all requests
+
+Run with: uvicorn dashboard_asgi:app --host 0.0.0.0 --port 8081
+"""
+
+import contextlib
+import httpx
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from dashboard import (db, portfolio_manager, rolling_tracker, get_real_data,
+                       format_signal, SIGNAL_FEED_FIELDS)
+from data_collector import PolymarketCollector
+from edgescore import EdgeScoreCalculator
+from market_matcher import MarketMatcher
+from portfolio import Portfolio
+from portfolio_correlations import PortfolioCorrelationTracker
+from relationship_explorer import RelationshipExplorer
+from semantic_matcher import SemanticMatcher
+
+
+class SharedServices:
+    """Long-lived clients created once per process inside the serving event loop"""
+
+    def __init__(self):
+        self.http_client = None
+        self.semantic_matcher = None
+        self.tracker = None
+        self.edgescore_calc = EdgeScoreCalculator(db)
+        self.explorer = RelationshipExplorer(db)
+
+    async def start(self):
+        """Create the shared HTTP client pool and the matchers that use it"""
+        self.http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        market_matcher = MarketMatcher(PolymarketCollector(client=self.http_client))
+        self.semantic_matcher = SemanticMatcher(base_matcher=market_matcher, db=db)
+        self.tracker = PortfolioCorrelationTracker(db, market_matcher=market_matcher)
+
+    async def stop(self):
+        """Close the shared HTTP client pool"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+
+services = SharedServices()
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    await services.start()
+    try:
+        yield
+    finally:
+        await services.stop()
+
+
+async def _load_portfolio(portfolio_id: str):
+    """Load a portfolio by id, or None if it doesn't exist"""
+    portfolio_dict = await run_in_threadpool(db.get_portfolio, portfolio_id)
+    return Portfolio.from_dict(portfolio_dict) if portfolio_dict else None
+
+
+async def api_stats(request: Request):
+    """API endpoint for statistics"""
+    data, is_real = await run_in_threadpool(get_real_data)
+    return JSONResponse({"stats": data["stats"], "is_real_data": is_real})
+
+
+async def api_signals(request: Request):
+    """API endpoint for signals (cursor-paginated when limit or cursor is given)"""
+    params = request.query_params
+    if "limit" in params or "cursor" in params:
+        try:
+            page = await run_in_threadpool(
+                db.get_signals_page,
+                limit=int(params.get("limit", 10)),
+                cursor=params.get("cursor"),
+                fields=SIGNAL_FEED_FIELDS
+            )
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse({
+            "signals": [format_signal(sig) for sig in page["items"]],
+            "next_cursor": page["next_cursor"],
+            "is_real_data": True
+        })
+
+    data, is_real = await run_in_threadpool(get_real_data)
+    return JSONResponse({"signals": data["signals"], "is_real_data": is_real})
+
+
+async def api_correlations(request: Request):
+    """API endpoint for correlations"""
+    data, is_real = await run_in_threadpool(get_real_data)
+    return JSONResponse({"correlations": data["correlations"], "is_real_data": is_real})
+
+
+async def api_portfolios(request: Request):
+    """API endpoint for portfolios"""
+    if request.method == "POST":
+        data = await request.json()
+
+        def create():
+            portfolio_id = portfolio_manager.create_portfolio(
+                data.get("name", "My Portfolio"),
+                data.get("user_id", "default")
+            )
+            portfolio_manager.add_holdings_from_list(portfolio_id, data.get("holdings", []))
+            return portfolio_id
+
+        portfolio_id = await run_in_threadpool(create)
+        return JSONResponse({"portfolio_id": portfolio_id, "status": "created"})
+
+    portfolios = await run_in_threadpool(db.list_portfolios)
+    return JSONResponse({"portfolios": portfolios})
+
+
+async def api_portfolio_analyze(request: Request):
+    """Analyze a portfolio"""
+    portfolio = await _load_portfolio(request.path_params["portfolio_id"])
+    if portfolio is None:
+        return JSONResponse({"error": "Portfolio not found"}, status_code=404)
+
+    try:
+        analysis = await services.tracker.analyze_portfolio(portfolio)
+        return JSONResponse(analysis)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def _markets_that_matter(portfolio: Portfolio):
+    """Run the semantic matcher for a portfolio on the shared client pool"""
+    try:
+        markets = await services.semantic_matcher.find_markets_for_portfolio(
+            portfolio.get_holdings(), min_edgescore=40.0
+        )
+        return JSONResponse({"markets": markets})
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def api_markets_that_matter(request: Request):
+    """Get markets that matter for default portfolio"""
+    portfolios = await run_in_threadpool(db.list_portfolios)
+    if not portfolios:
+        return JSONResponse({"markets": []})
+    return await _markets_that_matter(Portfolio.from_dict(portfolios[0]))
+
+
+async def api_portfolio_markets_that_matter(request: Request):
+    """Get ranked markets that matter for portfolio"""
+    portfolio = await _load_portfolio(request.path_params["portfolio_id"])
+    if portfolio is None:
+        return JSONResponse({"error": "Portfolio not found"}, status_code=404)
+    return await _markets_that_matter(portfolio)
+
+
+async def api_relationship(request: Request):
+    """Get relationship data for a market-asset pair"""
+    # Same mock structure as the Flask dashboard until market ids map to categories
+    return JSONResponse({
+        "market_id": request.path_params["market_id"],
+        "asset": request.path_params["asset"],
+        "correlation": 0.73,
+        "lead_time_hours": 8,
+        "success_rate": 0.83,
+        "sample_size": 145,
+        "edgescore": 86.2,
+        "historical_performance": "12 significant PM moves → 10 times asset followed within 12 hours"
+    })
+
+
+async def api_edge_intensity(request: Request):
+    """Get Edge Intensity for each holding"""
+    portfolio = await _load_portfolio(request.path_params["portfolio_id"])
+    if portfolio is None:
+        return JSONResponse({"error": "Portfolio not found"}, status_code=404)
+
+    symbols = portfolio.get_symbols()
+    holdings = portfolio.get_holdings()
+
+    def compute():
+        return [{
+            "symbol": symbol,
+            "weight": holdings.get(symbol, 0) * 100,
+            "edge_intensity": services.edgescore_calc.get_edge_intensity(symbol, symbols)
+        } for symbol in symbols]
+
+    intensities = await run_in_threadpool(compute)
+    return JSONResponse({"intensities": intensities})
+
+
+async def api_relationship_explore(request: Request):
+    """Get full relationship analysis with chart data downsampled to a point budget"""
+    params = request.query_params
+    try:
+        relationship = await run_in_threadpool(
+            services.explorer.explore_relationship,
+            request.path_params["market_category"],
+            request.path_params["asset_symbol"],
+            days=int(params.get("days", 30)),
+            max_points=int(params.get("points", 500)),
+            downsample_method=params.get("method", "lttb")
+        )
+        if "error" in relationship:
+            return JSONResponse(relationship, status_code=404)
+        return JSONResponse(relationship)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def api_relationship_rolling(request: Request):
+    """Get materialized rolling correlation series, downsampled server-side"""
+    params = request.query_params
+    try:
+        window_size = int(params.get("window", 24))
+        days = int(params.get("days", 30))
+        max_points = int(params.get("points", 500))
+    except ValueError as e:
+        return JSONResponse({"error": f"Invalid query parameter: {e}"}, status_code=400)
+
+    if window_size not in rolling_tracker.window_sizes:
+        return JSONResponse({
+            "error": f"Unsupported window size: {window_size}",
+            "window_sizes": list(rolling_tracker.window_sizes)
+        }, status_code=400)
+
+    try:
+        series = await run_in_threadpool(
+            rolling_tracker.get_series,
+            request.path_params["market_category"],
+            request.path_params["asset_symbol"],
+            window_size,
+            days=days,
+            max_points=max_points
+        )
+        return JSONResponse(series)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def api_portfolio_alerts(request: Request):
+    """Get cursor-paginated alerts for a portfolio"""
+    params = request.query_params
+    fields = params.get("fields")
+    try:
+        page = await run_in_threadpool(
+            db.get_portfolio_alerts_page,
+            request.path_params["portfolio_id"],
+            limit=int(params.get("limit", 20)),
+            cursor=params.get("cursor"),
+            unread_only=params.get("unread_only", "false").lower() == "true",
+            fields=fields.split(",") if fields else None
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"alerts": page["items"], "next_cursor": page["next_cursor"]})
+
+
+async def api_portfolio_events(request: Request):
+    """Get event calendar for portfolio"""
+    portfolio = await _load_portfolio(request.path_params["portfolio_id"])
+    if portfolio is None:
+        return JSONResponse({"error": "Portfolio not found"}, status_code=404)
+
+    # Event calendar (mock for now, as in the Flask dashboard)
+    events = [
+        {"date": "2024-03-20", "name": "Federal Reserve Meeting", "markets": ["Fed Cut"], "impact": "high"},
+        {"date": "2024-03-22", "name": "ETH ETF Decision", "markets": ["ETH ETF Approval"], "impact": "high"}
+    ]
+    return JSONResponse({"events": events, "events_by_date": {}})
+
+
+# Route order mirrors dashboard.py so path matching behaves the same
+routes = [
+    Route("/api/stats", api_stats),
+    Route("/api/signals", api_signals),
+    Route("/api/correlations", api_correlations),
+    Route("/api/portfolios", api_portfolios, methods=["GET", "POST"]),
+    Route("/api/portfolio/{portfolio_id}/analyze", api_portfolio_analyze),
+    Route("/api/markets-that-matter", api_markets_that_matter),
+    Route("/api/relationship/{market_id}/{asset}", api_relationship),
+    Route("/api/portfolio/{portfolio_id}/markets-that-matter", api_portfolio_markets_that_matter),
+    Route("/api/portfolio/{portfolio_id}/edge-intensity", api_edge_intensity),
+    Route("/api/relationship/{market_category}/{asset_symbol}/explore", api_relationship_explore),
+    Route("/api/relationship/{market_category}/{asset_symbol}/rolling", api_relationship_rolling),
+    Route("/api/portfolio/{portfolio_id}/alerts", api_portfolio_alerts),
+    Route("/api/portfolio/{portfolio_id}/events", api_portfolio_events),
+]
+
+app = Starlette(routes=routes, lifespan=lifespan)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("=" * 60)
+    print("🚀 PolySignal ASGI API Server")
+    print("=" * 60)
+    print("🌐 API available at: http://localhost:8081/api/stats")
+    print("=" * 60)
+    uvicorn.run(app, host='0.0.0.0', port=8081)
@@ -6,7 +6,7 @@ Monitors Polymarket for significant price movements
 import httpx
 import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 
 class PolymarketCollector:
@@ -15,8 +15,15 @@ class PolymarketCollector:
     BASE_URL = "https://clob.polymarket.com"
     GAMMA_URL = "https://gamma-api.polymarket.com"
     
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize collector
+        
+        Args:
+            client: Optional shared HTTP client (not closed by close())
+        """
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=30.0)
         self.tracked_markets = {}
         
     async def get_active_markets(self, min_volume: float = 100000) -> List[Dict]:
@@ -120,4 +127,5 @@ class PolymarketCollector:
             return 0.0
     
     async def close(self):
-        await self.client.aclose()
\ No newline at end of file
+        if self._owns_client:
+            await self.client.aclose()
\ No newline at end of file
@@ -5,12 +5,54 @@ Stores historical market data and calculated correlations
 
 import sqlite3
 import json
-from datetime import datetime
+import zlib
+import base64
+from bisect import bisect_right
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from contextlib import contextmanager
 import os
 
 
+# Columns that may be requested from paginated feeds, and which of them hold encoded payloads
+SIGNAL_COLUMNS = ("id", "market_id", "market_question", "category", "signal_strength",
+                  "polymarket_change", "generated_at", "trade_suggestions", "signal_data")
+SIGNAL_PAYLOAD_COLUMNS = {"trade_suggestions": [], "signal_data": {}}
+ALERT_COLUMNS = ("id", "portfolio_id", "alert_type", "symbol", "market_id", "message",
+                 "impact_data", "created_at", "read")
+ALERT_PAYLOAD_COLUMNS = {"impact_data": None}
+MAX_PAGE_SIZE = 100
+
+
+def encode_payload(value) -> bytes:
+    """Encode a nested payload as compact zlib-compressed JSON (stored as a BLOB)"""
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_payload(value, default=None):
+    """Decode a payload written by encode_payload, or a legacy JSON text column"""
+    if value is None:
+        return default
+    if isinstance(value, bytes):
+        value = zlib.decompress(value).decode("utf-8")
+    return json.loads(value) if value else default
+
+
+def encode_cursor(sort_value: str, row_id: int) -> str:
+    """Encode a keyset pagination cursor"""
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a keyset pagination cursor, raising ValueError if it is malformed"""
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(sort_value), int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
 class Database:
     """SQLite database for storing market data and correlations"""
     
@@ -114,6 +156,19 @@ class Database:
                 )
             """)
             
+            # Materialized rolling correlations table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rolling_correlations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    market_category TEXT NOT NULL,
+                    asset_symbol TEXT NOT NULL,
+                    window_size INTEGER NOT NULL,
+                    timestamp DATETIME NOT NULL,
+                    correlation REAL NOT NULL,
+                    UNIQUE(market_category, asset_symbol, window_size, timestamp)
+                )
+            """)
+            
             # Create indexes for better query performance
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_market_data_market_id ON market_data(market_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_market_data_timestamp ON market_data(timestamp)")
@@ -124,6 +179,7 @@ class Database:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_portfolios_user_id ON portfolios(user_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_alerts_portfolio_id ON portfolio_alerts(portfolio_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_alerts_created_at ON portfolio_alerts(created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_alerts_portfolio_created ON portfolio_alerts(portfolio_id, created_at)")
             
             conn.commit()
     
@@ -225,6 +281,14 @@ class Database:
                 """)
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_correlations_last_updated(self) -> Optional[str]:
+        """Get timestamp of the most recent correlation update"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(last_updated) as latest FROM correlations")
+            row = cursor.fetchone()
+            return row["latest"] if row else None
+    
     def save_signal(self, signal_data: Dict):
         """Save generated signal to history"""
         with self._get_connection() as conn:
@@ -241,8 +305,8 @@ class Database:
                 signal_data.get("signal_strength"),
                 signal_data.get("polymarket_change"),
                 datetime.now(),
-                json.dumps(signal_data.get("trade_suggestions", [])),
-                json.dumps(signal_data)
+                encode_payload(signal_data.get("trade_suggestions", [])),
+                encode_payload(signal_data)
             ))
             conn.commit()
     
@@ -255,52 +319,174 @@ class Database:
                 ORDER BY generated_at DESC
                 LIMIT ?
             """, (limit,))
-            rows = cursor.fetchall()
-            results = []
-            for row in rows:
-                result = dict(row)
-                result["trade_suggestions"] = json.loads(result["trade_suggestions"] or "[]")
-                result["signal_data"] = json.loads(result["signal_data"] or "{}")
-                results.append(result)
-            return results
+            return [self._decode_row(row, SIGNAL_PAYLOAD_COLUMNS) for row in cursor.fetchall()]
+    
+    def get_signals_page(self, limit: int = 20, cursor: str = None,
+                         fields: List[str] = None) -> Dict:
+        """
+        Get a page of signals, newest first, using keyset (cursor) pagination
+        
+        Args:
+            limit: Page size (clamped to 1..MAX_PAGE_SIZE)
+            cursor: next_cursor from the previous page (None = first page)
+            fields: Columns to return (None = all); only requested payloads are decoded
+        
+        Returns:
+            Dict with "items" and "next_cursor" (None on the last page)
+        """
+        limit = self._page_size(limit)
+        columns = self._select_columns(fields, SIGNAL_COLUMNS, "generated_at")
+        where, params = "", []
+        if cursor:
+            generated_at, row_id = decode_cursor(cursor)
+            where = "WHERE generated_at < ? OR (generated_at = ? AND id < ?)"
+            params = [generated_at, generated_at, row_id]
+        
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {", ".join(columns)} FROM signals
+                {where}
+                ORDER BY generated_at DESC, id DESC
+                LIMIT ?
+            """, params + [limit]).fetchall()
+        
+        return self._build_page(rows, limit, "generated_at", SIGNAL_PAYLOAD_COLUMNS)
+    
+    @staticmethod
+    def _page_size(limit: int) -> int:
+        """Clamp a requested page size (SQLite treats a negative LIMIT as no limit)"""
+        return max(1, min(int(limit), MAX_PAGE_SIZE))
+    
+    def _select_columns(self, fields: Optional[List[str]], allowed: Tuple[str, ...],
+                        sort_column: str) -> List[str]:
+        """Validate requested columns, always including the keyset columns"""
+        if not fields:
+            return list(allowed)
+        unknown = [f for f in fields if f not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return [c for c in allowed if c in fields or c in ("id", sort_column)]
+    
+    def _decode_row(self, row: sqlite3.Row, payload_columns: Dict) -> Dict:
+        """Convert a row to a dict, decoding only the payload columns it contains"""
+        result = dict(row)
+        for column, default in payload_columns.items():
+            if column in result:
+                result[column] = decode_payload(result[column], default)
+        return result
+    
+    def _build_page(self, rows: List[sqlite3.Row], limit: int, sort_column: str,
+                    payload_columns: Dict) -> Dict:
+        """Build a page dict with the cursor pointing after the last row"""
+        items = [self._decode_row(row, payload_columns) for row in rows]
+        next_cursor = None
+        if len(rows) == limit and rows:
+            next_cursor = encode_cursor(rows[-1][sort_column], rows[-1]["id"])
+        return {"items": items, "next_cursor": next_cursor}
     
     def get_data_for_correlation(self, market_category: str, asset_symbol: str,
                                  days: int = 30) -> Tuple[List[float], List[float]]:
         """Get paired data for correlation calculation"""
+        pairs = self.get_paired_data(market_category, asset_symbol, days=days)
+        market_prices = [market_price for _, market_price, _ in pairs]
+        asset_prices = [asset_price for _, _, asset_price in pairs]
+        return market_prices, asset_prices
+    
+    def get_paired_data(self, market_category: str, asset_symbol: str, days: int = 30,
+                        since: str = None) -> List[Tuple[str, float, float]]:
+        """
+        Get timestamped (market price, asset price) pairs
+        
+        Args:
+            market_category: Market category to pair
+            asset_symbol: Asset symbol to pair
+            days: Number of days of history to consider
+            since: Only return pairs whose market timestamp is strictly after this
+        
+        Returns:
+            List of (market timestamp, market price, asset price) tuples in time order
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
             # Get market prices for this category
-            cursor.execute("""
-                SELECT price, timestamp FROM market_data
-                WHERE category = ? AND timestamp >= datetime('now', '-' || ? || ' days')
-                ORDER BY timestamp ASC
-            """, (market_category, days))
+            if since:
+                cursor.execute("""
+                    SELECT price, timestamp FROM market_data
+                    WHERE category = ? AND timestamp > ?
+                    ORDER BY timestamp ASC
+                """, (market_category, since))
+            else:
+                cursor.execute("""
+                    SELECT price, timestamp FROM market_data
+                    WHERE category = ? AND timestamp >= datetime('now', '-' || ? || ' days')
+                    ORDER BY timestamp ASC
+                """, (market_category, days))
             market_rows = cursor.fetchall()
             
-            # Get asset prices
+            if not market_rows:
+                return []
+            
+            # Get asset prices (with 1 hour of slack before the first market row)
+            first_market_time = datetime.fromisoformat(market_rows[0]["timestamp"])
             cursor.execute("""
                 SELECT price, timestamp FROM asset_data
-                WHERE asset_symbol = ? AND timestamp >= datetime('now', '-' || ? || ' days')
+                WHERE asset_symbol = ? AND timestamp >= ?
                 ORDER BY timestamp ASC
-            """, (asset_symbol, days))
+            """, (asset_symbol, str(first_market_time - timedelta(hours=1))))
             asset_rows = cursor.fetchall()
             
-            # Match timestamps (within 1 hour window)
-            market_prices = []
-            asset_prices = []
+            # Match timestamps (first asset row within 1 hour window)
+            asset_times = [datetime.fromisoformat(a_row["timestamp"]).timestamp()
+                           for a_row in asset_rows]
+            pairs = []
             
             for m_row in market_rows:
-                m_time = datetime.fromisoformat(m_row["timestamp"])
-                for a_row in asset_rows:
-                    a_time = datetime.fromisoformat(a_row["timestamp"])
-                    time_diff = abs((m_time - a_time).total_seconds())
-                    if time_diff < 3600:  # Within 1 hour
-                        market_prices.append(m_row["price"])
-                        asset_prices.append(a_row["price"])
-                        break
+                m_time = datetime.fromisoformat(m_row["timestamp"]).timestamp()
+                idx = bisect_right(asset_times, m_time - 3600)
+                if idx < len(asset_times) and asset_times[idx] - m_time < 3600:
+                    pairs.append((m_row["timestamp"], m_row["price"], asset_rows[idx]["price"]))
             
-            return market_prices, asset_prices
+            return pairs
+    
+    def save_rolling_correlations(self, market_category: str, asset_symbol: str,
+                                  window_size: int, points: List[Tuple[str, float]]):
+        """Save materialized rolling correlation points as (timestamp, correlation)"""
+        if not points:
+            return
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO rolling_correlations
+                (market_category, asset_symbol, window_size, timestamp, correlation)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(market_category, asset_symbol, window_size, ts, corr) for ts, corr in points])
+            conn.commit()
+    
+    def get_rolling_correlations(self, market_category: str, asset_symbol: str,
+                                 window_size: int, days: int = 30) -> List[Dict]:
+        """Get materialized rolling correlation series"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT timestamp, correlation FROM rolling_correlations
+                WHERE market_category = ? AND asset_symbol = ? AND window_size = ?
+                  AND timestamp >= datetime('now', '-' || ? || ' days')
+                ORDER BY timestamp ASC
+            """, (market_category, asset_symbol, window_size, days))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_latest_rolling_timestamp(self, market_category: str, asset_symbol: str,
+                                     window_size: int) -> Optional[str]:
+        """Get timestamp of the newest materialized rolling correlation point"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT MAX(timestamp) as latest FROM rolling_correlations
+                WHERE market_category = ? AND asset_symbol = ? AND window_size = ?
+            """, (market_category, asset_symbol, window_size))
+            row = cursor.fetchone()
+            return row["latest"] if row else None
     
     def get_stats(self) -> Dict:
         """Get database statistics"""
@@ -400,7 +586,7 @@ class Database:
                 symbol,
                 market_id,
                 message,
-                json.dumps(impact_data) if impact_data else None,
+                encode_payload(impact_data) if impact_data else None,
                 datetime.now()
             ))
             conn.commit()
@@ -423,12 +609,41 @@ class Database:
                     ORDER BY created_at DESC
                     LIMIT ?
                 """, (portfolio_id, limit))
-            rows = cursor.fetchall()
-            results = []
-            for row in rows:
-                result = dict(row)
-                if result.get("impact_data"):
-                    result["impact_data"] = json.loads(result["impact_data"])
-                results.append(result)
-            return results
+            return [self._decode_row(row, ALERT_PAYLOAD_COLUMNS) for row in cursor.fetchall()]
+    
+    def get_portfolio_alerts_page(self, portfolio_id: str, limit: int = 20, cursor: str = None,
+                                  unread_only: bool = False, fields: List[str] = None) -> Dict:
+        """
+        Get a page of alerts for a portfolio, newest first, using keyset pagination
+        
+        Args:
+            portfolio_id: Portfolio to fetch alerts for
+            limit: Page size (clamped to 1..MAX_PAGE_SIZE)
+            cursor: next_cursor from the previous page (None = first page)
+            unread_only: Only return unread alerts
+            fields: Columns to return (None = all); only requested payloads are decoded
+        
+        Returns:
+            Dict with "items" and "next_cursor" (None on the last page)
+        """
+        limit = self._page_size(limit)
+        columns = self._select_columns(fields, ALERT_COLUMNS, "created_at")
+        where = "WHERE portfolio_id = ?"
+        params = [portfolio_id]
+        if unread_only:
+            where += " AND read = 0"
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            where += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+            params += [created_at, created_at, row_id]
+        
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {", ".join(columns)} FROM portfolio_alerts
+                {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            """, params + [limit]).fetchall()
+        
+        return self._build_page(rows, limit, "created_at", ALERT_PAYLOAD_COLUMNS)
 
@@ -0,0 +1,142 @@
+"""
+PolySignal - Downsampling
+Server-side reduction of chart series to a point budget while keeping visual shape
+"""
+
+import numpy as np
+from typing import List, Sequence, Tuple
+
+# Point budget used when a caller asks for none (or a non-positive one)
+DEFAULT_MAX_POINTS = 500
+
+
+def minmax_indexes(y: Sequence[float], max_points: int) -> List[int]:
+    """
+    Min/max bucketing: indexes of the lowest and highest point of each bucket
+
+    Preserves spikes and troughs, which plain averaging would flatten.
+    First and last points are always kept.
+
+    Args:
+        y: Y values
+        max_points: Maximum number of indexes to return (minimum 4, <= 0 = no limit)
+    """
+    n = len(y)
+    max_points = max(max_points, 4) if max_points > 0 else n
+    if n <= max_points:
+        return list(range(n))
+
+    values = np.asarray(y, dtype=float)
+    bucket_count = (max_points - 2) // 2
+    edges = np.linspace(1, n - 1, bucket_count + 1).astype(int).tolist()
+    indexes = [0]
+
+    for start, end in zip(edges[:-1], edges[1:]):
+        if start >= end:
+            continue
+        lo = start + int(np.argmin(values[start:end]))
+        hi = start + int(np.argmax(values[start:end]))
+        indexes.extend(sorted({lo, hi}))
+
+    indexes.append(n - 1)
+    return indexes
+
+
+def lttb_indexes(y: Sequence[float], max_points: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets: indexes of the visually most significant points
+
+    Each bucket keeps the point forming the largest triangle with the previously
+    selected point and the average of the next bucket. First and last points are
+    always kept.
+
+    Args:
+        y: Y values (assumed evenly spaced on the x axis)
+        max_points: Maximum number of indexes to return (minimum 3, <= 0 = no limit)
+    """
+    n = len(y)
+    max_points = max(max_points, 3) if max_points > 0 else n
+    if n <= max_points:
+        return list(range(n))
+
+    values = np.asarray(y, dtype=float)
+    positions = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int).tolist()
+    indexes = [0]
+
+    for b in range(max_points - 2):
+        start, end = edges[b], edges[b + 1]
+        if start >= end:
+            continue
+
+        # Average of the next bucket (or the last point for the final bucket)
+        next_start = end
+        next_end = edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = positions[next_start:next_end].mean()
+        avg_y = values[next_start:next_end].mean()
+
+        prev = indexes[-1]
+        areas = np.abs(
+            (positions[prev] - avg_x) * (values[start:end] - values[prev])
+            - (positions[prev] - positions[start:end]) * (avg_y - values[prev])
+        )
+        indexes.append(start + int(np.argmax(areas)))
+
+    indexes.append(n - 1)
+    return indexes
+
+
+def point_budget(max_points) -> int:
+    """A usable point budget: non-positive or missing values fall back to DEFAULT_MAX_POINTS"""
+    return max_points if max_points and max_points > 0 else DEFAULT_MAX_POINTS
+
+
+def _evenly(indexes: List[int], count: int) -> List[int]:
+    """`count` entries spread evenly over sorted `indexes`, first and last included"""
+    if count >= len(indexes):
+        return indexes
+    if count == 1:
+        return indexes[:1]
+    step = (len(indexes) - 1) / (count - 1)
+    return [indexes[round(i * step)] for i in range(count)]
+
+
+def shared_indexes(series: List[Sequence[float]], max_points: int,
+                   method: str = "lttb") -> List[int]:
+    """
+    Pick one set of at most max_points indexes that keeps the shape of several aligned series
+
+    The budget is split between the series and the selections are merged, so every
+    series can still share a single timestamp axis. When the merged selections overlap
+    too little to fit, the per-series budget shrinks until they do.
+    """
+    if not series:
+        return []
+    n = len(series[0])
+    max_points = point_budget(max_points)
+    if n <= max_points:
+        return list(range(n))
+
+    select = minmax_indexes if method == "minmax" else lttb_indexes
+    per_series = max(max_points // len(series), 4)
+    while True:
+        merged = set()
+        for values in series:
+            merged.update(select(values, per_series))
+        excess = len(merged) - max_points
+        if excess <= 0 or per_series <= 4:
+            break
+        per_series = max(4, per_series - max(1, excess // len(series)))
+    return _evenly(sorted(merged), max_points)
+
+
+def downsample_minmax(x: Sequence, y: Sequence[float], max_points: int) -> Tuple[List, List[float]]:
+    """Downsample an (x, y) series with min/max bucketing"""
+    indexes = minmax_indexes(y, max_points)
+    return [x[i] for i in indexes], [y[i] for i in indexes]
+
+
+def downsample_lttb(x: Sequence, y: Sequence[float], max_points: int) -> Tuple[List, List[float]]:
+    """Downsample an (x, y) series with Largest-Triangle-Three-Buckets"""
+    indexes = lttb_indexes(y, max_points)
+    return [x[i] for i in indexes], [y[i] for i in indexes]
@@ -3,7 +3,7 @@ PolySignal - Market Matcher
 Matches user holdings to relevant prediction markets
 """
 
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from data_collector import PolymarketCollector
 import asyncio
 
@@ -11,9 +11,14 @@ import asyncio
 class MarketMatcher:
     """Matches portfolio holdings to relevant prediction markets"""
     
-    def __init__(self):
-        """Initialize market matcher"""
-        self.pm_collector = PolymarketCollector()
+    def __init__(self, pm_collector: Optional[PolymarketCollector] = None):
+        """
+        Initialize market matcher
+        
+        Args:
+            pm_collector: Optional shared Polymarket collector
+        """
+        self.pm_collector = pm_collector or PolymarketCollector()
         
         # Mapping of assets to relevant market categories/keywords
         self.asset_to_markets = {
@@ -58,6 +58,8 @@ class HybridMonitor:
         stats = self.db.get_stats()
         real_correlations = stats.get("correlations", 0)
         
+        self.real_engine.refresh_correlations()
+        
         if real_correlations > 0:
             print(f"📊 Using {real_correlations} real correlations from database")
         else:
@@ -82,6 +84,13 @@ class HybridMonitor:
         
     async def check_markets(self):
         """Check all tracked markets for significant changes"""
+        # Pick up recomputed correlations once per check, not per signal
+        try:
+            if self.real_engine.refresh_if_stale():
+                print("📊 Reloaded correlations from database")
+        except Exception:
+            pass  # Keep using the last loaded correlations
+        
         tasks = []
         for market_id in self.tracked_markets.keys():
             tasks.append(self.pm_collector.track_price_changes(market_id))
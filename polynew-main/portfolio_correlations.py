@@ -13,15 +13,16 @@ import asyncio
 class PortfolioCorrelationTracker:
     """Tracks correlations between portfolio holdings and prediction markets"""
     
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, market_matcher: Optional[MarketMatcher] = None):
         """
         Initialize tracker
         
         Args:
             db: Database instance
+            market_matcher: Optional shared market matcher
         """
         self.db = db
-        self.market_matcher = MarketMatcher()
+        self.market_matcher = market_matcher or MarketMatcher()
     
     async def analyze_portfolio(self, portfolio: Portfolio) -> Dict:
         """
@@ -38,7 +39,21 @@ class PortfolioCorrelationTracker:
         # Find relevant markets
         relevant_markets = await self.market_matcher.find_relevant_markets(symbols)
         
-        # Get correlations for each symbol-market pair
+        # Correlation lookups hit SQLite, so keep them off the event loop
+        correlations = await asyncio.to_thread(self._lookup_correlations, symbols, relevant_markets)
+        
+        # Calculate portfolio-level insights
+        insights = self._generate_insights(portfolio, correlations)
+        
+        return {
+            "portfolio": portfolio.to_dict(),
+            "relevant_markets": relevant_markets,
+            "correlations": correlations,
+            "insights": insights
+        }
+    
+    def _lookup_correlations(self, symbols: List[str], relevant_markets: Dict) -> Dict:
+        """Stored correlation for each symbol and its top relevant markets (blocking)"""
         correlations = {}
         for symbol in symbols:
             correlations[symbol] = []
@@ -72,15 +87,7 @@ class PortfolioCorrelationTracker:
                         "note": "No correlation data yet - collecting..."
                     })
         
-        # Calculate portfolio-level insights
-        insights = self._generate_insights(portfolio, correlations)
-        
-        return {
-            "portfolio": portfolio.to_dict(),
-            "relevant_markets": relevant_markets,
-            "correlations": correlations,
-            "insights": insights
-        }
+        return correlations
     
     def _generate_insights(self, portfolio: Portfolio, correlations: Dict) -> List[Dict]:
         """Generate insights about which markets matter most for portfolio"""
@@ -6,13 +6,23 @@ Uses calculated correlations from historical data instead of assumed values
 import numpy as np
 from scipy import stats
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from database import Database
 
 
 class RealCorrelationEngine:
     """Correlation engine that uses real calculated correlations from database"""
     
+    CATEGORY_KEYWORDS = (
+        ("politics_republican", ("trump", "republican", "gop")),
+        ("politics_democrat", ("biden", "democrat", "harris")),
+        ("fed_rates", ("fed", "interest rate", "rate cut", "powell", "federal reserve")),
+        ("inflation", ("inflation", "cpi", "pce", "price index")),
+        ("recession", ("recession", "gdp", "downturn", "economic")),
+        ("crypto", ("bitcoin", "ethereum", "crypto", "btc", "eth")),
+        ("war", ("russia", "ukraine", "iran", "israel", "war", "conflict"))
+    )
+    
     def __init__(self, db: Database):
         """
         Initialize with database connection
@@ -29,24 +39,68 @@ class RealCorrelationEngine:
             "crypto": {"BTC": 0.9, "ETH": 0.9, "SOL": 0.8},
             "war": {"VXX": 0.8, "GLD": 0.7, "SPY": -0.6}
         }
+        
+        # Category per market id (questions don't change for a given market)
+        self._category_cache: Dict[str, str] = {}
+        
+        # In-memory view of the correlations table, loaded lazily / on refresh
+        self._affected_assets: Dict[str, Dict[str, float]] = {}
+        self._correlation_meta: Optional[Dict[Tuple[str, str], Dict]] = None
+        self._correlations_version: Optional[str] = None
     
-    def identify_market_category(self, market_question: str) -> str:
-        """Categorize market question"""
-        question_lower = market_question.lower()
-        categories = {
-            "politics_republican": ["trump", "republican", "gop"],
-            "politics_democrat": ["biden", "democrat", "harris"],
-            "fed_rates": ["fed", "interest rate", "rate cut", "powell", "federal reserve"],
-            "inflation": ["inflation", "cpi", "pce", "price index"],
-            "recession": ["recession", "gdp", "downturn", "economic"],
-            "crypto": ["bitcoin", "ethereum", "crypto", "btc", "eth"],
-            "war": ["russia", "ukraine", "iran", "israel", "war", "conflict"]
-        }
+    def refresh_correlations(self):
+        """
+        Reload the in-memory affected-asset map from the correlations table
+        
+        Call after correlations are recomputed; generate_signal only reads the map.
+        """
+        affected_assets: Dict[str, Dict[str, float]] = {}
+        correlation_meta: Dict[Tuple[str, str], Dict] = {}
+        
+        # Rows arrive ordered by |correlation| descending, preserved per category
+        for corr_data in self.db.get_all_correlations():
+            category = corr_data["market_category"]
+            asset = corr_data["asset_symbol"]
+            correlation_meta[(category, asset)] = corr_data
+            
+            # Only include if statistically significant (p < 0.05) or high confidence
+            p_value = corr_data.get("p_value")
+            confidence = corr_data.get("confidence_level", 0)
+            if p_value is None or p_value < 0.05 or confidence > 0.7:
+                affected_assets.setdefault(category, {})[asset] = corr_data["correlation"]
         
-        for category, keywords in categories.items():
+        self._affected_assets = affected_assets
+        self._correlation_meta = correlation_meta
+        self._correlations_version = self.db.get_correlations_last_updated()
+    
+    def refresh_if_stale(self) -> bool:
+        """
+        Reload the affected-asset map if correlations changed since the last load
+        
+        Returns:
+            True if the map was reloaded
+        """
+        if self._correlation_meta is not None and \
+                self.db.get_correlations_last_updated() == self._correlations_version:
+            return False
+        self.refresh_correlations()
+        return True
+    
+    def identify_market_category(self, market_question: str, market_id: str = None) -> str:
+        """Categorize market question, cached by market id when given"""
+        if market_id is not None and market_id in self._category_cache:
+            return self._category_cache[market_id]
+        
+        question_lower = market_question.lower()
+        category = "general"
+        for candidate, keywords in self.CATEGORY_KEYWORDS:
             if any(kw in question_lower for kw in keywords):
-                return category
-        return "general"
+                category = candidate
+                break
+        
+        if market_id is not None:
+            self._category_cache[market_id] = category
+        return category
     
     def get_affected_assets(self, category: str) -> Dict[str, float]:
         """
@@ -54,24 +108,12 @@ class RealCorrelationEngine:
         
         Falls back to assumed correlations if no real data available
         """
-        # Try to get real correlations from database
-        correlations = self.db.get_all_correlations(market_category=category)
-        
-        if correlations:
-            # Use real correlations
-            result = {}
-            for corr_data in correlations:
-                asset = corr_data["asset_symbol"]
-                corr_value = corr_data["correlation"]
-                # Only include if statistically significant (p < 0.05) or high confidence
-                p_value = corr_data.get("p_value")
-                confidence = corr_data.get("confidence_level", 0)
-                
-                if p_value is None or p_value < 0.05 or confidence > 0.7:
-                    result[asset] = corr_value
-            
-            if result:
-                return result
+        if self._correlation_meta is None:
+            self.refresh_correlations()
+        
+        result = self._affected_assets.get(category)
+        if result:
+            return dict(result)
         
         # Fallback to assumed correlations
         return self.fallback_correlations.get(category, {"SPY": 0.3, "BTC": 0.3})
@@ -110,13 +152,13 @@ class RealCorrelationEngine:
             timeframe: Timeframe for the change
         """
         question = market_data.get("question", "")
-        category = self.identify_market_category(question)
+        category = self.identify_market_category(question, market_data.get("id"))
         affected_assets = self.get_affected_assets(category)
         
         impacts = {}
         for asset, correlation in affected_assets.items():
-            # Get correlation metadata from database if available
-            corr_data = self.db.get_correlation(category, asset)
+            # Get correlation metadata from the in-memory map if available
+            corr_data = self._correlation_meta.get((category, asset))
             confidence = corr_data.get("confidence_level", 0.5) if corr_data else 0.5
             
             impact = self.calculate_price_impact(pm_change / 100, correlation, confidence)
@@ -4,10 +4,12 @@ Deep dive into prediction market - asset relationships
 """
 
 import numpy as np
+from scipy import stats
 from typing import Dict, List, Tuple
 from database import Database
 from datetime import datetime, timedelta
 from edgescore import EdgeScoreCalculator
+from downsampling import shared_indexes
 
 
 class RelationshipExplorer:
@@ -24,10 +26,18 @@ class RelationshipExplorer:
         self.edgescore_calc = EdgeScoreCalculator(db)
     
     def explore_relationship(self, market_category: str, asset_symbol: str,
-                           days: int = 30) -> Dict:
+                           days: int = 30, max_points: int = 500,
+                           downsample_method: str = "lttb") -> Dict:
         """
         Explore relationship between market and asset
         
+        Args:
+            market_category: Prediction market category
+            asset_symbol: Asset symbol
+            days: Days of history to analyze
+            max_points: Point budget for chart_data (<= 0 = default budget)
+            downsample_method: "lttb" or "minmax"
+        
         Returns comprehensive relationship analysis
         """
         # Get historical data
@@ -71,7 +81,8 @@ class RelationshipExplorer:
             "lead_lag": lead_lag,
             "heatmap": heatmap,
             "performance": performance,
-            "chart_data": self._prepare_chart_data(market_prices, asset_prices)
+            "chart_data": self._prepare_chart_data(market_prices, asset_prices,
+                                                   max_points, downsample_method)
         }
     
     def _calculate_lead_lag(self, market_prices: List[float],
@@ -197,25 +208,30 @@ class RelationshipExplorer:
         }
     
     def _prepare_chart_data(self, market_prices: List[float],
-                           asset_prices: List[float]) -> Dict:
-        """Prepare data for charting"""
+                           asset_prices: List[float], max_points: int = 0,
+                           downsample_method: str = "lttb") -> Dict:
+        """Prepare data for charting, downsampled to at most max_points per series"""
         # Normalize prices to 0-1 for comparison
         if not market_prices or not asset_prices:
             return {"market": [], "asset": [], "timestamps": []}
         
-        market_norm = [(p - min(market_prices)) / (max(market_prices) - min(market_prices) + 1e-10) 
-                      for p in market_prices]
-        asset_norm = [(p - min(asset_prices)) / (max(asset_prices) - min(asset_prices) + 1e-10) 
-                     for p in asset_prices]
+        market_min, market_max = min(market_prices), max(market_prices)
+        asset_min, asset_max = min(asset_prices), max(asset_prices)
+        market_norm = [(p - market_min) / (market_max - market_min + 1e-10) for p in market_prices]
+        asset_norm = [(p - asset_min) / (asset_max - asset_min + 1e-10) for p in asset_prices]
         
         # Generate timestamps (simplified)
-        timestamps = [(datetime.now() - timedelta(hours=len(market_prices)-i)).isoformat() 
-                      for i in range(len(market_prices))]
+        now = datetime.now()
+        total = len(market_prices)
+        
+        # Both series share one timestamp axis, so select a common set of indexes
+        indexes = shared_indexes([market_norm, asset_norm], max_points, downsample_method)
         
         return {
-            "market": [round(p, 3) for p in market_norm],
-            "asset": [round(p, 3) for p in asset_norm],
-            "timestamps": timestamps
+            "market": [round(market_norm[i], 3) for i in indexes],
+            "asset": [round(asset_norm[i], 3) for i in indexes],
+            "timestamps": [(now - timedelta(hours=total - i)).isoformat() for i in indexes],
+            "total_points": total
         }
     
     def get_trading_strategies(self, market_category: str, asset_symbol: str) -> List[Dict]:
@@ -0,0 +1,170 @@
+"""
+PolySignal - Rolling Correlations
+Materializes rolling correlation series per (category, asset) pair and keeps them
+up to date incrementally as new market and asset ticks are collected
+"""
+
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from database import Database
+from downsampling import downsample_minmax, point_budget
+
+
+class RollingCorrelationTracker:
+    """Maintains materialized rolling correlation series in the database"""
+
+    # Window sizes are measured in paired data points (returns)
+    DEFAULT_WINDOW_SIZES = (12, 24, 72)
+
+    def __init__(self, db: Database, window_sizes: Tuple[int, ...] = None):
+        """
+        Initialize tracker
+
+        Args:
+            db: Database instance
+            window_sizes: Rolling window sizes (in data points) to materialize
+        """
+        self.db = db
+        self.window_sizes = tuple(sorted(window_sizes or self.DEFAULT_WINDOW_SIZES))
+
+        # Tail of the paired series per (category, asset), enough to extend every window
+        self._buffers: Dict[Tuple[str, str], deque] = {}
+
+    @staticmethod
+    def rolling_correlation(market_prices: List[float], asset_prices: List[float],
+                            window_size: int) -> np.ndarray:
+        """
+        Calculate Pearson correlation of returns over a sliding window
+
+        Returns:
+            Array with one value per return index; entries before the first full
+            window, with zero variance, or whose window holds a return touching a
+            missing or non-positive price are NaN
+        """
+        market = np.asarray(market_prices, dtype=float)
+        asset = np.asarray(asset_prices, dtype=float)
+        if len(market) < 2 or len(market) != len(asset):
+            return np.array([])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.diff(market) / market[:-1]
+            y = np.diff(asset) / asset[:-1]
+
+        # Fetch errors are stored as 0.0 prices: drop the returns touching a bad price from
+        # the sums so they only blank the windows that contain them, not every later one
+        priced = np.isfinite(market) & (market > 0) & np.isfinite(asset) & (asset > 0)
+        valid = priced[1:] & priced[:-1]
+        x = np.where(valid, x, 0.0)
+        y = np.where(valid, y, 0.0)
+
+        n = len(x)
+        result = np.full(n, np.nan)
+        if n < window_size:
+            return result
+
+        # Sliding sums via cumulative sums (one pass, no per-window loops)
+        def window_sum(values: np.ndarray) -> np.ndarray:
+            cumsum = np.concatenate(([0.0], np.cumsum(values)))
+            return cumsum[window_size:] - cumsum[:-window_size]
+
+        sum_x = window_sum(x)
+        sum_y = window_sum(y)
+        cov = window_sum(x * y) - sum_x * sum_y / window_size
+        var_x = window_sum(x * x) - sum_x ** 2 / window_size
+        var_y = window_sum(y * y) - sum_y ** 2 / window_size
+        has_invalid = window_sum((~valid).astype(float)) > 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.sqrt(var_x * var_y)
+        corr[(var_x <= 1e-12) | (var_y <= 1e-12) | has_invalid] = np.nan
+
+        result[window_size - 1:] = np.clip(corr, -1.0, 1.0)
+        return result
+
+    def update_pair(self, market_category: str, asset_symbol: str, days: int = 30) -> int:
+        """
+        Extend the materialized series for one pair with newly collected ticks
+
+        Returns:
+            Number of rolling correlation points written
+        """
+        key = (market_category, asset_symbol)
+        buffer = self._buffers.get(key)
+
+        if buffer:
+            new_pairs = self.db.get_paired_data(market_category, asset_symbol,
+                                                since=buffer[-1][0])
+        else:
+            # Cold start: seed from history, already-materialized points are skipped below
+            buffer = deque()
+            new_pairs = self.db.get_paired_data(market_category, asset_symbol, days=days)
+
+        if not new_pairs:
+            return 0
+
+        series = list(buffer) + new_pairs
+        timestamps = [ts for ts, _, _ in series]
+        market_prices = [m for _, m, _ in series]
+        asset_prices = [a for _, _, a in series]
+
+        written = 0
+        for window_size in self.window_sizes:
+            latest = self.db.get_latest_rolling_timestamp(market_category, asset_symbol,
+                                                          window_size)
+            corrs = self.rolling_correlation(market_prices, asset_prices, window_size)
+
+            # Return i ends at price i + 1
+            points = [
+                (timestamps[i + 1], round(float(corr), 4))
+                for i, corr in enumerate(corrs)
+                if not np.isnan(corr) and (latest is None or timestamps[i + 1] > latest)
+            ]
+            self.db.save_rolling_correlations(market_category, asset_symbol,
+                                              window_size, points)
+            written += len(points)
+
+        # Keep just enough history to extend the largest window next time
+        self._buffers[key] = deque(series[-(self.window_sizes[-1] + 1):])
+        return written
+
+    def update_all(self, categories: List[str], assets: List[str], days: int = 30) -> int:
+        """Update every (category, asset) pair, returning total points written"""
+        written = 0
+        for category in categories:
+            for asset in assets:
+                try:
+                    written += self.update_pair(category, asset, days=days)
+                except Exception as e:
+                    print(f"⚠️  Rolling correlation update failed for {category}/{asset}: {e}")
+        return written
+
+    def get_series(self, market_category: str, asset_symbol: str, window_size: int,
+                   days: int = 30, max_points: Optional[int] = None) -> Dict:
+        """
+        Get a materialized rolling correlation series, downsampled for display
+
+        Args:
+            market_category: Market category
+            asset_symbol: Asset symbol
+            window_size: Rolling window size (must be one of the materialized sizes)
+            days: Days of history to return
+            max_points: Maximum number of points to return (None = all, <= 0 = default budget)
+        """
+        rows = self.db.get_rolling_correlations(market_category, asset_symbol,
+                                                window_size, days=days)
+        timestamps = [row["timestamp"] for row in rows]
+        correlations = [row["correlation"] for row in rows]
+
+        if max_points is not None:
+            timestamps, correlations = downsample_minmax(timestamps, correlations,
+                                                         point_budget(max_points))
+
+        return {
+            "market_category": market_category,
+            "asset_symbol": asset_symbol,
+            "window_size": window_size,
+            "total_points": len(rows),
+            "timestamps": timestamps,
+            "correlations": correlations
+        }
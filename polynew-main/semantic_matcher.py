@@ -3,7 +3,8 @@ PolySignal - Semantic Market Matcher
 Enhanced matching using semantic similarity and vector embeddings
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import re
 from market_matcher import MarketMatcher
 
@@ -11,9 +12,16 @@ from market_matcher import MarketMatcher
 class SemanticMatcher:
     """Enhanced market matching with semantic similarity"""
     
-    def __init__(self):
-        """Initialize semantic matcher"""
-        self.base_matcher = MarketMatcher()
+    def __init__(self, base_matcher: Optional[MarketMatcher] = None, db=None):
+        """
+        Initialize semantic matcher
+        
+        Args:
+            base_matcher: Optional shared market matcher
+            db: Optional shared Database instance (one is created per lookup otherwise)
+        """
+        self.base_matcher = base_matcher or MarketMatcher()
+        self.db = db
         
         # Entity extraction patterns
         self.entity_patterns = {
@@ -112,15 +120,22 @@ class SemanticMatcher:
         Returns:
             Ranked list of markets with EdgeScore
         """
+        # Get all active markets
+        all_markets = await self.base_matcher.pm_collector.get_active_markets(min_volume=50000)
+        
+        # Correlation and EdgeScore lookups hit SQLite for every market/holding pair,
+        # so rank in a worker thread instead of on the event loop
+        return await asyncio.to_thread(self._rank_markets, all_markets, holdings, min_edgescore)
+    
+    def _rank_markets(self, all_markets: List[Dict], holdings: Dict[str, float],
+                      min_edgescore: float) -> List[Dict]:
+        """Score every market against every holding and rank the matches (blocking)"""
         from database import Database
         from edgescore import EdgeScoreCalculator
         
-        db = Database()
+        db = self.db or Database()
         edgescore_calc = EdgeScoreCalculator(db)
         
-        # Get all active markets
-        all_markets = await self.base_matcher.pm_collector.get_active_markets(min_volume=50000)
-        
         matched_markets = []
         
         for market in all_markets:
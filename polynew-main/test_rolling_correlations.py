@@ -0,0 +1,42 @@
+"""
+PolySignal - Rolling correlation tests
+Run with: python -m pytest test_rolling_correlations.py
+"""
+
+import numpy as np
+from rolling_correlations import RollingCorrelationTracker
+
+
+def _prices(n: int = 120, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    market = 0.5 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    asset = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    return market.tolist(), asset.tolist()
+
+
+def _naive(market, asset, window_size):
+    x = np.diff(market) / np.asarray(market[:-1])
+    y = np.diff(asset) / np.asarray(asset[:-1])
+    out = np.full(len(x), np.nan)
+    for end in range(window_size - 1, len(x)):
+        out[end] = np.corrcoef(x[end - window_size + 1:end + 1], y[end - window_size + 1:end + 1])[0, 1]
+    return out
+
+
+def test_matches_per_window_pearson():
+    market, asset = _prices()
+    corrs = RollingCorrelationTracker.rolling_correlation(market, asset, 12)
+    assert np.allclose(corrs, _naive(market, asset, 12), equal_nan=True)
+
+
+def test_bad_price_only_blanks_windows_containing_it():
+    market, asset = _prices()
+    clean = RollingCorrelationTracker.rolling_correlation(market, asset, 12)
+    for bad in (0.0, float("nan")):
+        broken = list(market)
+        broken[40] = bad
+        corrs = RollingCorrelationTracker.rolling_correlation(broken, asset, 12)
+        # Returns 39 and 40 touch the bad price; windows ending at 39..51 contain one of them
+        assert np.isnan(corrs[39:52]).all()
+        assert np.allclose(corrs[52:], clean[52:])
+        assert np.allclose(corrs[11:39], clean[11:39])